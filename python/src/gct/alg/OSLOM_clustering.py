@@ -4,7 +4,7 @@ Created on Oct 27, 2018
 @author: lizhen
 '''
 from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct import utils, config, process
 import os
 import glob
 import numpy as np 
@@ -38,8 +38,7 @@ class Infomap(ClusteringAlg):
         params = {'seed':seed}
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_pajek):
-            data.to_pajek()
+        data.to_pajek()
         
         with utils.TempDir() as tmp_dir:
 
@@ -56,7 +55,7 @@ class Infomap(ClusteringAlg):
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -106,8 +105,7 @@ class Infohiermap(ClusteringAlg):
         params = {'seed':seed}
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_pajek):
-            data.to_pajek()
+        data.to_pajek()
         
         with utils.TempDir() as tmp_dir:
             #tmp_dir="/tmp/abc"
@@ -118,7 +116,7 @@ class Infohiermap(ClusteringAlg):
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -167,8 +165,7 @@ class lpm(ClusteringAlg):
         params = {'seed':seed}
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = os.path.join(tmp_dir, 'edges.txt')
@@ -178,7 +175,7 @@ class lpm(ClusteringAlg):
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -226,8 +223,7 @@ class louvain_method(ClusteringAlg):
         params = {'seed':seed}
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = os.path.join(tmp_dir, 'edges.txt')
@@ -237,7 +233,7 @@ class louvain_method(ClusteringAlg):
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -298,8 +294,7 @@ class copra(ClusteringAlg):
         if seed is not None:self.logger.info("seed ignored")        
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = os.path.join(tmp_dir, 'edges.txt')
@@ -316,7 +311,7 @@ class copra(ClusteringAlg):
                         
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -376,8 +371,7 @@ class modopt(ClusteringAlg):
         params ['seed'] = seed 
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = os.path.join(tmp_dir, 'edges.txt')
@@ -394,7 +388,7 @@ class modopt(ClusteringAlg):
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -473,8 +467,7 @@ class OSLOM(ClusteringAlg):
         if int(infomap) + int(copra) + int(louvain) > 1:
             raise Exception ("only of infomap, corpra, louvain can be true")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
 
@@ -518,7 +511,7 @@ class OSLOM(ClusteringAlg):
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
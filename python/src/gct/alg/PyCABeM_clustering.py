@@ -4,7 +4,7 @@ include a few algorithms mentioned at https://github.com/eXascaleInfolab/PyCABeM
 @author: lizhen
 '''
 from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct import utils, config, process
 import os
 import json
 import glob
@@ -48,24 +48,20 @@ class HiReCS(ClusteringAlg):
         params['f'] = f
         params['m'] = m 
         
-        if not utils.file_exists(data.file_hig):
-            data.to_higformat()
+        data.to_higformat()
         cmd = ["./hirecs"]
         cmd.append("-oje")
         if f: cmd.append('-f')
         if m is not None: cmd.append("-m{}".format(m))
         cmd.append(data.file_hig)
-        cmd.append("> output")
         cmd = " ".join(cmd)
         with utils.TempDir() as tmp_dir:
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f: f.write(cmd)
-            self.logger.info("Running " + cmd)
-            cmd = "bash tmpcmd" 
+            self.logger.info("Running " + cmd + " > output")
             
             utils.link_file(os.path.join(config.HIRECS_PATH, 'hirecs'), tmp_dir)
             utils.link_file(os.path.join(config.HIRECS_PATH, 'libhirecs.so'), tmp_dir)
             utils.link_file(data.file_hig, tmp_dir)
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir, stdout="output"))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -119,8 +115,7 @@ class LabelRank(ClusteringAlg):
         if seed is not None:self.logger.info("seed ignored")        
         params = locals();del params['self'];del params['data']
 
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         cmd = "{} {} {} {} {}".format(config.LABLE_RANK_PROG, "edges.txt", cutoff_r, inflation_in, NBDisimilarity_q)
         with utils.TempDir() as tmp_dir:
@@ -128,7 +123,7 @@ class LabelRank(ClusteringAlg):
             utils.create_dir_if_not_exists(os.path.join(tmp_dir, "output"))
             self.logger.info("Running " + cmd)
             utils.link_file(data.file_edges, tmp_dir, "edges.txt")
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             outputfile = glob.glob(os.path.join(tmp_dir, "output/LabelRank*.icpm"))[0]
@@ -221,8 +216,7 @@ class GANXiSw(ClusteringAlg):
         params['d'] = "output"
         if "r" not in params: params['r'] = 0.1
 
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         txt_params = " ".join(["-{} {}".format(k, v) for k, v in params.items()]) 
         cmd = "{} -jar {} -i {} {} ".format(utils.get_java_command(), config.GANXISW_PROG, "edges.txt", txt_params)
@@ -231,7 +225,7 @@ class GANXiSw(ClusteringAlg):
             utils.create_dir_if_not_exists(os.path.join(tmp_dir, "output"))
             self.logger.info("Running " + cmd)
             utils.link_file(data.file_edges, tmp_dir, "edges.txt")
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             outputfile = glob.glob(os.path.join(tmp_dir, "output/SLPAw*.icpm"))[0]
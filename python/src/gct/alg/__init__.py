@@ -7,16 +7,25 @@ from gct.alg import igraph_clustering
     
 from gct.alg.function import *
 from gct.alg.function import __ALG_LIST__
+from gct.alg import function, memo
+
+# identical runs are reused, see gct.alg.memo
+for _name in __ALG_LIST__:
+    globals()[_name] = memo.memoized(getattr(function, _name), _name)
 
 def list_algorithms():
     return __ALG_LIST__
 
 
-def run_alg(runname, data, algname, **algparams):
+def run_alg(runname, data, algname, force=False, **algparams):
+    '''
+    run a registered algorithm. An identical run (same edges, algorithm, parameters and seed) is not
+    run again but its result is reused, unless force is True. See :mod:`gct.alg.memo`.
+    '''
     if algname not in __ALG_LIST__:
         raise Exception ("algorithm {} not found. Available algorithms:\n" + str(list_algorithms()))
     fun = getattr(gct.alg, algname)
-    return fun(name=runname, graph=data, **algparams)
+    return fun(runname, data, force=force, **algparams)
 
 from gct.alg.clustering import load_result as load_clustering_result, has_result as has_clustering_result
 
@@ -4,7 +4,7 @@ Created on Oct 27, 2018
 @author: lizhen
 '''
 from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct import utils, config, process
 import os
 import numpy as np
 import pandas as pd  
@@ -12,6 +12,7 @@ import numbers
 import glob
 import collections
 from gct.exception import UnsupportedException
+from gct.dataset import cnl
 
 prefix = 'cdc'
 
@@ -52,8 +53,7 @@ class CliquePercolation(ClusteringAlg):
         params = {'k':k}
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
 
         with utils.TempDir() as tmp_dir:
             utils.link_file(data.file_edges, tmp_dir, "edges.txt")
@@ -67,19 +67,13 @@ class CliquePercolation(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
-            with open (os.path.join(tmp_dir, "output"), "r") as output:
-                lines = [u.strip() for u in output.readlines()]
-
-        clusters = {}
-        for i, line in enumerate(lines):
-            if line:
-                clusters[i] = [int(u) for u in line.split(" ")]
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, "output"))
         
-        self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+        self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -119,8 +113,7 @@ class Connected_Iterative_Scan(ClusteringAlg):
         params = {'l':l}
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
 
         with utils.TempDir() as tmp_dir:
             utils.link_file(data.file_edges, tmp_dir, "edges.txt")
@@ -131,7 +124,7 @@ class Connected_Iterative_Scan(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -186,8 +179,7 @@ class EAGLE(ClusteringAlg):
         params = {'nThread':nThread}
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
 
         with utils.TempDir() as tmp_dir:
             utils.link_file(data.file_edges, tmp_dir, "edges.txt")
@@ -199,20 +191,16 @@ class EAGLE(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
+            # the first line is the number of clusters, then each line starts with the size of the cluster
             with open (os.path.join(tmp_dir, "output"), "r") as output:
-                lines = [u.strip() for u in output.readlines()]
-
-        clusters = {}
-        n_cluster = int(lines[0])
-        for i, line in enumerate(lines[1:]):
-            if line:
-                clusters[i] = [int(u) for u in line.split(" ")[1:]]
-        assert(len(clusters) == n_cluster)
-        self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+                n_cluster = int(output.readline())
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, "output"), first_field='skip', header_lines=1)
+        assert(clusters.num_cluster == n_cluster)
+        self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -255,8 +243,7 @@ class clique_modularity(ClusteringAlg):
         
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
 
         with utils.TempDir() as tmp_dir:
             utils.link_file(data.file_edges, tmp_dir, "edges.txt")
@@ -267,7 +254,7 @@ class clique_modularity(ClusteringAlg):
                                                      nComm)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -329,8 +316,7 @@ class CONGA(ClusteringAlg):
         
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -352,7 +338,7 @@ class CONGA(ClusteringAlg):
             step0cmd = cmd
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             self.logger.info("Finish first step in %f seconds" % (timecost))
@@ -363,7 +349,7 @@ class CONGA(ClusteringAlg):
                 cmd = " ".join(cmd) 
                 self.logger.info("Running " + cmd)
                 
-                timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+                timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
                 if status != 0: 
                     raise Exception("Run command with error status code {}".format(status))
                                                 
@@ -418,8 +404,7 @@ class LinkCommunities(ClusteringAlg):
         params = {'threshold':threshold}
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_unweighted_edges):
-            data.to_unweighted_fromat()
+        data.to_unweighted_fromat()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -428,7 +413,7 @@ class LinkCommunities(ClusteringAlg):
                                                      "edges.pairs", "edges.jaccs")
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             self.logger.info("Finish first step in %f seconds" % (timecost))
@@ -440,7 +425,7 @@ class LinkCommunities(ClusteringAlg):
                 
                 self.logger.info("Running " + cmd)
                 
-                timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+                timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
                 if status != 0: 
                     raise Exception("Run command with error status code {}".format(status))
                                                 
@@ -536,8 +521,7 @@ class TopGC(ClusteringAlg):
         params = {u:v for u, v in params.items() if v is not None}
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_topgc):
-            data.to_topgc_fromat()
+        data.to_topgc_fromat()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -553,7 +537,7 @@ class TopGC(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
 
@@ -625,8 +609,7 @@ class GCE(ClusteringAlg):
         params = {u:v for u, v in params.items() if v is not None}
         if seed  is not None: self.logger.info("seed ignored")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -641,19 +624,12 @@ class GCE(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
 
-            if 1:            
-                outputfile = "cluster.output"
-                                                
-                with open (os.path.join(tmp_dir, outputfile), "r") as output:
-                    lines = [u.strip() for u in output.readlines()]
-                for i, line in enumerate(lines):
-                    if line:
-                        clusters[i] = list(set([int(u) for u in line.split(" ")]))
-                self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, "cluster.output"))
+            self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -694,8 +670,7 @@ class MOSES(ClusteringAlg):
             seed = np.random.randint(999999)
         params = {'seed':seed}
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -708,19 +683,12 @@ class MOSES(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
 
-            if 1:            
-                outputfile = "cluster.output"
-                                                
-                with open (os.path.join(tmp_dir, outputfile), "r") as output:
-                    lines = [u.strip() for u in output.readlines()]
-                for i, line in enumerate(lines):
-                    if line:
-                        clusters[i] = list(set([int(u) for u in line.split(" ")]))
-                self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, "cluster.output"))
+            self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -771,8 +739,7 @@ class ParCPM(ClusteringAlg):
         n_thread = utils.get_num_thread(n_thread)
         params = {'n_thread':n_thread, 'W':W, 'poc':poc }
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -783,7 +750,7 @@ class ParCPM(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             self.logger.info("Take {} seconds for step 1".format(timecost))
@@ -795,30 +762,20 @@ class ParCPM(ClusteringAlg):
             cmd.append('edges.txt.mcliques')
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
-            nodemap = pd.read_csv(os.path.join(tmp_dir, "edges.txt.map"), header=None, sep=" ")
-            nodemap.set_index(1)
-            nodemap = nodemap.loc[:, 0].to_dict()
+            # row i of the map is the original id of node i 
+            nodemap = pd.read_csv(os.path.join(tmp_dir, "edges.txt.map"), header=None, sep=" ")[0].values
             outputfiles = glob.glob(os.path.join(tmp_dir, "*_communities.txt"))
             for outputfile in outputfiles:
                 if outputfile.endswith('k_num_communities.txt'): continue 
                 k = int(outputfile.split('/')[-1].split('_')[0])
-                                          
-                this_cluster = collections.defaultdict(set)
-                with open (os.path.join(tmp_dir, outputfile), "r") as output:
-                    lines = [u.strip() for u in output.readlines()]
-                for i, line in enumerate(lines):
-                    if line:
-                        a, b = line.split(':')
-                        a = int(a)
-                        for u in b.split(" "):
-                            this_cluster[a].add(nodemap[int(u)])
-                            
-                this_cluster = {u:list(v) for u, v in this_cluster.items()}
-                self.logger.info("Made %d clusters with k=%d" % (len(this_cluster), k))
+                
+                # lines of "cluster_id: node node ..."
+                this_cluster = cnl.read_cnl(os.path.join(tmp_dir, outputfile), first_field='label', node_map=nodemap)
+                self.logger.info("Made %d clusters with k=%d" % (this_cluster.num_cluster, k))
                 
                 clusters[k] = this_cluster
             
@@ -867,8 +824,7 @@ class DEMON(ClusteringAlg):
         if seed  is not None: self.logger.info("seed ignored")
         params = {'epsilon':epsilon, 'min_community_size':min_community_size }
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -883,19 +839,15 @@ class DEMON(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
             outputfile = "communities.txt"
                                             
-            with open (os.path.join(tmp_dir, outputfile), "r") as output:
-                lines = [u.strip() for u in output.readlines()]
-            for i, line in enumerate(lines):
-                if line:
-                    clusters[i] = list(set([int(u) for u in line.split(" ")]))
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, outputfile))
             
-        self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+        self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -938,8 +890,7 @@ class HDEMON(ClusteringAlg):
         if seed  is not None: self.logger.info("seed ignored")
         params = {'epsilon':epsilon, 'min_community_size':min_community_size }
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -954,7 +905,7 @@ class HDEMON(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -1019,8 +970,7 @@ class FastCpm(ClusteringAlg):
         if seed  is not None: self.logger.info("seed ignored")
         params = {'k':k}
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -1033,19 +983,15 @@ class FastCpm(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
             outputfile = "output.cluster"
                                             
-            with open (os.path.join(tmp_dir, outputfile), "r") as output:
-                lines = [u.strip() for u in output.readlines()]
-            for i, line in enumerate(lines):
-                if line:
-                    clusters[i] = list(set([int(u) for u in line.split(" ")]))
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, outputfile))
             
-        self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+        self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -1092,8 +1038,7 @@ class _MSCDBase(ClusteringAlg):
         if seed  is not None: self.logger.info("seed ignored")
         params = {'a': self.prog, 'p': extra_param, 'v':verbose, 'scale':scale_param}
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         with utils.TempDir() as tmp_dir:
@@ -1109,7 +1054,7 @@ class _MSCDBase(ClusteringAlg):
             cmd = " ".join(cmd)
             self.logger.info("Running " + cmd)
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -1389,8 +1334,7 @@ class SVINET(ClusteringAlg):
             seed = np.random.randint(999999)
         params = {'num_cluster':num_cluster, 'seed':seed, 'stratified':stratified, "rfreq":rfreq, "max_iterations":max_iterations, 'no_stop':no_stop, 'inference':inference}
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         clusters = {}
         n_node = data.num_node
@@ -1405,18 +1349,14 @@ class SVINET(ClusteringAlg):
                 if max_iterations: cmd.append('-max-iterations {}'.format(max_iterations))
                 if data.is_weighted(): cmd.append('-weighted')
                 cmd.append('-findk')
-                cmd .append('&& (cat n*findk/communities_size.txt | wc -l  > num_cluster.txt) ')
                 cmd = " ".join(cmd)
-                with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f:
-                    f.write(cmd + "\n")
-                    
                 self.logger.info("Running " + cmd)
                 
-                timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash -x tmpcmd", tmp_dir))
+                timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
                 if status != 0: 
                     raise Exception("Run command with error status code {}".format(status))
-                with open(os.path.join(tmp_dir, "num_cluster.txt")) as f:
-                    n = int(f.readlines()[0].strip())
+                with open(glob.glob(os.path.join(tmp_dir, "n*findk", "communities_size.txt"))[0]) as f:
+                    n = len(f.readlines())
                 self.logger.info("Find k=%d  in %f seconds" % (n, timecost))
                 return n
 
@@ -1439,19 +1379,15 @@ class SVINET(ClusteringAlg):
             cmd = " ".join(cmd)
                 
             self.logger.info("Running " + cmd)
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
             outputfile = glob.glob(os.path.join(tmp_dir, 'n{}-k{}-*-seed{}-*'.format(n_node, num_cluster, seed), 'communities.txt'))[0]
             self.logger.info("read output form " + outputfile)
-            with open (os.path.join(tmp_dir, outputfile), "r") as output:
-                lines = [u.strip() for u in output.readlines()]
-            for i, line in enumerate(lines):
-                if line:
-                    clusters[i] = list(set([int(u) for u in line.split(" ")]))
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, outputfile))
             
-        self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+        self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -6,7 +6,7 @@ Created on Oct 27, 2018
 @author: lizhen
 '''
 from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct import utils, config, process
 import os
 import numpy as np 
 prefix = 'cgcc'
@@ -78,14 +78,13 @@ class CGGC(ClusteringAlg):
         params['outfmt'] = 'l'
         params = {u:v for u, v in params.items() if v is not None }
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         cmd = "{} {} {}".format(config.CGGC_PROG, " ".join(['--{}={}'.format(u, v) for u, v in params.items()]), data.file_edges)
         self.logger.info("Running " + cmd)
 
         with utils.TempDir() as tmp_dir:
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
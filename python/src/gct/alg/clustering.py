@@ -7,27 +7,97 @@ from gct import utils, config
 import os
 import json
 import collections
+import numpy as np
 import pandas as pd     
 from gct.dataset import dataset
+from gct.dataset.membership import Membership
+from gct.alg import result_store
+
+# cluster of the nodes which are not in a clustering result
+MISSING_CLUSTER = -9999
+
 
 def has_result(dataname, runname):
-    fpath = os.path.join(config.get_result_file_path(dataname, runname), 'result.txt')
-    return utils.file_exists(fpath)
+    return result_store.exists(config.get_result_file_path(dataname, runname))
+
+
+def add_missing_nodes(membership, nodes):
+    '''
+    put the nodes which are not in a clustering into cluster -9999
+    
+    :param membership: :py:class:`gct.dataset.membership.Membership`
+    :param nodes: sorted unique nodes of the graph, see :meth:`gct.Dataset.get_node_map`
+    :rtype: :py:class:`gct.dataset.membership.Membership`
+    '''
+    nodes = np.asarray(nodes)
+    if len(nodes) == 0:
+        return membership
+    if np.issubdtype(membership.nodes.dtype, np.integer):
+        found = np.zeros(len(nodes), dtype=bool)
+        pos = np.minimum(np.searchsorted(nodes, membership.nodes), len(nodes) - 1)
+        found[pos[nodes[pos] == membership.nodes]] = True
+    else:
+        found = np.isin(nodes, membership.nodes)
+    missed = nodes[~found]
+    if len(missed) == 0:
+        return membership
+    label = MISSING_CLUSTER if np.issubdtype(membership.cluster_ids.dtype, np.integer) else str(MISSING_CLUSTER)
+    return membership.add_cluster(label, missed)
+
+
+# results completed by load_result, most recently used last
+RESULT_CACHE_SIZE = 16
+_result_cache = collections.OrderedDict()
+
+
+def result_stamp(data, dirpath):
+    '''
+    changes when the result files or the edges of the dataset change
+    '''
+    files = [os.path.join(dirpath, result_store.META_FILE), os.path.join(dirpath, result_store.LEGACY_FILE), data.parq_edges]
+    return tuple(os.stat(u).st_mtime_ns if os.path.exists(u) else None for u in files)
 
         
 def load_result(dataname, runname):
-    fpath = os.path.join(config.get_result_file_path(dataname, runname), 'result.txt')
-    with open(fpath, 'rt') as f :
-        j=json.load(f)
-    d=dataset.load_local(dataname)
-    edges=d.get_edges()
-    nodes= set(edges['src']).union(set(edges['dest']))
-    result_nodes = set()
-    for l in j['clusters'].values():
-        result_nodes.update(l)
-    missed_nodes = nodes.difference(result_nodes)
-    j['clusters']['-9999']=list(missed_nodes)
-    return Result(j)
+    '''
+    load a saved clustering result. Nodes of the graph which are missing in a clustering are put into 
+    cluster -9999 when the clustering is accessed. Loaded results are memoized until their files change; every call
+    returns a new :py:class:`Result` over a copy of the memoized one, so changing it does not change the others.
+    The clusterings themselves are shared and are not to be modified.
+    
+    :rtype: :py:class:`Result`
+    '''
+    d = dataset.load_local(dataname)
+    dirpath = config.get_result_file_path(dataname, runname)
+    key = (dataname, runname)
+    stamp = result_stamp(d, dirpath)
+    cached = _result_cache.pop(key, None)
+    if cached is not None and cached[0] == stamp:
+        _result_cache[key] = cached
+        return Result(dict(cached[1].store))
+
+    complete = lambda m: add_missing_nodes(m, d.get_node_map())
+    result = Result(result_store.read(dirpath, transform=complete))
+    _result_cache[key] = (stamp, result)
+    while len(_result_cache) > RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+    return Result(dict(result.store))
+
+
+def labels_to_clusters(nodes, labels):
+    '''
+    group nodes by their cluster labels.
+    
+    :param nodes: 1d array of node ids
+    :param labels: 1d array of cluster labels, one for each node
+    :rtype: dict of cluster label to list of nodes
+    '''
+    nodes = np.asarray(nodes)
+    labels = np.asarray(labels)
+    order = np.argsort(labels, kind='stable')
+    keys, starts = np.unique(labels[order], return_index=True)
+    groups = np.split(nodes[order], starts[1:])
+    return {k: v.tolist() for k, v in zip(keys.tolist(), groups)}
 
 
 def save_result(result):
@@ -35,13 +105,7 @@ def save_result(result):
         result.save()
     else:
         filepath = config.get_result_file_path(result['dataname'], result['runname'], create=True)
-        try:
-            fpath = os.path.join(filepath, 'result.txt')
-            with open(fpath, 'wt') as f:
-                json.dump(result, f)
-        except:
-            utils.remove_if_file_exit(fpath, is_dir=False)
-            raise
+        result_store.write(filepath, result)
 
         
 class Result(collections.MutableMapping):
@@ -106,20 +170,18 @@ class Result(collections.MutableMapping):
             if isinstance(akey, str): 
                 default_level = str(default_level)
                 d = self.get('clusters')[default_level]
-                d = {int(u):v for u, v in d.items()}
+                if not isinstance(d, Membership):
+                    d = {int(u):v for u, v in d.items()}
             else:
                 d = self.get('clusters')[default_level]
         else:
             d = self.get('clusters') 
+        m = d if isinstance(d, Membership) else Membership.from_dict(d)
         if as_dataframe:
-            lst = [] 
-            for k, vs in d.items():
-                for v in vs: 
-                    lst.append([v, k])
-            return pd.DataFrame(lst, columns=['node', 'cluster'])
+            return m.to_frame()
         else:
             from gct.dataset.dataset import Clustering
-            return Clustering(d)
+            return Clustering(m)
 
     @property
     def clustering_keys(self):
@@ -3,8 +3,8 @@ Created on Oct 27, 2018
 
 @author: lizhen
 '''
-from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct.alg.clustering import ClusteringAlg, save_result, labels_to_clusters
+from gct import utils, config, process
 import glob
 import numpy as np 
 
@@ -30,22 +30,21 @@ class seq_louvain(ClusteringAlg):
         return {'lib':"dct", "name": 'seq_louvain' }
     
     def run(self, data, seed=None):
-        self.logger.warning("dct::seq_louvain assumes node starts with zero and is continuous")
         if seed is None:
             seed = np.random.randint(999999)
         params = {'seed':seed}
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        # the program assumes node starts with zero and is continuous
+        edgefile = data.to_edgelist(dense=True)
         
         with utils.TempDir() as tmp_dir:
-            pajek = utils.link_file(data.file_edges, dest_dir=tmp_dir, destname='edges.txt')
+            pajek = utils.link_file(edgefile, dest_dir=tmp_dir, destname='edges.txt')
             cmd = "{} -f -s {} -o output {}".format(config.get_dct_prog('seq_louvain'), seed, pajek)            
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -53,9 +52,7 @@ class seq_louvain(ClusteringAlg):
             import pandas as pd 
             output = pd.read_csv(outputfile, sep=" ", header=None)
             output.columns = ['cluster']
-            output['node'] = range(len(output))
-        clusters = output[['cluster', 'node']]
-        clusters = clusters.groupby('cluster').apply(lambda u: list(u['node'])).to_dict()
+        clusters = labels_to_clusters(data.from_dense_ids(np.arange(len(output))), output['cluster'].values)
         self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
         
         result = {}
@@ -89,22 +86,21 @@ class infomap(ClusteringAlg):
         return {'lib':"dct", "name": 'infomap' }
     
     def run(self, data, seed=None):
-        self.logger.warning("dct::seq_louvain assumes node starts with zero and is continuous")
         if seed is None:
             seed = np.random.randint(999999)
         params = {'seed':seed}
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        # the program assumes node starts with zero and is continuous
+        edgefile = data.to_edgelist(dense=True)
         
         with utils.TempDir() as tmp_dir:
-            pajek = utils.link_file(data.file_edges, dest_dir=tmp_dir, destname='edges.txt')
+            pajek = utils.link_file(edgefile, dest_dir=tmp_dir, destname='edges.txt')
             cmd = "{} -f -s {} -o output {}".format(config.get_dct_prog('infomap', data.is_directed()), seed, pajek)            
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -112,9 +108,7 @@ class infomap(ClusteringAlg):
             import pandas as pd 
             output = pd.read_csv(outputfile, sep=" ", header=None)
             output.columns = ['cluster']
-            output['node'] = range(len(output))
-        clusters = output[['cluster', 'node']]
-        clusters = clusters.groupby('cluster').apply(lambda u: list(u['node'])).to_dict()
+        clusters = labels_to_clusters(data.from_dense_ids(np.arange(len(output))), output['cluster'].values)
         self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
         
         result = {}
@@ -155,8 +149,7 @@ class _dct(ClusteringAlg):
         params = {'seed':seed, 'prog':self.progname}
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             #tmp_dir = "/tmp/abc"
@@ -165,7 +158,7 @@ class _dct(ClusteringAlg):
             
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir, env={'SEED':str(seed)}))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir, env={'SEED':str(seed)}))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -4,7 +4,7 @@ Created on Oct 27, 2018
 @author: lizhen
 '''
 from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct import utils, config, process
 import os
 
 prefix='mcl'
@@ -41,24 +41,23 @@ class MCL(ClusteringAlg):
         params['o'] = 'output'
         params = {u:v for u, v in params.items() if v is not None }
         
+        data.to_mcl_mci()
         if not utils.file_exists(data.file_mcl_mci):
-            data.to_mcl_mci()
-            if not utils.file_exists(data.file_mcl_mci):
-                raise Exception("failed to crate mcl mci format file")
+            raise Exception("failed to crate mcl mci format file")
         
 
         with utils.TempDir() as tmp_dir:
             cmd1 = "{} {} {}".format(config.MCL_PROG, data.file_mcl_mci,
                 " ".join(['{}{} {}'.format('-' if len(u) == 1 else '--', u, v).strip() for u, v in params.items()]))
             cmd2 = "{} -imx {} -o cluster.output".format(config.MCLDUMP_PROG, 'output')
-            cmdfile = os.path.join(tmp_dir,"tmpcmd.sh")
-            with open(cmdfile,'wt') as f :
-                f.write(cmd1+"\n")            
-                f.write(cmd2+"\n")
-            self.logger.info("Running " + cmd1)
-            self.logger.info("Running " + cmd2)
+            def run_all():
+                for cmd in [cmd1, cmd2]:
+                    self.logger.info("Running " + cmd)
+                    status = process.run(cmd, cwd=tmp_dir)
+                    if status != 0: return status
+                return 0
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash "+cmdfile, tmp_dir))
+            timecost, status = utils.timeit(run_all)
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -0,0 +1,217 @@
+'''
+Memoization of algorithm runs.
+
+A run is identified by a fingerprint of the dataset (the checksum of edges.parq and whether it is directed
+or weighted), the algorithm name and its normalized parameters, which include the seed. Finished runs are
+kept in config.RESULT_CACHE_PATH/<key>. When a run with the same key is asked again, the cached result
+is copied to the result directory of the new run name and returned without running the algorithm.
+A run whose seed is None is random if the algorithm takes a seed, so it is neither looked up nor stored unless
+the caller passes memoize=True; algorithms without a seed parameter are taken as deterministic, except the ones
+in RANDOM_WITHOUT_SEED.
+
+Entries are evicted least recently used first when there are more than config.RESULT_CACHE_MAX_ENTRIES
+of them or they take more than config.RESULT_CACHE_SIZE_LIMIT bytes. Pass force=True to run again
+(e.g. after rebuilding a binary); the new result replaces the cached one.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import json
+import time
+import shutil
+import hashlib
+import inspect
+import functools
+import threading
+import numpy as np
+from gct import utils, config
+from gct.alg import result_store
+
+logger = utils.get_logger("memo")
+
+# algorithms taking their parameters as **kwargs whose result is random when no seed is given
+RANDOM_WITHOUT_SEED = {'pycabem_GANXiSw', 'sklearn_SpectralClustering'}
+
+
+def normalize(value):
+    '''
+    a JSON friendly version of a parameter value, so that equal values give equal keys
+    '''
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, dict):
+        return {str(u): normalize(v) for u, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize(u) for u in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+def normalize_params(fun, args, kwargs):
+    '''
+    parameters of a call of an algorithm function (name and graph excluded), with the defaults filled in
+    '''
+    sig = inspect.signature(fun)
+    bound = sig.bind(None, None, *args, **kwargs)
+    bound.apply_defaults()
+    params = {}
+    for i, (u, v) in enumerate(bound.arguments.items()):
+        if i < 2: continue
+        if sig.parameters[u].kind == inspect.Parameter.VAR_KEYWORD:
+            params.update(v)
+        elif sig.parameters[u].kind == inspect.Parameter.VAR_POSITIONAL:
+            params[u] = list(v)
+        else:
+            params[u] = v
+    return normalize(params)
+
+
+def is_random(fun, algname, params):
+    '''
+    True if a run may give another result when it is repeated: its seed is None and the algorithm takes a seed
+    '''
+    if params.get('seed') is not None: return False
+    return 'seed' in inspect.signature(fun).parameters or algname in RANDOM_WITHOUT_SEED
+
+
+def dataset_fingerprint(data):
+    from gct.dataset import cache
+    c = cache.ConversionCache(config.get_data_file_path(data.name), data.parq_edges)
+    return {'edges': c.source_checksum(), 'directed': bool(data.is_directed()), 'weighted': bool(data.is_weighted())}
+
+
+def make_key(data, algname, params):
+    s = json.dumps({'data': dataset_fingerprint(data), 'alg': algname, 'params': params}, sort_keys=True)
+    return hashlib.sha1(s.encode()).hexdigest()
+
+
+def entry_path(key):
+    return os.path.join(config.RESULT_CACHE_PATH, key)
+
+
+def copy_result(src, dest, **meta):
+    '''
+    copy a result directory, updating fields of its result.json
+    '''
+    tmppath = "{}.tmp-{}-{}".format(dest.rstrip(os.sep), os.getpid(), threading.get_ident())
+    utils.remove_if_file_exit(tmppath, is_dir=True)
+    os.makedirs(tmppath)
+    try:
+        for u in os.listdir(src):
+            if u == result_store.META_FILE: continue
+            try:
+                os.link(os.path.join(src, u), os.path.join(tmppath, u))
+            except OSError:
+                shutil.copy(os.path.join(src, u), os.path.join(tmppath, u))
+        with open(os.path.join(src, result_store.META_FILE), 'rt') as f:
+            d = json.load(f)
+        d.update(meta)
+        with open(os.path.join(tmppath, result_store.META_FILE), 'wt') as f:
+            json.dump(d, f)
+        utils.remove_if_file_exit(dest, is_dir=True)
+        os.replace(tmppath, dest)
+    except:
+        utils.remove_if_file_exit(tmppath, is_dir=True)
+        raise
+    return dest
+
+
+def lookup(key):
+    path = entry_path(key)
+    if not result_store.exists(path): return None
+    os.utime(path, None)
+    return path
+
+
+def store(key, dataname, runname):
+    '''
+    put the saved result of a run into the cache
+    '''
+    utils.create_dir_if_not_exists(config.RESULT_CACHE_PATH)
+    src = config.get_result_file_path(dataname, runname)
+    if not utils.file_exists(os.path.join(src, result_store.META_FILE)):
+        # legacy format, or the algorithm did not save it
+        return None
+    try:
+        path = copy_result(src, entry_path(key), cache_key=key)
+    except OSError:
+        # stored by another process meanwhile
+        if lookup(key) is None: raise
+        return entry_path(key)
+    evict()
+    return path
+
+
+def list_entries():
+    '''
+    :rtype: list of (path, size, last access time), least recently used first
+    '''
+    from gct.dataset.cache import path_size
+    if not os.path.isdir(config.RESULT_CACHE_PATH): return []
+    ret = []
+    for u in os.listdir(config.RESULT_CACHE_PATH):
+        path = os.path.join(config.RESULT_CACHE_PATH, u)
+        if ".tmp-" in u or not os.path.isdir(path): continue
+        ret.append((path, path_size(path), os.stat(path).st_mtime))
+    return sorted(ret, key=lambda u: u[2])
+
+
+def evict(max_entries=None, size_limit=None):
+    '''
+    remove least recently used entries until at most max_entries remain and they fit in size_limit bytes
+
+    :rtype: removed paths
+    '''
+    if max_entries is None: max_entries = config.RESULT_CACHE_MAX_ENTRIES
+    if size_limit is None: size_limit = config.RESULT_CACHE_SIZE_LIMIT
+    entries = list_entries()
+    total = sum(u[1] for u in entries)
+    removed = []
+    for path, size, _ in entries:
+        if len(entries) - len(removed) <= max_entries and (size_limit is None or total <= size_limit):
+            break
+        logger.info("evicting " + path)
+        utils.remove_if_file_exit(path, is_dir=True)
+        removed.append(path)
+        total -= size
+    return removed
+
+
+def clear():
+    utils.remove_if_file_exit(config.RESULT_CACHE_PATH, is_dir=True)
+
+
+def memoized(fun, algname=None):
+    '''
+    wrap an algorithm function of :mod:`gct.alg.function`. The wrapper takes two more keyword arguments:
+    force=True runs the algorithm even if an identical run is cached, and memoize is True to use the cache,
+    False to bypass it, or None (default) to use it unless the run is random (see :func:`is_random`).
+    '''
+    if algname is None: algname = fun.__name__
+
+    @functools.wraps(fun)
+    def wrapper(name, graph, *args, force=False, memoize=None, **kwargs):
+        if memoize is False:
+            return fun(name, graph, *args, **kwargs)
+        params = normalize_params(fun, args, kwargs)
+        if memoize is None and is_random(fun, algname, params):
+            return fun(name, graph, *args, **kwargs)
+        from gct.alg.clustering import load_result
+        key = make_key(graph, algname, params)
+        path = None if force else lookup(key)
+        if path is not None:
+            logger.info("{} on {}: reusing cached run {}".format(algname, graph.name, key))
+            copy_result(path, os.path.join(config.get_result_file_path(graph.name, create=True), name),
+                        runname=name, dataname=graph.name, reused=time.time())
+            return load_result(graph.name, name)
+        result = fun(name, graph, *args, **kwargs)
+        if result is not None:
+            store(key, graph.name, name)
+        return result
+
+    return wrapper
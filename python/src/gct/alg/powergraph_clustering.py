@@ -4,7 +4,7 @@ Created on Oct 27, 2018
 @author: lizhen
 '''
 from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct import utils, config, process
 import os
 import glob
 import numpy as np 
@@ -60,8 +60,7 @@ class pg_label_propagation(ClusteringAlg):
         params['ncpus']=ncpus        
         params['weighted'] =  data.is_weighted()*1
         params['directed'] =  data.is_directed()*1
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = os.path.join(tmp_dir, 'edges.txt')
@@ -72,7 +71,7 @@ class pg_label_propagation(ClusteringAlg):
                         
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
         
@@ -163,8 +162,7 @@ class GossipMap(ClusteringAlg):
         params['ncpus']=ncpus
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = os.path.join(tmp_dir, 'edges.txt')
@@ -176,7 +174,7 @@ class GossipMap(ClusteringAlg):
                         
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
         
@@ -246,8 +244,7 @@ class RelaxMap(ClusteringAlg):
         if (data.is_directed() or data.is_weighted()) and False:
             raise Exception("only undirected and unweighted graph is supported")
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = utils.link_file(data.file_edges, tmp_dir, 'edges.txt')
@@ -258,7 +255,7 @@ class RelaxMap(ClusteringAlg):
                         
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
         
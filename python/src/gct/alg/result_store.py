@@ -0,0 +1,156 @@
+'''
+Binary storage of clustering results.
+
+A result directory holds result.json with everything but the clusters, and one compressed .npz file per
+clustering (clusters.npz, or clusters_<i>.npz for the i-th level of a multilevel/multiclusters result).
+Each .npz keeps the arrays of a :py:class:`gct.dataset.membership.Membership`, so a level is loaded
+without parsing and only when it is asked for. result.txt files of the former JSON format are still read.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import json
+import threading
+import collections.abc
+import numpy as np
+from gct import utils
+from gct.dataset.membership import Membership
+
+META_FILE = 'result.json'
+LEGACY_FILE = 'result.txt'
+
+FORMAT_VERSION = 1
+
+
+def clusters_file(level=None):
+    return "clusters.npz" if level is None else "clusters_{}.npz".format(level)
+
+
+def save_membership(filepath, m):
+    '''
+    write a membership as a compressed .npz file through a temporary file.
+    '''
+    tmppath = "{}.tmp-{}-{}".format(filepath, os.getpid(), threading.get_ident())
+    try:
+        with open(tmppath, 'wb') as f:
+            np.savez_compressed(f, nodes=m.nodes, offsets=m.offsets, cluster_ids=m.cluster_ids)
+        os.replace(tmppath, filepath)
+    except:
+        utils.remove_if_file_exit(tmppath, is_dir=False)
+        raise
+    return filepath
+
+
+def load_membership(filepath):
+    with np.load(filepath, allow_pickle=False) as z:
+        return Membership(z['nodes'], z['offsets'], z['cluster_ids'])
+
+
+def to_membership(clusters):
+    if isinstance(clusters, Membership):
+        return clusters
+    return Membership.from_dict(clusters)
+
+
+class LazyClusters(collections.abc.Mapping):
+    '''
+    the levels of a multilevel/multiclusters result. A level is read from its file the first time it is accessed.
+
+    :param levels: level keys, in the order of the files
+    :param loader: function taking the position of a level and returning its :py:class:`gct.dataset.membership.Membership`
+    '''
+
+    def __init__(self, levels, loader):
+        self.levels = list(levels)
+        self.loader = loader
+        self.loaded = {}
+
+    def __getitem__(self, key):
+        if key not in self.loaded:
+            try:
+                i = self.levels.index(key)
+            except ValueError:
+                raise KeyError(key)
+            self.loaded[key] = self.loader(i)
+        return self.loaded[key]
+
+    def __iter__(self):
+        return iter(self.levels)
+
+    def __len__(self):
+        return len(self.levels)
+
+    def __repr__(self):
+        return "LazyClusters(levels={}, loaded={})".format(self.levels, list(self.loaded.keys()))
+
+
+def is_multi(result):
+    return bool(result.get('multilevel') or result.get('multiclusters'))
+
+
+def write(dirpath, result):
+    '''
+    save a result dict into a result directory. Cluster files are written before result.json,
+    so a result is complete once result.json exists.
+
+    :param dirpath: the result directory
+    :param result: result dict. 'clusters' is a dict of cluster id to nodes (a dict of level to such dicts
+                   for a multilevel/multiclusters result); Memberships are accepted in place of these dicts.
+    '''
+    meta = {k: v for k, v in result.items() if k != 'clusters'}
+    meta['format'] = FORMAT_VERSION
+    metapath = os.path.join(dirpath, META_FILE)
+    utils.remove_if_file_exit(metapath, is_dir=False)
+    clusters = result['clusters']
+    if is_multi(result):
+        levels = list(clusters.keys())
+        for i, level in enumerate(levels):
+            save_membership(os.path.join(dirpath, clusters_file(i)), to_membership(clusters[level]))
+        meta['levels'] = levels
+    else:
+        save_membership(os.path.join(dirpath, clusters_file()), to_membership(clusters))
+    tmppath = metapath + ".tmp"
+    with open(tmppath, 'wt') as f:
+        json.dump(meta, f)
+    os.replace(tmppath, metapath)
+    utils.remove_if_file_exit(os.path.join(dirpath, LEGACY_FILE), is_dir=False)
+    return metapath
+
+
+def read(dirpath, transform=None):
+    '''
+    read a result directory, in the binary or the former JSON format.
+
+    :param transform: optional function applied to each clustering (a Membership) when it is loaded
+    :rtype: result dict. Clusterings are Memberships; the levels of a multilevel/multiclusters result
+            are a :py:class:`LazyClusters`. Clusterings of the JSON format are converted when accessed.
+    '''
+    if transform is None: transform = lambda m: m
+    metapath = os.path.join(dirpath, META_FILE)
+    if utils.file_exists(metapath):
+        with open(metapath, 'rt') as f:
+            result = json.load(f)
+        if is_multi(result):
+            loader = lambda i: transform(load_membership(os.path.join(dirpath, clusters_file(i))))
+            result['clusters'] = LazyClusters(result.pop('levels'), loader)
+        else:
+            result['clusters'] = transform(load_membership(os.path.join(dirpath, clusters_file())))
+        return result
+
+    with open(os.path.join(dirpath, LEGACY_FILE), 'rt') as f:
+        result = json.load(f)
+    clusters = result['clusters']
+    if is_multi(result):
+        # cluster ids of the levels became strings in JSON
+        loader = lambda i: transform(Membership.from_dict({int(u): v for u, v in clusters[levels[i]].items()}))
+        levels = list(clusters.keys())
+        result['clusters'] = LazyClusters(levels, loader)
+    else:
+        result['clusters'] = transform(Membership.from_dict(clusters))
+    return result
+
+
+def exists(dirpath):
+    return utils.file_exists(os.path.join(dirpath, META_FILE)) or utils.file_exists(os.path.join(dirpath, LEGACY_FILE))
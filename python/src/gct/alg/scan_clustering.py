@@ -3,10 +3,11 @@ Created on Oct 27, 2018
 
 @author: lizhen
 '''
-from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct.alg.clustering import ClusteringAlg, save_result, labels_to_clusters
+from gct import utils, config, process
 import os
 import glob
+import numpy as np
 
 prefix = 'scan'
 
@@ -40,8 +41,7 @@ class Scanpp(ClusteringAlg):
         if seed is not None:self.logger.info("seed ignored")        
         if data.is_weighted():
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         cmd = "{} -e {} -m {} -r {}".format(config.SCANPP_PROG, epsilon, mu, data.file_edges)
         self.logger.info("Running " + cmd)
@@ -130,15 +130,14 @@ class _AnyScan(ClusteringAlg):
 
         if False and (data.is_directed() or data.is_weighted()):
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_anyscan):
-            data.to_anyscan()
+        anyscanfile = data.to_anyscan(dense=True)
         
         cmd = "{} -c {} -i {} -m {} -e {} -o {} -a {} -b {} -t {}".format(
-            config.ANYSCAN_PROG, algorithm, data.file_anyscan, minpts, epsilon, 'output', alpha, beta, thread)
+            config.ANYSCAN_PROG, algorithm, anyscanfile, minpts, epsilon, 'output', alpha, beta, thread)
         self.logger.info("Running " + cmd)
 
         with utils.TempDir() as tmp_dir:
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 1:  # anyscan always return 1
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -147,15 +146,12 @@ class _AnyScan(ClusteringAlg):
                 
             n_nodes = int(lines[0])
             clusters_list = lines[1].split(" ")
-            clusters_list = [int(u) for u in clusters_list ]
+            clusters_list = np.array(clusters_list, dtype=np.int64)
             
         if (n_nodes != len(clusters_list)):
             raise Exception("#node is not equals #cluster")
             
-        from collections import defaultdict
-        clusters = defaultdict(list)
-        for n, c in enumerate(clusters_list):
-            clusters[c].append(n)
+        clusters = labels_to_clusters(data.from_dense_ids(np.arange(n_nodes)), clusters_list)
         
         self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
         
@@ -339,8 +335,7 @@ class _pScanBase(ClusteringAlg):
         params = {'mu':mu, 'epsilon':epsilon, 'prog':prog}
         if False and (data.is_directed() or data.is_weighted()):
             raise Exception("only undirected and unweighted graph is supported")
-        if not utils.file_exists(data.file_scanbin):
-            data.to_scanbin()
+        data.to_scanbin()
         
         with utils.TempDir() as tmp_dir:
             scanbin = data.file_scanbin 
@@ -354,7 +349,7 @@ class _pScanBase(ClusteringAlg):
                 EXE = config.PPSCANSSE_PROG                
             cmd = "{} {} {} {} {}".format(EXE, tmp_dir, epsilon, mu, 'output')
             self.logger.info("Running " + cmd)
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
@@ -4,10 +4,10 @@ Created on Oct 27, 2018
 @author: lizhen
 '''
 from gct.alg.clustering import ClusteringAlg, save_result
-from gct import utils, config
+from gct import utils, config, process
 import os
 import glob
-from gct.dataset import convert
+from gct.dataset import convert, cnl
 
 prefix = 'alg'
 
@@ -50,30 +50,21 @@ class streamcom(ClusteringAlg):
         params['o'] = 'output'
         params = {u.replace("_", "-"):v for u, v in params.items() if v is not None }
         
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         cmd = "{} {} {}".format(config.STREAMCOM_PROG,
             " ".join(['{}{} {}'.format('-' if len(u) == 1 else '--', u, v) for u, v in params.items()]), data.file_edges)
         self.logger.info("Running " + cmd)
 
         with utils.TempDir() as tmp_dir:
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
             output = glob.glob(os.path.join(tmp_dir, "output*"))[0]
-            with open (os.path.join(tmp_dir, output), "r") as output:
-                lines = [u.strip() for u in output.readlines()]
-
-        from collections import defaultdict
-        clusters = defaultdict(list)
-        for c, line in enumerate(lines):
-            if line.startswith('#'):continue
-            for n in line.split(" "): 
-                clusters[c].append(int(n))
+            clusters = cnl.read_cnl(os.path.join(tmp_dir, output))
         
-        self.logger.info("Made %d clusters in %f seconds" % (len(clusters), timecost))
+        self.logger.info("Made %d clusters in %f seconds" % (clusters.num_cluster, timecost))
         
         result = {}
         result['runname'] = self.name
@@ -245,8 +236,7 @@ class lso_cluster(ClusteringAlg):
             loss_args = "--loss {}".format(argparams["loss"])
             del argparams['loss']
 
-        if not utils.file_exists(data.file_edges):
-            data.to_edgelist()
+        data.to_edgelist()
         
         with utils.TempDir() as tmp_dir:
             pajek = utils.link_file(data.file_edges, dest_dir=tmp_dir, destname='edges.txt')
@@ -255,11 +245,9 @@ class lso_cluster(ClusteringAlg):
             cmdargs.append("-o lsooutput")
             cmdargs = " ".join(cmdargs)
             cmd = "{} {} {}".format(config.LSO_CLUSTER_PROG, pajek, cmdargs)
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f: f.write(cmd)
-            
             self.logger.info("Running " + cmd) 
             
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash -x ./tmpcmd", tmp_dir))
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir))
             if status != 0:
                 raise Exception("Run command with error status code {}".format(status))
     
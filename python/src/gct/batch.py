@@ -0,0 +1,238 @@
+'''
+Batch runs of algorithms over datasets.
+
+A batch is the product of algorithms (each with one or more parameter sets), datasets and seeds. Every run
+is a :class:`gct.task.Task` whose state is kept in a batch directory (see :func:`gct.config.get_batch_path`):
+<key>.done once the result is saved, <key>.failed (JSON with the error, the traceback and the tail of
+stderr) when it raised, and <key>.stderr with everything the run and its external programs wrote to stderr.
+Running a batch again skips the finished runs, so an interrupted batch resumes where it stopped.
+
+Runs are executed by a process pool. Each worker limits the algorithms to threads_per_run threads
+(through OMP_NUM_THREADS, see :func:`gct.utils.get_num_thread`) and the pool has num_cpu // threads_per_run
+workers, so the machine is filled without being oversubscribed. Before the pool starts, each dataset is loaded
+once and its node map is built, which also records the checksum of its edges in the conversion cache; the
+format conversions the algorithms need are then built by the workers under the per-dataset lock of
+:mod:`gct.dataset.cache`, so two runs never convert the same file at the same time.
+
+    jobs = batch.make_jobs(['cdc_GCE', {'scan_pscan': [{'mu': 1}, {'mu': 2}]}], ['karate', 'dolphins'], seeds=[1, 2])
+    status = batch.run('campaign1', jobs, threads_per_run=2, timeout=3600)
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import sys
+import json
+import time
+import hashlib
+import traceback
+import collections
+import multiprocessing
+import concurrent.futures
+import pandas as pd
+from gct import utils, config, process
+from gct.task import Task
+
+# bytes of stderr kept in the failure record
+STDERR_TAIL_SIZE = 1 << 14
+
+Job = collections.namedtuple('Job', ['algname', 'dataname', 'params', 'seed', 'runname'])
+
+
+def make_runname(algname, params=None, seed=None):
+    '''
+    run name of an algorithm with parameters and seed, e.g. scan_pscan_3f2a9c1e_seed1
+    '''
+    name = algname
+    if params:
+        name += "_" + hashlib.md5(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:8]
+    if seed is not None:
+        name += "_seed{}".format(seed)
+    return name
+
+
+def make_jobs(algs, datanames, seeds=(None,)):
+    '''
+    :param algs: list of algorithm names or of dicts {algname: params}, where params is a dict or a list of dicts;
+                 or such a dict
+    :param datanames: names of local graphs
+    :param seeds: seeds of each run, None to not pass a seed
+    :rtype: list of :class:`Job`
+    '''
+    if isinstance(algs, dict): algs = [algs]
+    alg_params = []
+    for alg in algs:
+        if isinstance(alg, str):
+            alg_params.append((alg, {}))
+        else:
+            for algname, params in alg.items():
+                for p in (params if isinstance(params, (list, tuple)) else [params or {}]):
+                    alg_params.append((algname, dict(p)))
+    return [Job(algname, dataname, params, seed, make_runname(algname, params, seed))
+            for dataname in datanames for algname, params in alg_params for seed in seeds]
+
+
+def job_key(job):
+    return "{}__{}".format(job.dataname, job.runname)
+
+
+def read_failure(state_dir, job):
+    path = os.path.join(state_dir, job_key(job) + ".failed")
+    if not utils.file_exists(path): return None
+    with open(path, 'rt') as f:
+        return json.load(f)
+
+
+def tail(filepath, size=STDERR_TAIL_SIZE):
+    if not utils.file_exists(filepath): return ""
+    with open(filepath, 'rb') as f:
+        f.seek(max(0, os.path.getsize(filepath) - size))
+        return f.read().decode(errors='replace')
+
+
+class redirect_stderr(object):
+    '''
+    redirect file descriptor 2 to a file, so that the stderr of external programs is captured too
+    '''
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+
+    def __enter__(self):
+        sys.stderr.flush()
+        self.saved = os.dup(2)
+        with open(self.filepath, 'ab') as f:
+            os.dup2(f.fileno(), 2)
+        return self
+
+    def __exit__(self, *args):
+        sys.stderr.flush()
+        os.dup2(self.saved, 2)
+        os.close(self.saved)
+
+
+def run_job(job, state_dir, timeout=None):
+    '''
+    run a job in the current process and record its state.
+
+    :rtype: dict of the status of the job
+    '''
+    from gct.alg import run_alg
+    from gct.dataset import load_local_graph
+    key = job_key(job)
+    failed_file = os.path.join(state_dir, key + ".failed")
+    stderr_file = os.path.join(state_dir, key + ".stderr")
+
+    def fun(logger):
+        data = load_local_graph(job.dataname)
+        params = dict(job.params)
+        if job.seed is not None: params['seed'] = job.seed
+        with process.timeout_limit(timeout):
+            run_alg(job.runname, data, job.algname, **params)
+
+    task = Task(key, fun, state_dir)
+    ret = dict(job._asdict(), status='done', timecost=None, error=None)
+    if task.done():
+        ret['status'] = 'skipped'
+        return ret
+    utils.remove_if_file_exit(failed_file, is_dir=False)
+    t0 = time.time()
+    try:
+        with redirect_stderr(stderr_file):
+            task()
+    except BaseException as e:
+        failure = {'error': "{}: {}".format(type(e).__name__, e), 'traceback': traceback.format_exc(),
+                   'stderr': tail(stderr_file), 'time': time.time()}
+        with open(failed_file, 'wt') as f:
+            json.dump(failure, f)
+        ret.update(status='failed', error=failure['error'])
+        if not isinstance(e, Exception): raise
+    ret['timecost'] = time.time() - t0
+    return ret
+
+
+def prepare_dataset(dataname):
+    '''
+    load a dataset and build its node map through the conversion cache, before the workers use it
+    '''
+    from gct.dataset import load_local_graph
+    load_local_graph(dataname).get_node_map()
+
+
+def _init_worker(threads_per_run):
+    os.environ['OMP_NUM_THREADS'] = str(threads_per_run)
+
+
+def status(name, jobs):
+    '''
+    state of the jobs of a batch
+
+    :rtype: DataFrame with a row per job and a 'status' column, one of done, failed, pending
+    '''
+    state_dir = config.get_batch_path(name)
+    rows = []
+    for job in jobs:
+        row = dict(job._asdict(), status='pending', error=None)
+        if Task(job_key(job), None, state_dir).done():
+            row['status'] = 'done'
+        else:
+            failure = read_failure(state_dir, job)
+            if failure is not None: row.update(status='failed', error=failure['error'])
+        rows.append(row)
+    return pd.DataFrame(rows, columns=list(Job._fields) + ['status', 'error'])
+
+
+def run(name, jobs, threads_per_run=1, num_cpu=None, timeout=None, retry_failed=False, mp_context=None):
+    '''
+    run jobs in parallel, skipping the finished ones.
+
+    :param name: name of the batch, its state is kept in :func:`gct.config.get_batch_path`
+    :param jobs: list of :class:`Job`, see :func:`make_jobs`
+    :param threads_per_run: threads of each run
+    :param num_cpu: cores to use, all by default
+    :param timeout: wall-clock limit of each external program in seconds
+    :param retry_failed: run again the jobs that failed before, otherwise they are reported as failed
+    :param mp_context: multiprocessing context of the pool
+    :rtype: DataFrame with a row per job, the status (done, skipped, failed), the timecost and the error
+    '''
+    logger = utils.get_logger("batch")
+    state_dir = config.get_batch_path(name, create=True)
+    num_cpu = num_cpu or multiprocessing.cpu_count()
+    num_worker = max(1, num_cpu // max(1, threads_per_run))
+
+    todo, rows = [], {}
+    for i, job in enumerate(jobs):
+        failure = read_failure(state_dir, job)
+        if Task(job_key(job), None, state_dir).done():
+            rows[i] = dict(job._asdict(), status='skipped', timecost=None, error=None)
+        elif failure is not None and not retry_failed:
+            rows[i] = dict(job._asdict(), status='failed', timecost=None, error=failure['error'])
+        else:
+            todo.append(i)
+    logger.info("batch {}: {} jobs, {} to run on {} workers of {} threads".format(
+        name, len(jobs), len(todo), num_worker, threads_per_run))
+
+    for dataname in sorted(set(jobs[i].dataname for i in todo)):
+        try:
+            prepare_dataset(dataname)
+        except Exception as e:  # the runs on it fail and record the error
+            logger.warning("failed to prepare {}: {}".format(dataname, e))
+
+    if todo:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(num_worker, len(todo)), mp_context=mp_context,
+                                                    initializer=_init_worker, initargs=(threads_per_run,)) as executor:
+            futures = {executor.submit(run_job, jobs[i], state_dir, timeout): i for i in todo}
+            for future in concurrent.futures.as_completed(futures):
+                i = futures[future]
+                try:
+                    rows[i] = future.result()
+                except Exception as e:  # the worker died
+                    error = "{}: {}".format(type(e).__name__, e)
+                    stderr_file = os.path.join(state_dir, job_key(jobs[i]) + ".stderr")
+                    with open(os.path.join(state_dir, job_key(jobs[i]) + ".failed"), 'wt') as f:
+                        json.dump({'error': error, 'traceback': None, 'stderr': tail(stderr_file), 'time': time.time()}, f)
+                    rows[i] = dict(jobs[i]._asdict(), status='failed', timecost=None, error=error)
+                logger.info("{} {} on {}: {}".format(rows[i]['status'], jobs[i].runname, jobs[i].dataname, rows[i]['error'] or ""))
+
+    return pd.DataFrame([rows[i] for i in range(len(jobs))], columns=list(Job._fields) + ['status', 'timecost', 'error'])
@@ -0,0 +1,242 @@
+'''
+Runtime versus graph size benchmarks.
+
+Graphs of a family (LFR or Erdos-Renyi, see :mod:`gct.dataset.random_dataset`) are generated at geometric
+size steps, and each algorithm is run on them in a fresh process. Every run adds a row to a Parquet table with
+the wall time, the CPU time and the peak RSS (of the Python process and of the external programs), the time
+of the algorithm itself as reported in its result, the time spent converting the graph to the input format of
+the program (see :func:`gct.dataset.cache.build_time`) and the size of the saved result.
+:func:`fit_scaling` fits time ~ c * n_edge^exponent per algorithm, so that the rows of a tag (e.g. a
+submodule version) can be compared with a previous one.
+
+    python -m gct.bench --algs cdc_GCE,scan_pScan --family LFR --min-size 1000 --max-size 100000 --tag v1
+    python -m gct.bench --fit bench.parq
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import time
+import argparse
+import resource
+import multiprocessing
+import concurrent.futures
+import numpy as np
+import pandas as pd
+from gct import utils, config, process
+
+FAMILIES = ['LFR', 'Erdos-Renyi']
+
+COLUMNS = ['tag', 'family', 'dataname', 'n_node', 'n_edge', 'algname', 'seed', 'status', 'wall_time', 'cpu_time',
+           'alg_time', 'convert_time', 'peak_rss_mb', 'output_bytes', 'num_cluster', 'error', 'timestamp']
+
+
+def graph_sizes(min_size, max_size, factor=2):
+    '''
+    geometric steps from min_size to max_size (included if it is on a step)
+    '''
+    sizes = []
+    n = min_size
+    while n <= max_size:
+        sizes.append(int(round(n)))
+        n *= factor
+    return sizes
+
+
+def graph_name(family, n_node, seed, avg_degree=20, mu=0.3):
+    '''
+    name of a generated graph, it has all the arguments of the generator (mu only for LFR)
+    '''
+    name = "bench_{}_{}_k{}".format(family.replace('-', '_'), n_node, avg_degree)
+    if family == 'LFR':
+        name += "_mu{}".format(mu).replace('.', 'p')
+    return "{}_s{}".format(name, seed)
+
+
+def make_graph(family, n_node, seed=1, avg_degree=20, mu=0.3):
+    '''
+    generate a graph of the family, or load it if it was generated before with the same arguments.
+
+    :rtype: :class:`gct.Dataset`
+    '''
+    from gct.dataset import random_dataset
+    from gct.dataset.dataset import local_exists, load_local
+    name = graph_name(family, n_node, seed, avg_degree=avg_degree, mu=mu)
+    if local_exists(name):
+        return load_local(name)
+    if family == 'LFR':
+        maxk = min(n_node - 1, max(avg_degree, int(2.5 * avg_degree)))
+        return random_dataset.generate_undirected_unweighted_random_graph_LFR(
+            name, N=n_node, k=avg_degree, maxk=maxk, mu=mu, seed=seed, overide=True)
+    elif family == 'Erdos-Renyi':
+        return random_dataset.generate_Erdos_Renyi(name, n_node, n_node * avg_degree // 2, seed=seed, overide=True)
+    else:
+        raise ValueError("unknown family {}, expected one of {}".format(family, FAMILIES))
+
+
+def usage():
+    '''
+    CPU seconds and peak RSS (MB) of this process and of its waited-for children
+    '''
+    s = resource.getrusage(resource.RUSAGE_SELF)
+    c = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return s.ru_utime + s.ru_stime + c.ru_utime + c.ru_stime, max(s.ru_maxrss, c.ru_maxrss) / 1024.0
+
+
+def measure(algname, dataname, seed=None, params=None, timeout=None, cold=True):
+    '''
+    run an algorithm once and measure it. Meant to be called in a fresh process (see :func:`run_measure`),
+    otherwise the peak RSS includes whatever ran before.
+
+    :param cold: remove the converted files of the graph first, so the conversion is part of the run
+    :rtype: dict of a row of the benchmark table
+    '''
+    from gct.alg import run_alg
+    from gct.dataset import cache
+    from gct.dataset.dataset import load_local
+    data = load_local(dataname)
+    row = {'dataname': dataname, 'n_node': int(data.num_node), 'n_edge': int(data.num_edge), 'algname': algname,
+           'seed': seed, 'status': 'done', 'error': None, 'timestamp': time.time()}
+    if cold:
+        cache.ConversionCache(config.get_data_file_path(dataname), data.parq_edges).invalidate()
+    runname = "bench_" + algname
+    params = dict(params or {})
+    if seed is not None: params['seed'] = seed
+
+    cpu0, _ = usage()
+    convert0 = cache.build_time()
+    t0 = time.time()
+    try:
+        with process.timeout_limit(timeout):
+            result = run_alg(runname, data, algname, force=True, **params)
+        if result is None:
+            raise Exception("{} does not support {}".format(algname, dataname))
+    except Exception as e:
+        row.update(status='failed', error="{}: {}".format(type(e).__name__, e))
+        result = None
+    row['wall_time'] = time.time() - t0
+    cpu1, row['peak_rss_mb'] = usage()
+    row['cpu_time'] = cpu1 - cpu0
+    row['convert_time'] = cache.build_time() - convert0
+    if result is not None:
+        row['alg_time'] = result.timecost
+        row['output_bytes'] = cache.path_size(config.get_result_file_path(dataname, runname))
+        row['num_cluster'] = result.clustering().num_cluster
+    return row
+
+
+def run_measure(*args, **kwargs):
+    '''
+    :func:`measure` in a new process
+    '''
+    ctx = multiprocessing.get_context('spawn')
+    with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=ctx) as executor:
+        return executor.submit(measure, *args, **kwargs).result()
+
+
+def read_table(filepath):
+    if not utils.file_exists(filepath):
+        return pd.DataFrame(columns=COLUMNS)
+    return pd.read_parquet(filepath)
+
+
+def append_rows(filepath, rows):
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    old = read_table(filepath)
+    if len(old): df = pd.concat([old, df], ignore_index=True)
+    tmppath = filepath + ".tmp"
+    df.to_parquet(tmppath, index=False)
+    os.replace(tmppath, filepath)
+    return df
+
+
+def run(algs, family='LFR', sizes=None, seeds=(1,), output='bench.parq', tag=None, params=None, timeout=None,
+        cold=True, avg_degree=20, mu=0.3):
+    '''
+    run the algorithms on graphs of increasing size and append the measures to a Parquet table.
+    An algorithm is not run on the larger graphs of a seed once it failed or timed out.
+
+    :param algs: names of registered algorithms
+    :param family: one of FAMILIES
+    :param sizes: numbers of nodes, see :func:`graph_sizes`
+    :param params: optional dict of algname to its parameters
+    :param timeout: wall-clock limit of the external programs of a run in seconds
+    :param cold: see :func:`measure`
+    :param avg_degree: average degree of the generated graphs
+    :param mu: mixing parameter of the LFR graphs
+    :rtype: the table
+    '''
+    logger = utils.get_logger("bench")
+    if sizes is None: sizes = graph_sizes(1000, 100000)
+    params = params or {}
+    for seed in seeds:
+        failed = set()
+        for n in sizes:
+            data = make_graph(family, n, seed=seed, avg_degree=avg_degree, mu=mu)
+            for algname in algs:
+                if algname in failed: continue
+                try:
+                    row = run_measure(algname, data.name, seed=seed, params=params.get(algname), timeout=timeout, cold=cold)
+                except Exception as e:  # the measuring process died
+                    row = {'dataname': data.name, 'n_node': n, 'algname': algname, 'seed': seed, 'status': 'failed',
+                           'error': "{}: {}".format(type(e).__name__, e), 'timestamp': time.time()}
+                row.update(tag=tag, family=family)
+                logger.info("{} on {}: {} wall={} rss={}MB {}".format(algname, data.name, row['status'],
+                            row.get('wall_time'), row.get('peak_rss_mb'), row['error'] or ""))
+                if row['status'] != 'done': failed.add(algname)
+                append_rows(output, [row])
+    return read_table(output)
+
+
+def fit_scaling(df, x='n_edge', y='wall_time', by=('tag', 'family', 'algname')):
+    '''
+    least squares fit of log(y) = log(c) + exponent * log(x) for each group of finished runs
+
+    :rtype: DataFrame with the columns of by, exponent, c, r2 and the number of points
+    '''
+    df = df[(df['status'] == 'done') & (df[x] > 0) & (df[y] > 0)]
+    by = [u for u in by if u in df.columns]
+    rows = []
+    for key, g in df.groupby(by, dropna=False):
+        key = key if isinstance(key, tuple) else (key,)
+        lx, ly = np.log(g[x].values.astype(float)), np.log(g[y].values.astype(float))
+        row = dict(zip(by, key), n_point=len(g), exponent=np.nan, c=np.nan, r2=np.nan)
+        if len(np.unique(lx)) >= 2:
+            slope, intercept = np.polyfit(lx, ly, 1)
+            res = ly - (slope * lx + intercept)
+            ss = ((ly - ly.mean()) ** 2).sum()
+            row.update(exponent=slope, c=np.exp(intercept), r2=1 - (res ** 2).sum() / ss if ss > 0 else 1.0)
+        rows.append(row)
+    return pd.DataFrame(rows, columns=by + ['n_point', 'exponent', 'c', 'r2'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m gct.bench", description="runtime versus graph size benchmark")
+    parser.add_argument("--algs", help="comma separated algorithm names")
+    parser.add_argument("--family", default='LFR', choices=FAMILIES)
+    parser.add_argument("--min-size", type=int, default=1000)
+    parser.add_argument("--max-size", type=int, default=100000)
+    parser.add_argument("--factor", type=float, default=2)
+    parser.add_argument("--avg-degree", type=int, default=20)
+    parser.add_argument("--mu", type=float, default=0.3, help="mixing parameter of the LFR graphs")
+    parser.add_argument("--seeds", default="1", help="comma separated seeds")
+    parser.add_argument("--timeout", type=float, default=None)
+    parser.add_argument("--warm", action='store_true', help="keep the converted files of the graphs")
+    parser.add_argument("--tag", default=None, help="label of the runs, e.g. a submodule version")
+    parser.add_argument("--output", default="bench.parq")
+    parser.add_argument("--fit", metavar="TABLE", help="only print the scaling exponents of a table")
+    args = parser.parse_args(argv)
+
+    if args.fit:
+        df = read_table(args.fit)
+    else:
+        if not args.algs: parser.error("--algs is required")
+        df = run(args.algs.split(","), family=args.family, sizes=graph_sizes(args.min_size, args.max_size, args.factor),
+                 seeds=[int(u) for u in args.seeds.split(",")], output=args.output, tag=args.tag, timeout=args.timeout,
+                 cold=not args.warm, avg_degree=args.avg_degree, mu=args.mu)
+    utils.pandas_show_all(fit_scaling(df))
+
+
+if __name__ == "__main__":
+    main()
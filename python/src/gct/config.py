@@ -18,9 +18,23 @@ assert DATA_HOME
 DATA_PATH = os.path.join(DATA_HOME, "data")
 DOWNLOAD_PATH = os.path.join(DATA_HOME, "download")
 RESULT_PATH = os.path.join(DATA_HOME, "result")
+BATCH_PATH = os.path.join(DATA_HOME, "batch")
 
 [utils.create_dir_if_not_exists(directory) for directory in [ DATA_PATH, DOWNLOAD_PATH, RESULT_PATH]]
 
+# memoized algorithm runs (see gct.alg.memo). GCT_RESULT_CACHE_SIZE is a size budget like GCT_CACHE_SIZE,
+# GCT_RESULT_CACHE_ENTRIES the maximum number of runs kept.
+RESULT_CACHE_PATH = os.path.join(DATA_HOME, "result_cache")
+RESULT_CACHE_SIZE_LIMIT = utils.parse_size(os.environ['GCT_RESULT_CACHE_SIZE']) if 'GCT_RESULT_CACHE_SIZE' in os.environ else None
+RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('GCT_RESULT_CACHE_ENTRIES', 1000))
+
+# size budget of converted files (edges.txt, pajek.txt, ...) under DATA_PATH, e.g. GCT_CACHE_SIZE=50G.
+# Least recently used ones are removed when it is exceeded. No limit if not set.
+if 'GCT_CACHE_SIZE' not in os.environ:
+    CACHE_SIZE_LIMIT = None
+else:
+    CACHE_SIZE_LIMIT = utils.parse_size(os.environ['GCT_CACHE_SIZE'])
+
 if 'GCT_HOME' not in os.environ:
     GCT_HOME = os.path.join(os.environ['HOME'], 'graph_clustering_toolkit')
 else:
@@ -82,6 +96,12 @@ def get_result_file_path(dsname, runname="", create=False):
         return dspath 
 
 
+def get_batch_path(name, create=False):
+    path = os.path.join(BATCH_PATH, name)
+    if create: utils.create_dir_if_not_exists(path)
+    return path
+
+
 def get_dct_prog(name, directed=False):
     if name == 'seq_louvain':
         prog = os.path.join(GCT_HOME, "submodules/distributed_clustering_thrill/seq_louvain")
@@ -1,6 +1,6 @@
 from .dataset import local_exists as local_graph_exists, load_local as load_local_graph, \
     list_local as list_local_graph, remove_local as remove_local_graph, list_all_clustering as list_all_clustering_results, \
-    list_clustering as list_clustering_result, create_dataset
+    list_clustering as list_clustering_result, create_dataset, local_summary as local_graph_summary
 from .dataset import load_dataset, list_dataset
 from .random_dataset import generate_ovp_LFR as generate_random_ovp_graph_LFR, generate_Erdos_Renyi as generate_random_graph_Erdos_Renyi   
 from .random_dataset import generate_undirected_unweighted_random_graph_LFR, generate_directed_unweighted_random_graph_LFR, \
@@ -0,0 +1,302 @@
+'''
+Cache of the files converted from a dataset (edges.txt, pajek.txt, anyscan.txt, scanbin/, ...).
+
+Each dataset directory keeps a manifest (cache.json) of its converted files. An entry is trusted only if it
+was built from the current content of edges.parq by the same converter version; otherwise it is rebuilt.
+Files are built under a temporary name and renamed into place, so a crashed conversion never leaves a file
+that looks complete. When config.CACHE_SIZE_LIMIT is set, the least recently used entries under
+config.DATA_PATH are removed until the total size fits.
+
+Several processes may convert the same dataset, e.g. the workers of :mod:`gct.batch`. Checking, building and
+recording an entry, removing a stale file and evicting one are all done under an exclusive lock of the dataset
+directory (fcntl.flock of cache.lock), so a process never removes a file that another one is building or has
+just built. A cache hit does not rewrite the manifest, it only touches the file: the last use of an entry is
+the later of its recorded time and the modification time of its file. Entries used in the last
+MIN_IDLE_SECONDS are not evicted, since another process may still be reading them.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import json
+import glob
+import time
+import fcntl
+import hashlib
+import threading
+import contextlib
+from gct import utils, config
+
+MANIFEST = 'cache.json'
+
+LOCK_FILE = 'cache.lock'
+
+# bytes read at once when computing checksums
+CHECKSUM_BLOCK_SIZE = 1 << 22
+
+# entries used more recently than this are not evicted
+MIN_IDLE_SECONDS = 600
+
+logger = utils.get_logger("cache")
+
+# locks held by the current thread, home -> [file, depth]
+_held = threading.local()
+
+# seconds spent by the current thread in converters and the depth of nested conversions, see build_time
+_build = threading.local()
+
+
+def path_size(path):
+    '''
+    size in bytes of a file, or of all files under a directory
+    '''
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, u)) for root, _, files in os.walk(path) for u in files)
+    elif os.path.exists(path):
+        return os.path.getsize(path)
+    return 0
+
+
+def remove_path(path):
+    utils.remove_if_file_exit(path, is_dir=os.path.isdir(path))
+
+
+def checksum(path):
+    '''
+    sha1 of a file, or of all files under a directory in sorted order
+    '''
+    if os.path.isdir(path):
+        files = sorted(os.path.join(root, u) for root, _, fnames in os.walk(path) for u in fnames)
+    else:
+        files = [path]
+    h = hashlib.sha1()
+    for fpath in files:
+        with open(fpath, 'rb') as f:
+            for block in iter(lambda: f.read(CHECKSUM_BLOCK_SIZE), b''):
+                h.update(block)
+    return h.hexdigest()
+
+
+@contextlib.contextmanager
+def lock(home):
+    '''
+    exclusive lock of the cache of a dataset directory, across processes and threads. It is reentrant in a
+    thread, so a converter may get another converted file of its dataset.
+    '''
+    held = _held.__dict__.setdefault('locks', {})
+    if home in held:
+        held[home][1] += 1
+        try:
+            yield
+        finally:
+            held[home][1] -= 1
+        return
+    with open(os.path.join(home, LOCK_FILE), 'a') as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        held[home] = [f, 1]
+        try:
+            yield
+        finally:
+            del held[home]
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def touch(path):
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+
+def last_use(path, entry):
+    '''
+    time of the last use of an entry, see :func:`touch`
+    '''
+    try:
+        return max(entry['atime'], os.stat(path).st_mtime)
+    except OSError:
+        return entry['atime']
+
+
+def build_time():
+    '''
+    seconds the current thread spent in the converters called by :meth:`ConversionCache.get`. A conversion
+    made by another one is counted once.
+    '''
+    return getattr(_build, 'seconds', 0.0)
+
+
+def timed_build(build, path):
+    '''
+    call a converter, adding its time to :func:`build_time` unless it runs inside another converter
+    '''
+    depth = getattr(_build, 'depth', 0)
+    _build.depth = depth + 1
+    t0 = time.time()
+    try:
+        build(path)
+    finally:
+        _build.depth = depth
+        if depth == 0: _build.seconds = build_time() + time.time() - t0
+
+
+def read_manifest(home):
+    fpath = os.path.join(home, MANIFEST)
+    try:
+        with open(fpath, 'rt') as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        manifest = {}
+    manifest.setdefault('entries', {})
+    return manifest
+
+
+def write_manifest(home, manifest):
+    fpath = os.path.join(home, MANIFEST)
+    tmppath = "{}.tmp-{}-{}".format(fpath, os.getpid(), threading.get_ident())
+    with open(tmppath, 'wt') as f:
+        json.dump(manifest, f)
+    os.replace(tmppath, fpath)
+
+
+class ConversionCache(object):
+    '''
+    converted files of one dataset.
+
+    :param home: dataset directory
+    :param source: the file the conversions are derived from, i.e. edges.parq
+    :param size_limit: LRU budget in bytes for all datasets, None for no limit
+    '''
+
+    def __init__(self, home, source, size_limit=None):
+        self.home = home
+        self.source = source
+        self.size_limit = size_limit
+
+    def source_checksum(self):
+        '''
+        checksum of the source. It is recomputed only when the size or the modification time of the source changes.
+        '''
+        st = os.stat(self.source)
+        stamp = [st.st_size, st.st_mtime_ns] if not os.path.isdir(self.source) else [path_size(self.source), st.st_mtime_ns]
+        source = read_manifest(self.home).get('source')
+        if source is not None and source.get('stamp') == stamp:
+            return source['checksum']
+        value = checksum(self.source)
+        with lock(self.home):
+            manifest = read_manifest(self.home)
+            manifest['source'] = {'stamp': stamp, 'checksum': value}
+            write_manifest(self.home, manifest)
+        return value
+
+    def key(self, version):
+        return "{}:{}".format(self.source_checksum(), version)
+
+    def _hit(self, name, key):
+        entry = read_manifest(self.home)['entries'].get(name)
+        return entry is not None and entry['key'] == key and os.path.exists(os.path.join(self.home, name))
+
+    def is_valid(self, name, version=1):
+        return self._hit(name, self.key(version))
+
+    def get(self, name, build, version=1):
+        '''
+        path of a converted file, building it when it is missing or stale.
+
+        :param name: file or directory name under the dataset directory
+        :param build: function taking a path and writing the converted file (or directory) there
+        :param version: converter version. Change it when the output of the converter changes.
+        :rtype: path
+        '''
+        path = os.path.join(self.home, name)
+        key = self.key(version)
+        if self._hit(name, key):
+            touch(path)
+            return path
+
+        with lock(self.home):
+            # another process may have built it while this one was waiting
+            if self._hit(name, key):
+                touch(path)
+                return path
+            if os.path.exists(path):
+                logger.info("removing stale " + path)
+                remove_path(path)
+            tmppath = "{}.tmp-{}-{}".format(path, os.getpid(), threading.get_ident())
+            try:
+                timed_build(build, tmppath)
+                if not os.path.exists(tmppath):
+                    raise Exception("converter did not write " + tmppath)
+                os.replace(tmppath, path)
+            except:
+                remove_path(tmppath)
+                raise
+            manifest = read_manifest(self.home)
+            manifest['entries'][name] = {'key': key, 'size': path_size(path), 'atime': time.time()}
+            write_manifest(self.home, manifest)
+
+        if self.size_limit is not None:
+            evict(self.size_limit, keep=[path])
+        return path
+
+    def invalidate(self, name=None):
+        '''
+        remove one converted file, or all of them when name is None.
+        '''
+        with lock(self.home):
+            manifest = read_manifest(self.home)
+            names = list(manifest['entries'].keys()) if name is None else [name]
+            for u in names:
+                manifest['entries'].pop(u, None)
+                remove_path(os.path.join(self.home, u))
+            write_manifest(self.home, manifest)
+
+
+def list_entries(data_path=None):
+    '''
+    all cache entries under data_path (default config.DATA_PATH)
+
+    :rtype: list of (path, size, last use)
+    '''
+    if data_path is None: data_path = config.DATA_PATH
+    ret = []
+    for fpath in glob.glob(os.path.join(data_path, "*", MANIFEST)):
+        home = os.path.dirname(fpath)
+        for name, entry in read_manifest(home)['entries'].items():
+            path = os.path.join(home, name)
+            ret.append((path, entry['size'], last_use(path, entry)))
+    return ret
+
+
+def evict(size_limit, keep=(), data_path=None, min_idle=MIN_IDLE_SECONDS):
+    '''
+    remove least recently used entries until the total size is within size_limit.
+
+    :param size_limit: budget in bytes
+    :param keep: paths which are never removed
+    :param min_idle: entries used in the last min_idle seconds are never removed
+    :rtype: list of removed paths
+    '''
+    entries = sorted(list_entries(data_path), key=lambda u: u[2])
+    total = sum(u[1] for u in entries)
+    removed = []
+    for path, size, _ in entries:
+        if total <= size_limit:
+            break
+        if path in keep:
+            continue
+        home, name = os.path.split(path)
+        with lock(home):
+            # checked again under the lock, it may have been used or rebuilt since it was listed
+            manifest = read_manifest(home)
+            entry = manifest['entries'].get(name)
+            if entry is None or last_use(path, entry) > time.time() - min_idle:
+                continue
+            logger.info("evicting {} ({} bytes)".format(path, entry['size']))
+            manifest['entries'].pop(name)
+            write_manifest(home, manifest)
+            remove_path(path)
+        total -= size
+        removed.append(path)
+    return removed
@@ -0,0 +1,198 @@
+'''
+Reader and writer of the CNL format, one cluster per line listing its member nodes
+(https://github.com/eXascaleInfolab/PyCABeM/blob/master/formats/format.cnl), and of the similar outputs
+of the wrapped programs.
+
+The reader parses the bytes of the file with numpy: every run of digits (with an optional leading '-') is a
+token and anything else separates tokens, so spaces, tabs, commas, '|' and ':' are all accepted. A token must be
+an integer of at most 18 digits and may not run into a '.', '_' or a letter, e.g. 0.5, 1-2 or 1e5 raise ValueError. The result
+is one flat integer array with line offsets, which is the CSR form of :py:class:`gct.dataset.membership.Membership`.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import numpy as np
+from gct.dataset.membership import Membership
+
+# bytes parsed at once
+DEFAULT_BLOCK_SIZE = 1 << 26
+
+# number of nodes formatted and written at once
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+NEWLINE, MINUS, ZERO, NINE = ord('\n'), ord('-'), ord('0'), ord('9')
+
+# longest integer read, any integer of 18 digits fits in int64
+MAX_DIGITS = 18
+
+POWERS_OF_TEN = 10 ** np.arange(MAX_DIGITS + 1, dtype=np.int64)
+
+# bytes a token may not touch
+WORD_BYTES = np.zeros(256, dtype=bool)
+WORD_BYTES[list(b'._abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ')] = True
+
+
+def read_blocks(f, block_size=DEFAULT_BLOCK_SIZE):
+    '''
+    read a binary file in blocks which end at a line break (except the last one)
+    '''
+    rest = b''
+    while True:
+        block = f.read(block_size)
+        if not block:
+            if rest: yield rest
+            return
+        block = rest + block
+        end = block.rfind(b'\n')
+        if end < 0:
+            rest = block
+        else:
+            yield block[:end + 1]
+            rest = block[end + 1:]
+
+
+def tokenize_block(block, comment=b'#'):
+    '''
+    integer tokens of a block of whole lines.
+
+    :rtype: (values, line of each value, number of lines)
+    '''
+    b = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(b == NEWLINE)
+    num_lines = len(newlines) + int(len(b) > 0 and b[-1] != NEWLINE)
+    is_minus = b == MINUS
+    tok = ((b >= ZERO) & (b <= NINE)) | is_minus
+    edges = np.diff(tok.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    # line of each token is the number of line breaks before it
+    lines = np.searchsorted(newlines, starts)
+    if comment and num_lines:
+        line_starts = np.concatenate([[0], newlines + 1])[:num_lines]
+        is_comment = b[line_starts] == ord(comment)
+        keep = ~is_comment[lines]
+        starts, ends, lines = starts[keep], ends[keep], lines[keep]
+    lengths = ends - starts
+    negative = is_minus[starts]
+    check_tokens(b, starts, ends, negative)
+
+    first = np.zeros(len(starts), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=first[1:])
+    pos = np.arange(lengths.sum(), dtype=np.int64) + np.repeat(starts - first, lengths)
+    digits = b[pos].astype(np.int64) - ZERO
+    digits[is_minus[pos]] = 0
+    exponent = np.repeat(ends - 1, lengths) - pos
+    values = np.add.reduceat(digits * POWERS_OF_TEN[exponent], first) if len(first) else np.zeros(0, dtype=np.int64)
+    values[negative] = -values[negative]
+    return values, lines, num_lines
+
+
+def check_tokens(b, starts, ends, negative):
+    '''
+    raise ValueError for a token which is not an integer of at most MAX_DIGITS digits, i.e. with a '-' after its
+    first byte, without digits, or running into a '.', '_' or a letter (e.g. 0.5, 1e5 or 12abc)
+    '''
+    minus_count = np.concatenate([[0], np.cumsum(b == MINUS)])
+    num_digits = ends - starts - negative
+    bad = (minus_count[ends] - minus_count[starts] > negative) | (num_digits == 0)
+    before, after = starts > 0, ends < len(b)
+    bad[before] |= WORD_BYTES[b[starts[before] - 1]]
+    bad[after] |= WORD_BYTES[b[ends[after]]]
+    if bad.any():
+        i = np.flatnonzero(bad)[0]
+        raise ValueError("invalid integer {!r}".format(bytes(b[max(starts[i] - 1, 0):ends[i] + 1]).decode(errors='replace')))
+    if len(num_digits) and num_digits.max() > MAX_DIGITS:
+        i = int(np.argmax(num_digits))
+        raise ValueError("integer {} has more than {} digits".format(bytes(b[starts[i]:ends[i]]).decode(), MAX_DIGITS))
+
+
+def tokenize(filepath, comment='#', header_lines=0, block_size=DEFAULT_BLOCK_SIZE):
+    '''
+    integer tokens of a text file as a CSR array of lines.
+
+    :param filepath: path of the file
+    :param comment: lines starting with it have no tokens. None to disable.
+    :param header_lines: number of leading lines to skip
+    :rtype: (values, offsets). The tokens of line i (after the header) are values[offsets[i]:offsets[i+1]].
+    '''
+    comment = comment.encode() if comment else None
+    values, lines = [], []
+    num_lines = 0
+    with open(filepath, 'rb') as f:
+        for _ in range(header_lines):
+            f.readline()
+        for block in read_blocks(f, block_size):
+            v, line, n = tokenize_block(block, comment)
+            values.append(v)
+            lines.append(line + num_lines)
+            num_lines += n
+    values = np.concatenate(values) if values else np.zeros(0, dtype=np.int64)
+    lines = np.concatenate(lines) if lines else np.zeros(0, dtype=np.int64)
+    offsets = np.zeros(num_lines + 1, dtype=np.int64)
+    np.cumsum(np.bincount(lines, minlength=num_lines), out=offsets[1:])
+    return values, offsets
+
+
+def line_ranks(offsets):
+    '''
+    position of each token within its line
+    '''
+    sizes = np.diff(offsets)
+    return np.arange(offsets[-1]) - np.repeat(offsets[:-1], sizes)
+
+
+def read_cnl(filepath, first_field=None, node_map=None, comment='#', header_lines=0, block_size=DEFAULT_BLOCK_SIZE):
+    '''
+    read a CNL-like file into a membership. Cluster i is line i (after the header); lines without
+    nodes make no cluster, and repeated nodes of a line are kept once.
+
+    :param first_field: None if every token is a node, 'skip' to ignore the first token of a line
+                        (e.g. the size of the cluster), 'label' if it is the id of the cluster
+    :param node_map: optional array translating the node ids of the file, node i of the file is node_map[i]
+    :param comment: lines starting with it are skipped. None to disable.
+    :param header_lines: number of leading lines to skip
+    :rtype: :py:class:`gct.dataset.membership.Membership`
+    '''
+    values, offsets = tokenize(filepath, comment=comment, header_lines=header_lines, block_size=block_size)
+    num_lines = len(offsets) - 1
+    lines = np.repeat(np.arange(num_lines), np.diff(offsets))
+    if first_field is None:
+        return Membership.from_codes(values if node_map is None else np.asarray(node_map)[values], lines, np.arange(num_lines))
+    elif first_field not in ('skip', 'label'):
+        raise ValueError("unknown first_field " + str(first_field))
+    is_first = line_ranks(offsets) == 0
+    nodes = values[~is_first]
+    if node_map is not None:
+        nodes = np.asarray(node_map)[nodes]
+    if first_field == 'skip':
+        return Membership.from_codes(nodes, lines[~is_first], np.arange(num_lines))
+    labels = np.full(num_lines, -1, dtype=np.int64)
+    labels[lines[is_first]] = values[is_first]
+    return Membership.from_pairs(nodes, labels[lines[~is_first]])
+
+
+def write_cnl(filepath, membership, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    write one line of space separated nodes per cluster, in the order of the cluster ids.
+
+    :param membership: :py:class:`gct.dataset.membership.Membership`
+    :param chunk_size: approximate number of nodes formatted at once
+    :rtype: filepath
+    '''
+    offsets = membership.offsets
+    n = len(offsets) - 1
+    with open(filepath, 'wt') as f:
+        start = 0
+        while start < n:
+            end = int(np.searchsorted(offsets, offsets[start] + chunk_size, side='right')) - 1
+            end = min(n, max(start + 1, end))
+            tokens = membership.nodes[offsets[start]:offsets[end]].astype(str).tolist()
+            seps = np.full(len(tokens), " ", dtype='<U1')
+            seps[offsets[start + 1:end + 1] - offsets[start] - 1] = "\n"
+            out = [None] * (2 * len(tokens))
+            out[0::2] = tokens
+            out[1::2] = seps.tolist()
+            f.write("".join(out))
+            start = end
+    return filepath
@@ -10,7 +10,7 @@ import numpy as np
 from scipy.sparse.coo import coo_matrix
 
 
-def from_edgelist(name, edgelist , groundtruth=None, directed=False , description="", overide=True):
+def from_edgelist(name, edgelist , groundtruth=None, directed=False , description="", overide=True, out_of_core=False):
     """
     create a graph from edge list.
     
@@ -24,6 +24,7 @@ def from_edgelist(name, edgelist , groundtruth=None, directed=False , descriptio
     :param directed:     this is a directed graph
     :param description:    discription
     :param overide:        When true and the named dataset already exists, it will be deleted
+    :param out_of_core:    clean and deduplicate edges on disk, see :py:class:`gct.Dataset`
     
     :rtype: :py:class:`gct.Dataset` 
     
@@ -40,7 +41,8 @@ def from_edgelist(name, edgelist , groundtruth=None, directed=False , descriptio
     else:
         raise Exception("Format not right")
     
-    return Dataset(name=name, edgesObj=edgelist, groundtruthObj=groundtruth, weighted=weighted, directed=directed, description=description, overide=overide)
+    return Dataset(name=name, edgesObj=edgelist, groundtruthObj=groundtruth, weighted=weighted, directed=directed, description=description, overide=overide,
+                   out_of_core=out_of_core)
 
     
 # turn a dataset into a networkx graph
@@ -230,20 +232,14 @@ def to_graph_tool(data):
 
 def to_coo_adjacency_matrix(data, simalarity=False, distance_fun=None):
     '''
-    convert the dataset to a sparse coo adjacency matrix.
+    convert the dataset to a sparse coo adjacency matrix. It is built from :meth:`gct.Dataset.to_csr`.
     
     :param data: :py:class:`gct.Dataset`
     :rtype: scipy coo_matrix
     '''
      
-    edges = data.get_edges()
-    rows = edges['src'].values
-    cols = edges['dest'].values
-    n = int(max(np.max(rows), np.max(cols))) + 1
-    if data.is_weighted():
-        weight = edges['weight'].values
-    else:
-        weight = np.ones_like(rows)
+    A = data.to_csr().tocoo(copy=True)
+    weight = A.data
     if not simalarity:  # distance
         if distance_fun is None or distance_fun == 'minus':
             weight = -weight
@@ -251,13 +247,7 @@ def to_coo_adjacency_matrix(data, simalarity=False, distance_fun=None):
             weight = np.exp(-weight)
         else:
             raise ValueError("unknown " + distance_fun)
-    if data.is_directed():
-        return coo_matrix((weight, (rows, cols)), shape=[n, n])
-    else:
-        newX = np.concatenate([weight, weight])
-        newrows = np.concatenate([rows, cols])
-        newcols = np.concatenate([cols, rows])
-        return coo_matrix((newX, (newrows, newcols)), shape=[n, n])
+    return coo_matrix((weight, (A.row, A.col)), shape=A.shape)
 
 
 def as_undirected(data, newname, description="", overide=False):
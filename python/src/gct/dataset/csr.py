@@ -0,0 +1,100 @@
+'''
+Compressed sparse row (CSR) adjacency kept as .npy files next to a dataset,
+so that it is built once and then memory-mapped by every process that needs it.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import numpy as np
+from gct import utils
+from gct.dataset import fileformat
+
+CSR_FILES = ['indptr.npy', 'indices.npy', 'weights.npy']
+
+
+def index_dtype(num_node, nnz):
+    '''
+    the index dtype scipy would pick, so the arrays can be wrapped without a copy.
+    '''
+    if max(num_node, nnz) < np.iinfo(np.int32).max:
+        return np.int32
+    return np.int64
+
+
+def build_csr(src, dest, weight=None, num_node=None, symmetric=False):
+    '''
+    build CSR arrays from an edge list. Rows are sorted by column and duplicated entries are summed.
+
+    :param src: source nodes
+    :param dest: target nodes
+    :param weight: edge weights, 1 if None
+    :param num_node: number of rows, default max node id + 1
+    :param symmetric: also add the reverse of every edge (undirected graph)
+    :rtype: (indptr, indices, weights)
+    '''
+    src = np.asarray(src, dtype=np.int64)
+    dest = np.asarray(dest, dtype=np.int64)
+    if weight is None:
+        weight = np.ones(len(src), dtype=np.float32)
+    else:
+        weight = np.asarray(weight, dtype=np.float32)
+    if symmetric:
+        src, dest = np.concatenate([src, dest]), np.concatenate([dest, src])
+        weight = np.concatenate([weight, weight])
+    if num_node is None:
+        num_node = int(max(src.max(), dest.max())) + 1 if len(src) else 0
+
+    order = fileformat.edge_order(src, dest)
+    src, dest, weight = src[order], dest[order], weight[order]
+    if len(src) > 1:
+        is_new = np.empty(len(src), dtype=bool)
+        is_new[0] = True
+        np.not_equal(src[1:], src[:-1], out=is_new[1:])
+        is_new[1:] |= dest[1:] != dest[:-1]
+        if not is_new.all():
+            starts = np.flatnonzero(is_new)
+            weight = np.add.reduceat(weight, starts)
+            src, dest = src[starts], dest[starts]
+
+    dtype = index_dtype(num_node, len(dest))
+    indptr = np.zeros(num_node + 1, dtype=dtype)
+    np.cumsum(np.bincount(src, minlength=num_node), out=indptr[1:])
+    return indptr, dest.astype(dtype), weight
+
+
+def csr_exists(dirpath):
+    return all(utils.file_exists(os.path.join(dirpath, u)) for u in CSR_FILES)
+
+
+def save_csr(dirpath, indptr, indices, weights):
+    '''
+    save CSR arrays under dirpath. Each file is written to a temporary name first and then renamed.
+    '''
+    utils.create_dir_if_not_exists(dirpath)
+    for fname, arr in zip(CSR_FILES, [indptr, indices, weights]):
+        path = os.path.join(dirpath, fname)
+        tmppath = path + ".tmp.npy"
+        np.save(tmppath, arr)
+        os.replace(tmppath, path)
+    return dirpath
+
+
+def load_csr(dirpath, mmap_mode='r'):
+    '''
+    load CSR arrays saved by :func:`save_csr`.
+
+    :param mmap_mode: passed to np.load. The default 'r' shares the page cache among processes.
+    :rtype: (indptr, indices, weights)
+    '''
+    return tuple(np.load(os.path.join(dirpath, u), mmap_mode=mmap_mode) for u in CSR_FILES)
+
+
+def to_scipy(indptr, indices, weights):
+    '''
+    wrap CSR arrays into a scipy csr_matrix without copying them.
+    '''
+    from scipy.sparse import csr_matrix
+    n = len(indptr) - 1
+    return csr_matrix((weights, indices, indptr), shape=(n, n), copy=False)
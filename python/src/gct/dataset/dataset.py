@@ -1,4 +1,4 @@
-from gct import utils, config
+from gct import utils, config, process
 import fastparquet
 import json 
 import numpy as np
@@ -6,36 +6,72 @@ import pandas as pd
 import os
 import sys
 import glob
+import shutil
+import numbers
 from gct.utils import TempDir
+from gct.dataset import dtypes, cnl
+from gct.dataset.membership import Membership
 from fnmatch import fnmatch
 
 
+def edge_stats(src, dest, is_edge_mirrored=False):
+    '''
+    summary of an edge list which is kept in meta.info, so sizes are known without reading the edges.
+    
+    The degree of a node is the number of edges it is an endpoint of (both directions for a directed graph). 
+    For mirrored edges only the src column is counted.
+    
+    :rtype: dict
+    '''
+    src = np.asarray(src)
+    dest = np.asarray(dest)
+    ids, counts = np.unique(np.concatenate([src, dest]), return_counts=True)
+    if is_edge_mirrored:
+        counts = np.bincount(np.searchsorted(ids, src), minlength=len(ids))
+    return degree_stats(ids, counts, len(src))
+
+
+def degree_stats(ids, counts, num_edge):
+    '''
+    the dict returned by :func:`edge_stats`, from sorted unique node ids and their degrees.
+    '''
+    d = {'num_node': len(ids), 'num_edge': num_edge}
+    if len(ids):
+        d['min_node'] = ids[0].item()
+        d['max_node'] = ids[-1].item()
+        d['degree'] = {'min': counts.min().item(), 'max': counts.max().item(),
+                       'mean': float(counts.mean()), 'median': float(np.median(counts))}
+    return d 
+
+
 class Clustering(object):
     '''
     A clustering (or partition) of a graph. May be disjointed or overlapped. The partitions in the clustering are also called clusters.  
+    
+    Clusters are kept as arrays in CSR form (see :py:class:`gct.dataset.membership.Membership`);
+    the dataframe returned by :meth:`value` is made on demand.
     '''
 
     def __init__(self, clusteringobj):
         self.logger = utils.get_logger("{}".format(type(self).__name__))
-        self.cluster = None 
+        self.membership = None 
         self.path = None 
         from gct.alg.clustering import Result
         if isinstance(clusteringobj, str):
             self.path = utils.abspath(clusteringobj)
+        elif isinstance(clusteringobj, Membership):
+            self.membership = clusteringobj
         elif isinstance(clusteringobj, Result):
-            self.cluster = clusteringobj.clustering(as_dataframe=True)
+            self.membership = clusteringobj.clustering().membership
         elif isinstance(clusteringobj, dict):
             if 'clusters' in clusteringobj: # a dict result
-                self.cluster = Result(clusteringobj).clustering(as_dataframe=True)
+                self.membership = Result(clusteringobj).clustering().membership
             else: # assume it is a dict(cluster_id, list[node])
-                arr = np.array([[u,v] for u,vv in clusteringobj.items() for v in vv ])
-                if len(arr.shape) != 2 or arr.shape[1] != 2:
-                    raise ValueError("arg is not right")
-                self.cluster = pd.DataFrame(arr, columns=['node', 'cluster'])
+                self.membership = Membership.from_dict(clusteringobj)
         elif isinstance(clusteringobj, pd.DataFrame):
             if not 'cluster' in clusteringobj.columns or not 'node' in clusteringobj.columns:
                 raise ValueError("arg is not right")
-            self.cluster = clusteringobj[['node', 'cluster']]
+            self.membership = Membership.from_frame(clusteringobj)
         else:  
             if isinstance(clusteringobj, list):
                 arr = np.array(clusteringobj)
@@ -45,9 +81,7 @@ class Clustering(object):
                 raise ValueError("arg is not right")
             if len(arr.shape) != 2 or arr.shape[1] != 2:
                 raise ValueError("arg is not right")
-            self.cluster = pd.DataFrame(arr, columns=['node', 'cluster'])
-        if self.cluster is not None:
-            self.cluster = self.cluster.drop_duplicates()
+            self.membership = Membership.from_pairs(arr[:, 0], arr[:, 1])
 
     def persistent_cnl(self):
         if self.path is not None:
@@ -65,12 +99,7 @@ class Clustering(object):
         
         :param filepath: where to save
         '''
-        df = self.value()
-        with open(filepath, 'wt') as f :
-            for lst in df.groupby('cluster')['node'].apply(lambda u: list(u)):
-                line = " ".join([str(u) for u in lst]) + "\n"
-                f.write(line)
-        return filepath 
+        return cnl.write_cnl(filepath, self.get_membership())
     
     # if persistent cnl exists, it will be linked to filepath, otherwise write clsuters to filepath  
     def make_cnl_file(self, filepath=None):
@@ -84,50 +113,58 @@ class Clustering(object):
     def is_persistent(self):
         return self.path is not None  and utils.file_exists(self.path)
 
+    def get_membership(self):
+        '''
+        :rtype: :py:class:`gct.dataset.membership.Membership`
+        '''
+        if self.membership is None:
+            self.logger.info("reading " + self.path)
+            self.membership = Membership.from_frame(fastparquet.ParquetFile(self.path).to_pandas())
+        return self.membership
+
     @property 
     def index(self):
         """
         :rtype: cluster ids
         """
-        prop_name = "_" + sys._getframe().f_code.co_name 
-
-        def f():
-            df = self.value()
-            return np.unique(df['cluster'].values)
-
-        return utils.set_if_not_exists(self, prop_name, f)
+        return self.get_membership().cluster_ids
 
     @property 
     def num_cluster(self):
         '''
         number of clusters
         '''
-        return len(self.index)
+        return self.get_membership().num_cluster
     
+    @property 
+    def num_node(self):
+        '''
+        number of distinct nodes
+        '''
+        return self.get_membership().num_node
+
     @property 
     def is_overlap(self):
         """
         :rtype: True if the clusters are overlapped
         """
-        prop_name = "_" + sys._getframe().f_code.co_name 
-
-        def f():
-            return (self.node_overlaps > 1).any()
-
-        return utils.set_if_not_exists(self, prop_name, f)
+        return self.get_membership().is_overlap
     
     @property 
     def node_overlaps(self):
         '''
         :rtype: overlapping count of each node.
         '''
-        prop_name = "_" + sys._getframe().f_code.co_name 
-
-        def f():
-            df = self.value()
-            return df.groupby('node')['cluster'].count()
+        m = self.get_membership()
+        return pd.Series(m.overlaps, index=pd.Index(m.inverse[0], name='node'), name='cluster')
 
-        return utils.set_if_not_exists(self, prop_name, f)
+    @property 
+    def cluster_sizes(self):
+        '''
+        :rtype: number of nodes of each cluster.
+        '''
+        m = self.get_membership()
+        return pd.Series(m.sizes, index=pd.Index(m.cluster_ids, name='cluster'), name='node')
         
     def persistent(self, filepath=None, force=False):
         assert not (self.path is  None  and filepath is None)
@@ -164,25 +201,38 @@ class Clustering(object):
         else:
             raise ValueError("Error: " + format) 
         
-    def value(self, erase_overlap=False):
+    def value(self, erase_overlap=False, seed=None):
         '''
+        :param erase_overlap: keep only one cluster for each node, chosen at random
+        :param seed: an integer seed, a numpy random Generator/RandomState, or None for a fresh random choice.
+                     The erased clustering of an integer seed is cached, a copy of it is returned.
         :rtype: Pandas dataframe of clustering
         '''
-        ret = None
-        if self.cluster is not None: 
-            ret= self.cluster
-        else:
-            self.logger.info("reading" + self.path)
-            df = fastparquet.ParquetFile(self.path).to_pandas()
-            self.cluster = df 
-            if self.cluster is not None:
-                self.cluster = self.cluster.drop_duplicates()            
-            ret = self.cluster
-        if not erase_overlap:
-            return ret 
-        else:
-            fn = lambda obj: obj.loc[np.random.choice(obj.index, 1, False),:]
-            return ret.groupby('node', as_index=False).apply(fn)
+        if not erase_overlap or not self.is_overlap:
+            return self.get_membership().to_frame()
+        if not isinstance(seed, numbers.Integral):
+            return self.erase_overlap(seed)
+        cache = utils.set_if_not_exists(self, "_erased", dict)
+        if seed not in cache:
+            cache[seed] = self.erase_overlap(seed)
+        return cache[seed].copy()
+
+    def erase_overlap(self, seed=None):
+        '''
+        a random cluster for each node: the memberships are shuffled once and the first one of each node is kept.
+        
+        :param seed: see :meth:`value`
+        :rtype: Pandas dataframe of clustering, sorted by node
+        '''
+        m = self.get_membership()
+        rng = seed if isinstance(seed, (np.random.Generator, np.random.RandomState)) else np.random.default_rng(seed)
+        perm = rng.permutation(len(m.nodes))
+        shuffled = m.nodes[perm]
+        order = np.argsort(shuffled, kind='stable')
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = shuffled[order[1:]] != shuffled[order[:-1]]
+        selected = perm[order[first]]
+        return pd.DataFrame({'node': m.nodes[selected], 'cluster': m.cluster_column()[selected]})
 
         
 class Dataset(object):
@@ -197,14 +247,21 @@ class Dataset(object):
     :py:meth:`gct.from_snap`, :py:meth:`gct.from_igraph`, :py:meth:`gct.from_networkx`, :py:meth:`gct.from_networkit`
     
     There are also building graphs that can be loaded directly. Use :py:meth:`gct.list_dataset` to find them.
+    
+    For edge lists too large to be cleaned in memory, use out_of_core=True: edges are then canonicalized and deduplicated 
+    with sorted runs on disk (:mod:`gct.dataset.extsort`) while written to edges.parq. edgesObj may also be an iterable of 
+    dataframes in this mode.
     '''
 
     def __init__(self, name=None, description="", groundtruthObj=None, edgesObj=None, directed=False,
-                 weighted=False, overide=False, additional_meta=None, is_edge_mirrored=False):
+                 weighted=False, overide=False, additional_meta=None, is_edge_mirrored=False, stats=None, out_of_core=False):
         assert edgesObj is not None 
         self.name = name 
         self.description = description
         self.additional_meta = additional_meta
+        self.stats = stats 
+        self.out_of_core = out_of_core
+        self.pending_edges = None 
         self.logger = utils.get_logger("{}:{}".format(type(self).__name__, self.name))
         self.directed = directed 
         self.weighted = weighted
@@ -224,6 +281,11 @@ class Dataset(object):
             self.file_mcl_tab = config.get_data_file_path(self.name, 'mcl.tab')
             self.file_topgc = config.get_data_file_path(self.name, 'topgc.txt')
             self.file_mirror_edges = config.get_data_file_path(self.name, 'edges_mirror.txt')
+            self.file_csr = config.get_data_file_path(self.name, 'csr')
+            self.file_node_map = config.get_data_file_path(self.name, 'node_map.npy')
+            self.file_dense_edges = config.get_data_file_path(self.name, 'dense_edges.npy')
+            self.file_dense_edgelist = config.get_data_file_path(self.name, 'dense_edges.txt')
+            self.file_dense_anyscan = config.get_data_file_path(self.name, 'dense_anyscan.txt')
             
             if self.is_weighted():
                 self.file_unweighted_edges = self.file_edges
@@ -284,7 +346,13 @@ class Dataset(object):
     def save_edges(self, filepath, format="parq"):
         assert filepath 
         self.logger.info("writing" + filepath)
-        if format == "parq":
+        if self.pending_edges is not None:
+            from gct.dataset import ingest 
+            assert format == "parq"
+            self.stats = ingest.write_edges(filepath, self.pending_edges, directed=self.is_directed(), weighted=self.is_weighted(),
+                                            is_edge_mirrored=self.is_edge_mirrored, out_of_core=True)
+            self.pending_edges = None 
+        elif format == "parq":
             fastparquet.writer.write(filepath, self.get_edges(), compression="SNAPPY")
         elif format == "csv":
             self.value().to_csv(filepath, index=None)
@@ -301,6 +369,8 @@ class Dataset(object):
              'directed': self.is_directed(),
              'is_edge_mirrored':self.is_edge_mirrored}
         d['parq_edges'] = self.parq_edges
+        if self.stats is not None:
+            d['stats'] = self.stats
         
         if self.has_ground_truth():
             d['parq_ground_truth'] = {u:v.path for u, v in self.get_ground_truth().items()}
@@ -315,7 +385,10 @@ class Dataset(object):
     def update_meta(self):
         if not self.is_anonymous():
             meta_file = config.get_data_file_path(self.name, 'meta.info')
-            json.dump(self.get_meta(), open(meta_file, 'wt')) 
+            tmp_file = "{}.tmp-{}".format(meta_file, os.getpid())
+            with open(tmp_file, 'wt') as f:
+                json.dump(self.get_meta(), f)
+            os.replace(tmp_file, meta_file)
 
     def is_ground_truth_persistent(self):
         if self.has_ground_truth():
@@ -340,17 +413,26 @@ class Dataset(object):
         else:
             self.ground_truth = {"default":to_clustering(obj)}
 
-    @property 
-    def num_node_edge(self):
-
-        def f():
+    def get_stats(self):
+        '''
+        node/edge counts, node id range and degree summary, see :func:`edge_stats`. 
+        
+        They are computed when the edges are set and saved in meta.info, so a loaded dataset does not read its edges. 
+        For datasets saved without them, they are computed once and added to meta.info.
+        
+        :rtype: dict
+        '''
+        if self.stats is None:
             df = self.get_edges()
-            m = len(df)
-            n = len(set(np.unique(self.edges[['src', 'dest']].values)))
-            return (n, m)
+            self.stats = edge_stats(df['src'].values, df['dest'].values, self.is_edge_mirrored)
+            if self.is_edges_persistent():
+                self.update_meta()
+        return self.stats 
 
-        prop_name = "_num_node_edge"        
-        return utils.set_if_not_exists(self, prop_name, f)
+    @property 
+    def num_node_edge(self):
+        stats = self.get_stats()
+        return (stats['num_node'], stats['num_edge'])
 
     @property 
     def num_node(self):
@@ -365,6 +447,12 @@ class Dataset(object):
         if isinstance(v, str):
             self.parq_edges = utils.abspath(v)
             return self 
+        elif self.out_of_core:
+            # cleaned and deduplicated on disk when the edges are saved, see save_edges
+            if self.is_anonymous():
+                raise ValueError("out_of_core needs a named dataset")
+            self.pending_edges = self._edge_chunks(v)
+            return self 
         else:
             if isinstance(v, pd.DataFrame):
                 if not 'src' in v.columns or not 'dest' in v.columns or (self.is_weighted() and 'weight' not in v.columns):
@@ -394,8 +482,8 @@ class Dataset(object):
                 else:
                     assert 'weight' not in edges.columns
 
-                edges['src'] = edges['src'].astype(np.int)
-                edges['dest'] = edges['dest'].astype(np.int)
+                edges['src'] = edges['src'].astype(np.int64)
+                edges['dest'] = edges['dest'].astype(np.int64)
                 if self.is_weighted(): 
                     edges['weight'] = edges['weight'].astype(np.float32)
 
@@ -408,12 +496,24 @@ class Dataset(object):
 
             clean_edges()
             
-            self.edges = self.edges.drop_duplicates()
-            num_edge = len(self.edges)
-            num_node = len(np.unique(self.edges[['src', 'dest']].values.ravel()))
-            self._num_node_edge = (num_node, num_edge)
+            self.edges = dtypes.compact_edges(self.edges.drop_duplicates())
+            self.stats = edge_stats(self.edges['src'].values, self.edges['dest'].values, self.is_edge_mirrored)
             return self 
 
+    def _edge_chunks(self, obj, chunk_size=1 << 22):
+        columns = ['src', 'dest', 'weight'] if self.is_weighted() else ['src', 'dest']
+        if isinstance(obj, pd.DataFrame):
+            if not set(columns).issubset(obj.columns):
+                raise ValueError("arg is not right")
+            return (obj[columns].iloc[i:i + chunk_size] for i in range(0, len(obj), chunk_size))
+        elif isinstance(obj, (list, np.ndarray)):
+            arr = np.asarray(obj)
+            if len(arr.shape) != 2  or arr.shape[1] != len(columns):
+                raise ValueError("data shape is not correct: " + str(arr.shape))
+            return (pd.DataFrame(arr[i:i + chunk_size], columns=columns) for i in range(0, len(arr), chunk_size))
+        else:  # an iterable of dataframes
+            return iter(obj)
+
     def __str__(self, *args, **kwargs):
         d = self.get_meta()
         return json.dumps(d)
@@ -431,7 +531,7 @@ class Dataset(object):
     def get_edges(self):
         if not hasattr(self, 'edges'):
             self.logger.info("reading " + self.parq_edges)
-            self.edges = fastparquet.ParquetFile(self.parq_edges).to_pandas() 
+            self.edges = dtypes.compact_edges(fastparquet.ParquetFile(self.parq_edges).to_pandas())
         return self.edges            
     
     # return
@@ -440,31 +540,28 @@ class Dataset(object):
             return self.ground_truth
         return None 
  
-    def to_edgelist(self, filepath=None, sep=" ", sort=False):
+    def to_edgelist(self, filepath=None, sep=" ", sort=False, dense=False):
+        '''
+        write edges as a text edge list.
+        
+        :param dense: write dense node ids (see :meth:`get_node_map`). The default file is dense_edges.txt 
+                      unless the ids are already dense.
+        '''
+        dense = dense and not self.has_dense_ids()
         if (filepath == None):
-            filepath = self.file_edges
-            if utils.file_exists(filepath):
-                return filepath 
+            return self.cached_file(self.file_dense_edgelist if dense else self.file_edges,
+                                    lambda u: self.to_edgelist(u, sep=sep, sort=sort, dense=dense))
         self.logger.info("writing edges to " + filepath)
-        with open(filepath, 'wt') as f :
-            columns = ['src', 'dest', 'weight'] if self.is_weighted() else ['src', 'dest']
-            df = self.get_edges()[columns]
-            if sort:
-                df = df.sort_values(by=['src', 'dest'])
-            for i in range(df.shape[0]):
-                r = df.iloc[i]
-                r = ['%g' % (u) for u in r ]
-                row = sep.join(r)  
-                row += "\n"
-                f.write(row)
-        self.logger.info("finish writing " + filepath)                
-        return filepath 
+        from gct.dataset import fileformat
+        df = self.get_dense_edges() if dense else self.get_edges()
+        weight = df['weight'].values if self.is_weighted() else None
+        fileformat.write_edgelist(filepath, df['src'].values, df['dest'].values, weight, sep=sep, sort=sort)
+        self.logger.info("finish writing " + filepath)
+        return filepath
 
     def to_snapformat(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_snap 
-            if utils.file_exists(filepath):
-                return filepath
+            return self.cached_file(self.file_snap, self.to_snapformat)
         
         import snap        
         from gct.dataset import convert
@@ -478,94 +575,81 @@ class Dataset(object):
         
     def to_pajek(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_pajek
-            if utils.file_exists(filepath):
-                return filepath             
-        if not utils.file_exists(self.file_edges): self.to_edgelist()
-        from gct.dataset import edgelist2pajek
-        edgelist2pajek.edgelist_to_pajek(self.file_edges, self.file_pajek , self.is_directed(), self.is_weighted())
-        return filepath 
+            return self.cached_file(self.file_pajek, self.to_pajek)
+        self.logger.info("writing pajek to " + filepath)
+        from gct.dataset import fileformat
+        df = self.get_edges()
+        weight = df['weight'].values if self.is_weighted() else None
+        fileformat.write_pajek(filepath, df['src'].values, df['dest'].values, weight, directed=self.is_directed())
+        return filepath
 
     def to_scanbin(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_scanbin
-            if utils.file_exists(os.path.join(filepath, "b_degree.bin")) and utils.file_exists(os.path.join(filepath, "b_adj.bin")):
-                return filepath         
-            utils.create_dir_if_not_exists(filepath)    
-        if not utils.file_exists(self.file_edges): self.to_edgelist()
-        cmd = "{} {} {} {}".format(config.SCAN_CONVERT_PROG, self.file_edges, "b_degree.bin", "b_adj.bin")
+            return self.cached_file(self.file_scanbin, self.to_scanbin)
+        utils.create_dir_if_not_exists(filepath)    
+        cmd = "{} {} {} {}".format(config.SCAN_CONVERT_PROG, self.to_edgelist(), "b_degree.bin", "b_adj.bin")
         self.logger.info("running " + cmd)
-        status = utils.shell_run_and_wait(cmd, filepath)
+        status = process.run(cmd, cwd=filepath)
         if (status != 0):
             raise Exception("run command failed: " + str(status))
         return filepath 
 
     def to_mcl_mci(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_mcl_mci
-            if utils.file_exists(filepath):
-                return filepath         
-        if not utils.file_exists(self.file_edges): self.to_edgelist()
+            return self.cached_file(self.file_mcl_mci, self.to_mcl_mci)
+        edgefile = self.to_edgelist()
         if not self.is_directed():
-            cmd = "{} --stream-mirror -123 {} -o {} --write-binary".format(config.MCL_CONVERT_PROG, self.file_edges, filepath)
+            cmd = "{} --stream-mirror -123 {} -o {} --write-binary".format(config.MCL_CONVERT_PROG, edgefile, filepath)
         else:
-            cmd = "{} -123 {} -o {} --write-binary".format(config.MCL_CONVERT_PROG, self.file_edges, filepath)
+            cmd = "{} -123 {} -o {} --write-binary".format(config.MCL_CONVERT_PROG, edgefile, filepath)
         self.logger.info("running " + cmd)
-        status = utils.shell_run_and_wait(cmd)
+        status = process.run(cmd)
         if (status != 0):
             raise Exception("run command failed: " + str(status))
         return filepath 
 
-    def to_anyscan(self, filepath=None):
+    def to_anyscan(self, filepath=None, dense=False):
+        '''
+        write the adjacency list format of anyscan.
+        
+        :param dense: write dense node ids (see :meth:`get_node_map`), so no fake node is added for the gaps. 
+                      The default file is dense_anyscan.txt unless the ids are already dense.
+        '''
         if False and self.is_directed():
             raise Exception("directed graph not supported")
+        dense = dense and not self.has_dense_ids()
         if (filepath == None):
-            filepath = self.file_anyscan
-            if utils.file_exists(filepath):
-                return filepath
+            return self.cached_file(self.file_dense_anyscan if dense else self.file_anyscan,
+                                    lambda u: self.to_anyscan(u, dense=dense))
             
-        edges1 = self.get_edges()[['src', 'dest']]
+        edges1 = self.get_dense_edges() if dense else self.get_edges()
         min_node = min(edges1['src'].min(), edges1['dest'].min())
         max_node = max(edges1['src'].max(), edges1['dest'].max())
         self.logger.info("min node: {}, max node: {}".format(min_node, max_node))
         if min_node != 0  :
             self.logger.warn("node id is greater than 0, fake node will be added")
 
-        self_edges = pd.DataFrame([[u, u] for u in range(max_node + 1)], columns=['src', 'dest'])
-        edges2 = edges1[['dest', 'src']].copy();  edges2.columns = ['src', 'dest']
-        edges = pd.concat([edges1, edges2, self_edges], axis=0)
-        del edges1, edges2, self_edges 
-
-        def fun(df):
-            values = sorted(list(set(df['dest'])))
-            return str(len(values)) + " " + " ".join([str(u) for u in values])
-
-        grouped = edges.groupby('src').apply(fun).reset_index()
-        with open(filepath, 'wt') as f:
-            f.write(str(max_node + 1) + "\n")
-            for i in grouped.index: 
-                f.write(grouped.loc[i, 0] + "\n")
-        return filepath 
+        from gct.dataset import fileformat
+        return fileformat.write_anyscan(filepath, edges1['src'].values, edges1['dest'].values)
 
     def to_higformat(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_hig
-            if utils.file_exists(filepath):
-                return filepath         
-        if not utils.file_exists(self.file_pajek): self.to_pajek()
+            return self.cached_file(self.file_hig, self.to_higformat)
         
-        cmd = "python {} {}".format(config.HIG_CONVERT_PROG, self.file_pajek)
-        self.logger.info("running " + cmd)
-        status = utils.shell_run_and_wait(cmd)
-        if (status != 0):
-            raise Exception("run command failed: " + str(status))
+        with TempDir() as tmp_dir:
+            # the converter writes pajek.hig next to pajek.txt
+            pajek = utils.link_file(self.to_pajek(), dest_dir=tmp_dir, destname='pajek.txt')
+            cmd = "python {} {}".format(config.HIG_CONVERT_PROG, pajek)
+            self.logger.info("running " + cmd)
+            status = process.run(cmd, cwd=tmp_dir)
+            if (status != 0):
+                raise Exception("run command failed: " + str(status))
+            shutil.move(os.path.join(tmp_dir, 'pajek.hig'), filepath)
         return filepath 
 
     def to_unweighted_fromat(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_unweighted_edges
-            if utils.file_exists(filepath):
-                return filepath         
+            return self.cached_file(self.file_unweighted_edges, self.to_unweighted_fromat)
         edges = self.get_edges()[['src', 'dest']]
         edges.to_csv(filepath, header=None, index=None, sep=" ")
         return filepath 
@@ -576,43 +660,34 @@ class Dataset(object):
             if utils.file_exists(filepath):
                 return filepath         
         if not utils.file_exists(self.file_mirror_edges): self.to_mirror_edges_format()
-        with TempDir() as tmp_dir:
-            cmd = "cat {} | {} >  {} || rm {}".format(self.file_mirror_edges, config.get_cdc_prog('mkidx'),
-                                                  filepath, filepath)
-            self.logger.info("Running " + cmd)
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f :
-                f.write(cmd)
-            
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash -x tmpcmd", tmp_dir))
-            if status != 0: 
-                raise Exception("Run command with error status code {}".format(status))
+        cmd = config.get_cdc_prog('mkidx')
+        self.logger.info("Running {} < {} > {}".format(cmd, self.file_mirror_edges, filepath))
+        timecost, status = utils.timeit(lambda: process.run(cmd, stdin=self.file_mirror_edges, stdout=filepath))
+        if status != 0: 
+            utils.remove_if_file_exit(filepath, is_dir=False)
+            raise Exception("Run command with error status code {}".format(status))
         assert utils.file_exists(filepath)
         return filepath 
 
     def to_topgc_fromat(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_topgc
-            if utils.file_exists(filepath):
-                return filepath         
-        if not utils.file_exists(self.file_edges): self.to_edgelist()
+            return self.cached_file(self.file_topgc, self.to_topgc_fromat)
+        edgefile = self.to_edgelist()
         with TempDir() as tmp_dir:
-            cmd = "cat {}|sort -k1,1 -k2,2 -n | {} >  {} || rm {}".format(self.file_edges, config.get_cdc_prog('mkidx'),
-                                                  filepath, filepath)
-            self.logger.info("Running " + cmd)
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f :
-                f.write(cmd)
-            
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash -x tmpcmd", tmp_dir))
-            if status != 0: 
-                raise Exception("Run command with error status code {}".format(status))
+            cmds = [(["sort", "-k1,1", "-k2,2", "-n", edgefile], None, "sorted.txt"),
+                    ([config.get_cdc_prog('mkidx')], "sorted.txt", filepath)]
+            for cmd, stdin, stdout in cmds:
+                self.logger.info("Running " + " ".join(cmd))
+                timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir, stdin=stdin, stdout=stdout))
+                if status != 0: 
+                    utils.remove_if_file_exit(filepath, is_dir=False)
+                    raise Exception("Run command with error status code {}".format(status))
         assert utils.file_exists(filepath)
         return filepath 
 
     def to_mirror_edges_format(self, filepath=None):
         if (filepath == None):
-            filepath = self.file_mirror_edges
-            if utils.file_exists(filepath):
-                return filepath         
+            return self.cached_file(self.file_mirror_edges, self.to_mirror_edges_format)
         edges1 = self.get_edges()
         edges2 = edges1.copy()
         edges2['src'] = edges1['dest']
@@ -638,6 +713,111 @@ class Dataset(object):
         from gct.dataset import convert 
         return convert.to_graph_tool(self)
         
+    def to_csr(self, mmap_mode='r'):
+        '''
+        adjacency matrix in CSR form. For an undirected graph the reverse edges are included.
+        
+        The arrays (indptr, indices, weights) are saved as .npy files under the dataset directory the first time 
+        and memory-mapped afterwards, so processes loading the same dataset share one copy in the page cache.
+        
+        :param mmap_mode: passed to np.load, None reads the arrays into memory
+        :rtype: scipy csr_matrix
+        '''
+        from gct.dataset import csr
+
+        def build():
+            edges = self.get_edges()
+            weight = edges['weight'].values if self.is_weighted() else None
+            symmetric = not self.is_directed() and not self.is_edge_mirrored
+            return csr.build_csr(edges['src'].values, edges['dest'].values, weight, symmetric=symmetric)
+
+        if self.is_anonymous():
+            return csr.to_scipy(*build())
+        path = self.cached_file(self.file_csr, lambda u: csr.save_csr(u, *build()))
+        return csr.to_scipy(*csr.load_csr(path, mmap_mode=mmap_mode))
+
+    def cached_file(self, filepath, build, version=1):
+        '''
+        a file converted from the edges, e.g. self.file_pajek. It is rebuilt when it is missing, was half written, 
+        or edges.parq changed since it was built. See :mod:`gct.dataset.cache`.
+        
+        :param filepath: default path of the converted file under the dataset directory
+        :param build: function writing the converted file to the path it is given
+        :param version: converter version, change it when the converter output changes
+        :rtype: filepath
+        '''
+        from gct.dataset import cache
+        home = config.get_data_file_path(self.name)
+        c = cache.ConversionCache(home, self.parq_edges, config.CACHE_SIZE_LIMIT)
+        return c.get(os.path.relpath(filepath, home), build, version=version)
+
+    def get_node_map(self):
+        '''
+        sorted unique node ids. Dense node id i stands for node_map[i].
+        
+        It is saved as node_map.npy under the dataset directory through the conversion cache, so it is rebuilt
+        when edges.parq changes.
+        
+        :rtype: 1d numpy array
+        '''
+
+        def f():
+            from gct.dataset import nodemap
+
+            def build():
+                edges = self.get_edges()
+                return nodemap.build_node_map(edges['src'].values, edges['dest'].values)
+
+            if self.is_anonymous():
+                return build()
+            return np.load(self.cached_file(self.file_node_map, lambda u: nodemap.save_array(u, build())))
+
+        return utils.set_if_not_exists(self, "_node_map", f)
+
+    def has_dense_ids(self):
+        '''
+        True if node ids are already 0..n-1 without gaps
+        '''
+        from gct.dataset import nodemap
+        return nodemap.is_dense(self.get_node_map())
+
+    def get_dense_edges(self):
+        '''
+        edges with node ids replaced by dense ids. Rows are in the same order as :meth:`get_edges`.
+        
+        The remapped (src, dest) array is saved as dense_edges.npy under the dataset directory through the
+        conversion cache.
+        
+        :rtype: Pandas dataframe
+        '''
+
+        def f():
+            from gct.dataset import nodemap
+            edges = self.get_edges()
+
+            def build():
+                node_map = self.get_node_map()
+                return np.stack([nodemap.to_dense(node_map, edges['src'].values),
+                                 nodemap.to_dense(node_map, edges['dest'].values)], axis=1)
+
+            if self.is_anonymous():
+                arr = build()
+            else:
+                arr = np.load(self.cached_file(self.file_dense_edges, lambda u: nodemap.save_array(u, build())))
+            df = pd.DataFrame({'src': arr[:, 0], 'dest': arr[:, 1]})
+            if self.is_weighted():
+                df['weight'] = edges['weight'].values
+            return df
+
+        return utils.set_if_not_exists(self, "_dense_edges", f)
+
+    def from_dense_ids(self, dense_ids):
+        '''
+        translate dense node ids back to the original node ids.
+        '''
+        from gct.dataset import nodemap
+        return nodemap.from_dense(self.get_node_map(), dense_ids)
+
     def to_coo_adjacency_matrix(self):
         from gct.dataset import convert 
         return convert.to_coo_adjacency_matrix(self)            
@@ -694,9 +874,10 @@ def remove_local(name, rm_graph_data=True, rm_clustering_result=True):
         utils.remove_if_file_exit(path, is_dir=True)
 
 
-def create_dataset(name, edgesObj, groundtruthObj=None, directed=False, weighted=False, description="", overide=False):
+def create_dataset(name, edgesObj, groundtruthObj=None, directed=False, weighted=False, description="", overide=False,
+                   out_of_core=False):
     return Dataset(name=name, edgesObj=edgesObj, groundtruthObj=groundtruthObj, directed=directed, weighted=weighted, \
-                    description=description, overide=overide)                
+                    description=description, overide=overide, out_of_core=out_of_core)                
 
     
 def load_local(name):
@@ -705,11 +886,7 @@ def load_local(name):
     
     :param name: name of a dataset 
     '''
-    path = config.get_data_file_path(name, create=False)
-    if not utils.file_exists(path):
-        raise Exception("path not exists: " + path)
-    with open(os.path.join(path, 'meta.info')) as f:
-        meta = json.load(f)
+    meta = load_local_meta(name)
     edges = meta['parq_edges']
     gt = None 
     if meta["has_ground_truth"]:
@@ -717,7 +894,47 @@ def load_local(name):
     additional_meta = None if not "additional" in meta else meta['additional'] 
     is_edge_mirrored = meta['is_edge_mirrored']
     return Dataset(name=meta['name'], description=meta['description'], groundtruthObj=gt, edgesObj=edges, directed=meta['directed'],
-                    weighted=meta['weighted'], overide=False, additional_meta=additional_meta, is_edge_mirrored=is_edge_mirrored)
+                    weighted=meta['weighted'], overide=False, additional_meta=additional_meta, is_edge_mirrored=is_edge_mirrored,
+                    stats=meta.get('stats'))
+
+
+def load_local_meta(name):
+    '''
+    meta data of a local dataset, read from meta.info only.
+    
+    :param name: name of a dataset 
+    :rtype: dict
+    '''
+    path = config.get_data_file_path(name, create=False)
+    if not utils.file_exists(path):
+        raise Exception("path not exists: " + path)
+    with open(os.path.join(path, 'meta.info')) as f:
+        return json.load(f)
+
+
+def local_summary(pattern=None):
+    '''
+    one row per local dataset with its size, node id range and degree summary. Only meta.info files are read,
+    so columns are NaN for datasets saved before the summary was kept in meta.info (loading one fills it in).
+    
+    :param pattern: Unix shell-style wildcards on the dataset name
+    :rtype: Pandas dataframe
+    '''
+    rows = []
+    for name in list_local():
+        if pattern is not None and not fnmatch(name, pattern):
+            continue
+        try:
+            meta = load_local_meta(name)
+        except (IOError, OSError, ValueError):
+            continue
+        stats = meta.get('stats', {})
+        degree = stats.get('degree', {})
+        rows.append([name, meta['directed'], meta['weighted'], meta['has_ground_truth'], stats.get('num_node'), stats.get('num_edge'),
+                     stats.get('min_node'), stats.get('max_node'), degree.get('min'), degree.get('max'), degree.get('mean'), degree.get('median')])
+    columns = ['name', 'directed', 'weighted', 'has_ground_truth', 'num_node', 'num_edge', 'min_node', 'max_node',
+               'min_degree', 'max_degree', 'mean_degree', 'median_degree']
+    return pd.DataFrame(rows, columns=columns).sort_values('name').reset_index(drop=True)
 
     
 def list_clustering(dataset_name):
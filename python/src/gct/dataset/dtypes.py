@@ -0,0 +1,98 @@
+'''
+Compact dtypes for edge lists and clusterings.
+
+Node and cluster ids are kept in the narrowest of int32, uint32 and int64 which holds all of them, and
+edge weights in float32. This halves the memory of edges and clusterings for graphs with less than 2^31
+(or 2^32) node ids. Code which needs wider ids, e.g. to pack two ids into one 64-bit key, must call
+:func:`widen` (or cast to int64 itself, as :mod:`gct.dataset.csr` and :mod:`gct.dataset.ingest` do).
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import numpy as np
+import pandas as pd
+
+INT32 = np.iinfo(np.int32)
+UINT32 = np.iinfo(np.uint32)
+WEIGHT_DTYPE = np.float32
+
+
+def id_dtype(*arrays):
+    '''
+    the narrowest integer dtype which holds all values of the arrays. Signed int32 is preferred over
+    uint32, so subtracting ids does not wrap around.
+
+    :param arrays: 1d integer arrays
+    :rtype: numpy dtype
+    '''
+    arrays = [np.asarray(u) for u in arrays if len(u)]
+    if not arrays:
+        return np.dtype(np.int32)
+    lo = min(u.min() for u in arrays)
+    hi = max(u.max() for u in arrays)
+    if lo >= INT32.min and hi <= INT32.max:
+        return np.dtype(np.int32)
+    elif lo >= 0 and hi <= UINT32.max:
+        return np.dtype(np.uint32)
+    else:
+        return np.dtype(np.int64)
+
+
+def narrow(*arrays):
+    '''
+    cast integer arrays to one common compact dtype. Arrays which already have it are not copied.
+
+    :rtype: list of arrays
+    '''
+    arrays = [np.asarray(u) for u in arrays]
+    for u in arrays:
+        if not np.issubdtype(u.dtype, np.integer):
+            raise ValueError("ids must be integers, got " + str(u.dtype))
+    dtype = id_dtype(*arrays)
+    return [u.astype(dtype, copy=False) for u in arrays]
+
+
+def widen(arr):
+    '''
+    cast an integer array to int64 (a float array to float64) for code which needs the full width.
+    '''
+    arr = np.asarray(arr)
+    if np.issubdtype(arr.dtype, np.integer):
+        return arr.astype(np.int64, copy=False)
+    elif np.issubdtype(arr.dtype, np.floating):
+        return arr.astype(np.float64, copy=False)
+    return arr
+
+
+def compact_edges(df):
+    '''
+    edges with src and dest in one compact id dtype and weight (if any) in float32.
+
+    :param df: Pandas dataframe with columns src, dest[, weight] and integer ids
+    :rtype: Pandas dataframe. df itself when it is already compact.
+    '''
+    src, dest = narrow(df['src'].values, df['dest'].values)
+    types = {'src': src.dtype, 'dest': dest.dtype}
+    if 'weight' in df.columns:
+        types['weight'] = np.dtype(WEIGHT_DTYPE)
+    if all(df[k].dtype == v for k, v in types.items()):
+        return df
+    return df.astype(types)
+
+
+def compact_clustering(df):
+    '''
+    a clustering with node and cluster ids each in their own compact dtype.
+
+    :param df: Pandas dataframe with columns node, cluster and integer ids
+    :rtype: Pandas dataframe. df itself when it is already compact.
+    '''
+    types = {}
+    for k in ['node', 'cluster']:
+        if not pd.api.types.is_integer_dtype(df[k].dtype):
+            return df  # leave e.g. string labels alone
+        types[k] = id_dtype(df[k].values)
+    if all(df[k].dtype == v for k, v in types.items()):
+        return df
+    return df.astype(types)
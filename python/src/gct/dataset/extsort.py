@@ -0,0 +1,122 @@
+'''
+External-memory sort and deduplication of edge keys (see :func:`gct.dataset.ingest.edge_keys`).
+
+Keys are collected into runs of bounded size, each run is sorted, deduplicated and saved as a .npy file,
+and the runs are merged block by block. Memory is bounded by the run size plus one block per run.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import numpy as np
+from gct.dataset.ingest import unpack_keys
+
+# number of keys sorted in memory per run
+DEFAULT_RUN_SIZE = 1 << 25
+
+# number of keys read from each run at a time while merging
+DEFAULT_BLOCK_SIZE = 1 << 20
+
+
+def sorted_unique(keys):
+    '''
+    np.unique by sorting, which also works on structured keys and avoids the hash based path of newer numpy.
+    '''
+    keys = np.sort(keys)
+    if len(keys) > 1:
+        mask = np.empty(len(keys), dtype=bool)
+        mask[0] = True
+        mask[1:] = keys[1:] != keys[:-1]
+        keys = keys[mask]
+    return keys
+
+
+def unify(arrays):
+    '''
+    bring packed and structured key arrays to one dtype
+    '''
+    if all(u.dtype.names is None for u in arrays) or all(u.dtype.names is not None for u in arrays):
+        return arrays
+    return [unpack_keys(u) if u.dtype.names is None else u for u in arrays]
+
+
+def write_runs(key_chunks, run_dir, run_size=DEFAULT_RUN_SIZE):
+    '''
+    write sorted runs of unique keys.
+
+    :param key_chunks: iterable of key arrays
+    :param run_dir: directory for the run files
+    :rtype: list of run file paths
+    '''
+    paths = []
+    buf, buf_size = [], 0
+
+    def flush():
+        if buf_size == 0: return
+        run = sorted_unique(np.concatenate(unify(buf)))
+        path = os.path.join(run_dir, "run_{}.npy".format(len(paths)))
+        np.save(path, run)
+        paths.append(path)
+        del buf[:]
+
+    for keys in key_chunks:
+        start = 0
+        while start < len(keys):
+            n = min(len(keys) - start, run_size - buf_size)
+            buf.append(np.asarray(keys[start:start + n]))
+            buf_size += n
+            start += n
+            if buf_size >= run_size:
+                flush()
+                buf_size = 0
+    flush()
+    return paths
+
+
+def merge_runs(paths, block_size=DEFAULT_BLOCK_SIZE):
+    '''
+    k-way merge of sorted runs of unique keys.
+
+    In each step a block is read from every run. Keys up to the smallest last key among blocks which do not
+    reach the end of their run are complete in the buffers, so they are merged and emitted together.
+
+    :rtype: iterator of sorted arrays of unique keys, in ascending order across arrays
+    '''
+    runs = [np.load(u, mmap_mode='r') for u in paths]
+    structured = any(u.dtype.names is not None for u in runs)
+    pos = [0] * len(runs)
+    while True:
+        active = [i for i, run in enumerate(runs) if pos[i] < len(run)]
+        if not active:
+            break
+        blocks = {}
+        for i in active:
+            block = np.asarray(runs[i][pos[i]:pos[i] + block_size])
+            blocks[i] = unpack_keys(block) if structured and block.dtype.names is None else block
+        partial = [blocks[i][-1:] for i in active if pos[i] + len(blocks[i]) < len(runs[i])]
+        bound = np.sort(np.concatenate(partial))[:1] if partial else None
+        parts = []
+        for i in active:
+            block = blocks[i]
+            n = len(block) if bound is None else int(np.searchsorted(block, bound, side='right')[0])
+            parts.append(block[:n])
+            pos[i] += n
+        yield sorted_unique(np.concatenate(parts))
+
+
+def sort_unique(key_chunks, run_dir, run_size=None, block_size=None):
+    '''
+    sorted unique keys of all chunks, using run_dir for temporary files.
+
+    :param run_size: keys per run, default DEFAULT_RUN_SIZE
+    :param block_size: keys read per run in a merge step, default DEFAULT_BLOCK_SIZE
+    :rtype: iterator of key arrays
+    '''
+    if run_size is None: run_size = DEFAULT_RUN_SIZE
+    if block_size is None: block_size = DEFAULT_BLOCK_SIZE
+    paths = write_runs(key_chunks, run_dir, run_size=run_size)
+    for keys in merge_runs(paths, block_size=block_size):
+        yield keys
+    for u in paths:
+        os.remove(u)
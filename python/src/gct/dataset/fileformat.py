@@ -0,0 +1,179 @@
+'''
+Bulk writers for the text graph formats consumed by the external programs.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import numpy as np
+
+# number of rows formatted and written at once
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def format_column(arr, fmt=None):
+    '''
+    format a whole column to strings. integers are written as they are, floats use '%g'.
+
+    :param arr: 1d numpy array
+    :param fmt: printf-style format overriding the default one
+    :rtype: list of str
+    '''
+    arr = np.asarray(arr)
+    if fmt is not None:
+        return [fmt % u for u in arr.tolist()]
+    elif np.issubdtype(arr.dtype, np.integer):
+        return arr.astype(str).tolist()
+    else:
+        return ['%g' % u for u in arr.astype(np.float64).tolist()]
+
+
+def edge_order(src, dest):
+    '''
+    the permutation that sorts edges by (src, dest).
+
+    node ids are packed into one 64-bit key when they fit, otherwise a lexsort is used.
+    '''
+    src = np.asarray(src)
+    dest = np.asarray(dest)
+    if len(src) == 0:
+        return np.arange(0, dtype=np.int64)
+    lo = min(src.min(), dest.min())
+    hi = max(src.max(), dest.max())
+    if lo >= 0 and hi < (1 << 31):
+        key = (src.astype(np.int64) << 32) | dest.astype(np.int64)
+        return np.argsort(key, kind='stable')
+    else:
+        return np.lexsort((dest, src))
+
+
+def write_rows(f, columns, sep=" ", chunk_size=DEFAULT_CHUNK_SIZE, prefix="", formats=None):
+    '''
+    write columns as text rows to an opened file, chunk by chunk.
+
+    :param f: file object opened in text mode
+    :param columns: list of 1d arrays with the same length
+    :param sep: column separator
+    :param chunk_size: number of rows per chunk
+    :param prefix: string written at the beginning of every row
+    :param formats: optional list of printf-style formats, one per column (None for the default)
+    '''
+    n = len(columns[0]) if columns else 0
+    if formats is None:
+        formats = [None] * len(columns)
+    for start in range(0, n, chunk_size):
+        end = min(n, start + chunk_size)
+        cols = [format_column(u[start:end], fmt) for u, fmt in zip(columns, formats)]
+        lines = map(sep.join, zip(*cols))
+        f.write(prefix + ("\n" + prefix).join(lines) + "\n")
+
+
+def write_edgelist(filepath, src, dest, weight=None, sep=" ", sort=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    write an edge list file with one "src dest [weight]" line per edge.
+
+    :param filepath: where to write
+    :param src: source nodes
+    :param dest: target nodes
+    :param weight: optional edge weights
+    :param sep: column separator
+    :param sort: sort edges by (src, dest) before writing
+    :param chunk_size: number of edges formatted at once
+    :rtype: filepath
+    '''
+    columns = [np.asarray(src), np.asarray(dest)]
+    if weight is not None:
+        columns.append(np.asarray(weight))
+    if sort:
+        order = edge_order(columns[0], columns[1])
+        columns = [u[order] for u in columns]
+    with open(filepath, 'wt') as f:
+        write_rows(f, columns, sep=sep, chunk_size=chunk_size)
+    return filepath
+
+
+def write_pajek(filepath, src, dest, weight=None, directed=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    write a graph in pajek format. Nodes are relabeled to 1..n in the order of their ids 
+    and the original id is kept as the vertex label.
+
+    :param filepath: where to write
+    :param src: source nodes
+    :param dest: target nodes
+    :param weight: optional edge weights
+    :param directed: write "*Arcs" instead of "*Edges"
+    :param chunk_size: number of lines formatted at once
+    :rtype: filepath
+    '''
+    src = np.asarray(src)
+    nodes, inverse = np.unique(np.concatenate([src, np.asarray(dest)]), return_inverse=True)
+    inverse = inverse.reshape(-1) + 1  # pajek index starts from 1
+    columns = [inverse[:len(src)], inverse[len(src):]]
+    formats = [None, None]
+    if weight is not None:
+        columns.append(np.asarray(weight))
+        formats.append('%0.6f')
+
+    with open(filepath, 'wt') as f:
+        f.write("*Vertices\t%d\n" % len(nodes))
+        n = len(nodes)
+        for start in range(0, n, chunk_size):
+            end = min(n, start + chunk_size)
+            idx = format_column(np.arange(start + 1, end + 1))
+            labels = format_column(nodes[start:end])
+            f.write("".join(['\t%s "%s"\n' % u for u in zip(idx, labels)]))
+        f.write("*Arcs\n" if directed else "*Edges\n")
+        write_rows(f, columns, sep="\t", chunk_size=chunk_size, prefix="\t", formats=formats)
+    return filepath
+
+
+def write_adjacency_lists(f, indptr, indices, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    write one "degree neighbor1 neighbor2 ..." line per row of a CSR matrix.
+
+    :param f: file object opened in text mode
+    :param indptr: CSR row offsets
+    :param indices: CSR column indices
+    :param chunk_size: approximate number of neighbors formatted at once
+    '''
+    indptr = np.asarray(indptr)
+    n = len(indptr) - 1
+    start = 0
+    while start < n:
+        # at least one row, otherwise as many rows as fit into chunk_size neighbors
+        end = int(np.searchsorted(indptr, indptr[start] + chunk_size, side='right')) - 1
+        end = min(n, max(start + 1, end))
+        offsets = indptr[start:end + 1] - indptr[start]
+        degrees = np.diff(offsets)
+        tokens = np.insert(np.asarray(indices[indptr[start]:indptr[end]]).astype(str), offsets[:-1], degrees.astype(str))
+        seps = np.full(len(tokens), " ", dtype='<U1')
+        seps[np.cumsum(degrees + 1) - 1] = "\n"
+        out = [None] * (2 * len(tokens))
+        out[0::2] = tokens.tolist()
+        out[1::2] = seps.tolist()
+        f.write("".join(out))
+        start = end
+
+
+def write_anyscan(filepath, src, dest, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    write the adjacency list format of anyscan. The first line is the number of nodes (max node id + 1),
+    followed by one line per node listing its sorted neighbors, including itself, in both edge directions.
+
+    :param filepath: where to write
+    :param src: source nodes
+    :param dest: target nodes
+    :param chunk_size: approximate number of neighbors formatted at once
+    :rtype: filepath
+    '''
+    from gct.dataset import csr
+    src = np.asarray(src)
+    dest = np.asarray(dest)
+    num_node = int(max(src.max(), dest.max())) + 1
+    self_loops = np.arange(num_node)
+    indptr, indices, _ = csr.build_csr(np.concatenate([src, self_loops]), np.concatenate([dest, self_loops]),
+                                       num_node=num_node, symmetric=True)
+    with open(filepath, 'wt') as f:
+        f.write(str(num_node) + "\n")
+        write_adjacency_lists(f, indptr, indices, chunk_size=chunk_size)
+    return filepath
@@ -0,0 +1,337 @@
+'''
+Streaming ingestion of large edge lists into a local dataset.
+
+Edges are read in chunks by the C parser of pandas, canonicalized and deduplicated chunk by chunk, and
+appended to edges.parq as Parquet row groups, so the whole edge list is never held as Python objects.
+By default duplicates across chunks are removed with sorted runs on disk (see :mod:`gct.dataset.extsort`),
+which bounds the memory whatever the number of edges. With out_of_core=False the edges keep the order of the
+input and duplicates are detected in memory with :class:`Deduplicator` (8 bytes per distinct edge).
+
+Sorted key arrays that grow chunk by chunk are kept as levels of geometrically increasing sizes, two levels
+being merged when they reach about the same size, so every key is merged O(log n) times instead of the whole
+array being copied for every chunk.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import numpy as np
+import pandas as pd
+import fastparquet
+from gct import utils, config
+from gct.dataset import dtypes
+
+# number of lines parsed at once
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+logger = utils.get_logger("ingest")
+
+
+def read_edge_chunks(filepath, sep="\t", chunk_size=DEFAULT_CHUNK_SIZE, header=None, weighted=None, comment='#'):
+    '''
+    read an edge list file (optionally compressed) in chunks.
+
+    :param filepath: path of the file
+    :param sep: column separator
+    :param header: None if the file has no header line, otherwise 0 and the columns are src, dest[, weight]
+    :param weighted: read a third column as weight. When None it is decided by the header.
+    :param comment: lines starting with it are skipped
+    :rtype: iterator of dataframes with columns src, dest[, weight]
+    '''
+    if header is None:
+        names = ['src', 'dest', 'weight'] if weighted else ['src', 'dest']
+        reader = pd.read_csv(filepath, sep=sep, header=None, names=names, usecols=range(len(names)), comment=comment,
+                             engine='c', chunksize=chunk_size)
+    else:
+        reader = pd.read_csv(filepath, sep=sep, header=header, comment=comment, engine='c', chunksize=chunk_size)
+    for df in reader:
+        if weighted is False and 'weight' in df.columns:
+            df = df[['src', 'dest']]
+        yield df
+
+
+def read_community_chunks(filepath, chunk_size=DEFAULT_CHUNK_SIZE, sep="\t", comment='#'):
+    '''
+    read a community file with one community per line (SNAP .cmty format) in chunks.
+    Communities are numbered from 1 in the order of lines.
+
+    :rtype: iterator of dataframes with columns node, cluster
+    '''
+    reader = pd.read_csv(filepath, sep='\x01', header=None, names=['line'], comment=comment, engine='c',
+                         chunksize=chunk_size, dtype=str, skip_blank_lines=True)
+    first = 1
+    for df in reader:
+        members = df['line'].str.strip().str.split(sep)
+        members.index = np.arange(first, first + len(df))
+        first += len(df)
+        members = members.explode()
+        yield pd.DataFrame({'node': members.values.astype(np.int64), 'cluster': members.index.values})
+
+
+def canonicalize(df, directed=False, weighted=False, is_edge_mirrored=False):
+    '''
+    the cleaning of :meth:`gct.Dataset.set_edges` for one chunk: cast types and, for an undirected graph
+    without mirrored edges, put the smaller node id in src.
+    '''
+    src = df['src'].values.astype(np.int64)
+    dest = df['dest'].values.astype(np.int64)
+    if not is_edge_mirrored and not directed:
+        src, dest = np.minimum(src, dest), np.maximum(src, dest)
+    ret = pd.DataFrame({'src': src, 'dest': dest})
+    if weighted:
+        ret['weight'] = df['weight'].values.astype(np.float32)
+    return ret
+
+
+def edge_keys(df, packed=True):
+    '''
+    one sortable key per edge row. (src, dest) is packed into one 64-bit integer when the ids fit and packed is True,
+    otherwise a structured array is returned.
+    '''
+    src, dest = dtypes.widen(df['src'].values), dtypes.widen(df['dest'].values)
+    if packed and 'weight' not in df.columns and (len(src) == 0 or (min(src.min(), dest.min()) >= 0 and max(src.max(), dest.max()) < (1 << 31))):
+        return (src << 32) | dest
+    fields = [('src', np.int64), ('dest', np.int64)]
+    if 'weight' in df.columns:
+        fields.append(('weight', np.uint32))
+    keys = np.empty(len(src), dtype=fields)
+    keys['src'] = src
+    keys['dest'] = dest
+    if 'weight' in df.columns:
+        keys['weight'] = df['weight'].values.astype(np.float32).view(np.uint32)
+    return keys
+
+
+def unpack_keys(packed):
+    '''
+    turn packed 64-bit keys of :func:`edge_keys` into the structured form
+    '''
+    keys = np.empty(len(packed), dtype=[('src', np.int64), ('dest', np.int64)])
+    keys['src'] = packed >> 32
+    keys['dest'] = packed & 0xFFFFFFFF
+    return keys
+
+
+def keys_to_frame(keys):
+    '''
+    the inverse of :func:`edge_keys`
+    '''
+    if keys.dtype.names is None:
+        return pd.DataFrame({'src': keys >> 32, 'dest': keys & 0xFFFFFFFF})
+    df = pd.DataFrame({'src': keys['src'], 'dest': keys['dest']})
+    if 'weight' in keys.dtype.names:
+        df['weight'] = keys['weight'].view(np.float32)
+    return df
+
+
+class SortedLevels(object):
+    '''
+    sorted arrays of increasing keys in levels of geometrically decreasing sizes. Keys are unique within a level.
+
+    :param combine: function merging two sorted levels (keys, values) into one, values may be None
+    '''
+
+    def __init__(self, combine):
+        self.combine = combine
+        self.levels = []
+
+    def add(self, keys, values=None):
+        if len(keys) == 0: return
+        self.levels.append((keys, values))
+        while len(self.levels) > 1 and len(self.levels[-2][0]) <= 2 * len(self.levels[-1][0]):
+            b, a = self.levels.pop(), self.levels.pop()
+            self.levels.append(self.combine(a, b))
+
+    def merged(self):
+        '''
+        all the levels merged into one, (keys, values)
+        '''
+        while len(self.levels) > 1:
+            b, a = self.levels.pop(), self.levels.pop()
+            self.levels.append(self.combine(a, b))
+        return self.levels[0] if self.levels else (None, None)
+
+
+def contains(sorted_keys, keys):
+    pos = np.minimum(np.searchsorted(sorted_keys, keys), len(sorted_keys) - 1)
+    return sorted_keys[pos] == keys
+
+
+class Deduplicator(object):
+    '''
+    keeps the sorted keys of the rows seen so far and drops repeated rows from the following chunks.
+    '''
+
+    def __init__(self):
+        # the levels are disjoint, so merging them is a sort
+        self.levels = SortedLevels(lambda a, b: (np.sort(np.concatenate([a[0], b[0]]), kind='mergesort'), None))
+        self.packed = True
+
+    def new_rows(self, df):
+        '''
+        :rtype: positions (ascending) of the rows in df which were not seen before, first occurrence only
+        '''
+        keys = edge_keys(df, packed=self.packed)
+        if self.packed and keys.dtype.names is not None:
+            # ids outgrew the packed key
+            self.packed = False
+            self.levels.levels = [(unpack_keys(u), v) if u.dtype.names is None else (u, v) for u, v in self.levels.levels]
+        uniq, first = np.unique(keys, return_index=True)
+        new = np.ones(len(uniq), dtype=bool)
+        for level, _ in self.levels.levels:
+            new &= ~contains(level, uniq)
+        self.levels.add(uniq[new])
+        return np.sort(first[new])
+
+
+def add_counts(a, b):
+    '''
+    merge two sorted levels of (ids, counts), summing the counts of the same id
+    '''
+    ids = np.concatenate([a[0], b[0]])
+    counts = np.concatenate([a[1], b[1]])
+    order = np.argsort(ids, kind='mergesort')
+    ids, counts = ids[order], counts[order]
+    if len(ids) > 1:
+        start = np.flatnonzero(np.concatenate([[True], ids[1:] != ids[:-1]]))
+        ids, counts = ids[start], np.add.reduceat(counts, start)
+    return ids, counts
+
+
+class StatsAccumulator(object):
+    '''
+    computes :func:`gct.dataset.dataset.edge_stats` over chunks. It keeps one count per distinct node.
+    '''
+
+    def __init__(self, is_edge_mirrored=False):
+        self.is_edge_mirrored = is_edge_mirrored
+        self.levels = SortedLevels(add_counts)
+        self.num_edge = 0
+
+    def add(self, df):
+        src, dest = df['src'].values, df['dest'].values
+        self.num_edge += len(src)
+        ids = np.concatenate([src, dest]).astype(np.int64)
+        # when edges are mirrored only src is counted, dest ids are added with a zero count
+        weights = np.concatenate([np.ones(len(src), dtype=np.int64),
+                                  np.full(len(dest), 0 if self.is_edge_mirrored else 1, dtype=np.int64)])
+        self.levels.add(*add_counts((ids[:0], weights[:0]), (ids, weights)))
+
+    def value(self):
+        from gct.dataset.dataset import degree_stats
+        ids, counts = self.levels.merged()
+        if ids is None:
+            ids, counts = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return degree_stats(ids, counts, self.num_edge)
+
+
+class ParquetAppender(object):
+    '''
+    writes dataframes as row groups of one Parquet file
+    '''
+
+    def __init__(self, filepath, columns):
+        self.filepath = filepath
+        self.columns = columns
+        self.has_data = False
+
+    def append(self, df):
+        if len(df) == 0: return
+        fastparquet.writer.write(self.filepath, df[self.columns], compression="SNAPPY", write_index=False, append=self.has_data)
+        self.has_data = True
+
+    def close(self, empty):
+        if not self.has_data:
+            fastparquet.writer.write(self.filepath, empty[self.columns], compression="SNAPPY", write_index=False)
+        return self.filepath
+
+
+def write_edges(filepath, chunks, directed=False, weighted=False, is_edge_mirrored=False, out_of_core=True, tmp_dir=None):
+    '''
+    canonicalize, deduplicate and write edge chunks to a Parquet file.
+
+    :param out_of_core: deduplicate with sorted runs on disk (see :mod:`gct.dataset.extsort`), edges are then written
+                        in (src, dest) order. Otherwise the keys of all edges are kept in memory and the input order
+                        is kept.
+    :param tmp_dir: where the sorted runs are written, default the directory of filepath
+    :rtype: stats of the edges, see :func:`gct.dataset.dataset.edge_stats`
+    '''
+    columns = ['src', 'dest', 'weight'] if weighted else ['src', 'dest']
+    writer = ParquetAppender(filepath, columns)
+    stats = StatsAccumulator(is_edge_mirrored)
+    cleaned = (canonicalize(df, directed=directed, weighted=weighted, is_edge_mirrored=is_edge_mirrored) for df in chunks)
+    if out_of_core:
+        from gct.dataset import extsort
+        if tmp_dir is None: tmp_dir = os.path.dirname(os.path.abspath(filepath))
+        with utils.TempDir(dir=tmp_dir) as run_dir:
+            for keys in extsort.sort_unique(map(edge_keys, cleaned), run_dir):
+                df = keys_to_frame(keys)
+                stats.add(df)
+                writer.append(df)
+                logger.info("{} edges written".format(stats.num_edge))
+    else:
+        dedup = Deduplicator()
+        for df in cleaned:
+            df = df.iloc[dedup.new_rows(df)].reset_index(drop=True)
+            stats.add(df)
+            writer.append(df)
+            logger.info("{} edges written".format(stats.num_edge))
+    writer.close(pd.DataFrame({'src': np.zeros(0, np.int64), 'dest': np.zeros(0, np.int64), 'weight': np.zeros(0, np.float32)}))
+    return stats.value()
+
+
+def write_clustering(filepath, chunks):
+    '''
+    write (node, cluster) chunks to a Parquet file.
+
+    Duplicated pairs are removed within a chunk only. Those spanning chunks are dropped when the clustering
+    is loaded, see :meth:`gct.dataset.membership.Membership.from_codes`.
+    '''
+    writer = ParquetAppender(filepath, ['node', 'cluster'])
+    for df in chunks:
+        writer.append(df[['node', 'cluster']].drop_duplicates().reset_index(drop=True))
+    return writer.close(pd.DataFrame({'node': np.zeros(0, np.int64), 'cluster': np.zeros(0, np.int64)}))
+
+
+def create_dataset(name, edge_chunks, groundtruth_chunks=None, directed=False, weighted=False, description="",
+                   overide=False, additional_meta=None, is_edge_mirrored=False, out_of_core=True):
+    '''
+    create a local dataset from chunks of edges (and ground truth) without loading them all.
+
+    :param name: name of the dataset
+    :param edge_chunks: iterable of dataframes with columns src, dest[, weight]
+    :param groundtruth_chunks: None, an iterable of dataframes with columns node, cluster,
+                               or a dict of name to such iterables for multiple ground truths
+    :param out_of_core: deduplicate edges on disk with bounded memory, see :func:`write_edges`
+    :rtype: :py:class:`gct.Dataset`
+    '''
+    from gct.dataset.dataset import Dataset, Clustering
+    home = config.get_data_file_path(name, create=False)
+    if utils.file_exists(home):
+        if overide:
+            utils.remove_if_file_exit(home, is_dir=True)
+        else:
+            raise Exception("Dataset {} exists at {}. Use overide=True or load it locally.".format(name, home))
+    utils.remove_if_file_exit(config.get_result_file_path(name), is_dir=True)
+    utils.create_dir_if_not_exists(home)
+    try:
+        parq_edges = config.get_data_file_path(name, 'edges.parq')
+        stats = write_edges(parq_edges, edge_chunks, directed=directed, weighted=weighted, is_edge_mirrored=is_edge_mirrored,
+                            out_of_core=out_of_core)
+        gt = None
+        if groundtruth_chunks is not None:
+            if not isinstance(groundtruth_chunks, dict):
+                groundtruth_chunks = {'default': groundtruth_chunks}
+            gt = {}
+            for k, v in groundtruth_chunks.items():
+                gt[k] = Clustering(write_clustering(config.get_data_file_path(name, 'gt_{}.parq'.format(k)), v))
+        data = Dataset(name, description=description, groundtruthObj=gt, edgesObj=parq_edges, directed=directed,
+                       weighted=weighted, overide=False, additional_meta=additional_meta, is_edge_mirrored=is_edge_mirrored,
+                       stats=stats)
+        data.update_meta()
+    except:
+        utils.remove_if_file_exit(home, is_dir=True)
+        raise
+    logger.info("created {} with {} nodes and {} edges".format(name, stats['num_node'], stats['num_edge']))
+    return data
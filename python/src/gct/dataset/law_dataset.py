@@ -1,9 +1,9 @@
-from gct import utils, config
+from gct import utils, config, process
 import urllib
 import gzip
 import pandas as pd 
 import json 
-from . import dataset 
+from . import dataset, ingest
 import shutil
 from gct.dataset.dataset import local_exists, load_local, Dataset
 import os
@@ -57,14 +57,18 @@ class LAWDatasetConfig(object):
     
     def md5check(self):
         cmd = 'md5sum --ignore-missing -c {}.md5sums'.format(self.name)
-        status = utils.shell_run_and_wait(cmd, config.get_download_file_path(self.name))
+        status = process.run(cmd, cwd=config.get_download_file_path(self.name))
         return status == 0
 
     @property
     def download_dir(self):
         return config.get_download_file_path(self.name)
 
-    def get_edges(self):
+    def iter_edges(self, chunk_size=ingest.DEFAULT_CHUNK_SIZE):
+        '''
+        edges in chunks of dataframes. The graph is first dumped as a text arc list, which is removed when 
+        all chunks are read.
+        '''
         if not self.has_downloaded():
             self.download()
             
@@ -76,15 +80,23 @@ class LAWDatasetConfig(object):
                     
         self.logger.info("Running " + cmd) 
         
-        timecost, status = utils.timeit(lambda: utils.shell_run_and_wait(cmd, self.download_dir))
+        timecost, status = utils.timeit(lambda: process.run(cmd, cwd=self.download_dir))
         if status != 0:
             raise Exception("Run command with error status code {}".format(status))
 
         csvfile = os.path.join(self.download_dir, self.name)
-        edges = pd.read_csv(csvfile, header=None, sep='\t')
-        edges.columns = ['src', 'dest']
-        utils.remove_if_file_exit(csvfile)
-        return edges 
+
+        def chunks():
+            try:
+                for df in ingest.read_edge_chunks(csvfile, sep='\t', chunk_size=chunk_size, weighted=False, comment=None):
+                    yield df 
+            finally:
+                utils.remove_if_file_exit(csvfile)
+
+        return chunks()
+
+    def get_edges(self):
+        return pd.concat(list(self.iter_edges()), ignore_index=True)
                          
     def get_ground_truth(self):
         return None
@@ -110,10 +122,5 @@ def load_law_dataset(name, overide=False):
     
     else:
         conf = _DATASET_[name ]
-        edges = conf.get_edges()
-        gt = conf.get_ground_truth()
-        description = conf.description
-        weighted = conf.weighted
-        directed = conf.directed
-        return Dataset(name, description=description, groundtruthObj=gt, edgesObj=edges, directed=directed, weighted=weighted, overide=overide)    
-
+        return ingest.create_dataset(name, conf.iter_edges(), groundtruth_chunks=conf.get_ground_truth(), 
+                                     directed=conf.directed, weighted=conf.weighted, description=conf.description, overide=overide)
@@ -0,0 +1,262 @@
+'''
+Array-backed cluster membership.
+
+A clustering is kept in CSR form: the sorted unique cluster ids, an offset array, and the member nodes of
+cluster i in nodes[offsets[i]:offsets[i+1]] (sorted). The inverse index from nodes to the clusters
+they belong to is built on demand, in the same form. Pandas frames are made only when asked for.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import itertools
+import collections.abc
+import numpy as np
+import pandas as pd
+from gct import utils
+from gct.dataset import dtypes
+
+
+def factorize(values):
+    '''
+    sorted unique values and the position of each value among them.
+
+    :rtype: (unique values, codes)
+    '''
+    values = np.asarray(values)
+    if len(values) and np.issubdtype(values.dtype, np.integer):
+        lo, hi = int(values.min()), int(values.max())
+        if hi - lo <= 2 * len(values):
+            # dense ids, e.g. node ids: no sort needed
+            offset = values - lo if lo else values
+            present = np.zeros(hi - lo + 1, dtype=bool)
+            present[offset] = True
+            rank = np.cumsum(present) - 1
+            return np.flatnonzero(present).astype(values.dtype) + values.dtype.type(lo), rank[offset]
+    order = np.argsort(values, kind='stable')
+    sorted_values = values[order]
+    mask = np.empty(len(values), dtype=bool)
+    if len(values):
+        mask[0] = True
+        mask[1:] = sorted_values[1:] != sorted_values[:-1]
+    codes = np.empty(len(values), dtype=np.int64)
+    codes[order] = np.cumsum(mask) - 1
+    return sorted_values[mask], codes
+
+
+def compact_ids(arr):
+    arr = np.asarray(arr)
+    if np.issubdtype(arr.dtype, np.integer):
+        return dtypes.narrow(arr)[0]
+    return arr
+
+
+class Membership(collections.abc.Mapping):
+    '''
+    It is also a read-only mapping of cluster id to the list of its nodes, like the dict of :meth:`to_dict`, so
+    it can stand in for the {cluster: [nodes]} dict of a clustering result.
+
+    :param nodes: member nodes grouped by cluster, sorted within a cluster
+    :param offsets: cluster i has the members nodes[offsets[i]:offsets[i+1]]
+    :param cluster_ids: sorted unique cluster ids
+    '''
+
+    def __init__(self, nodes, offsets, cluster_ids):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.cluster_ids = cluster_ids
+
+    @staticmethod
+    def from_codes(nodes, codes, cluster_ids):
+        '''
+        build from (node, cluster position) pairs. Duplicated pairs and empty clusters are dropped.
+        '''
+        nodes = np.asarray(nodes)
+        codes = np.asarray(codes, dtype=np.int64)
+        if len(nodes) and np.issubdtype(nodes.dtype, np.integer) and int(nodes.max()) - int(nodes.min()) < (1 << 32) \
+                and len(cluster_ids) < (1 << 31):
+            # sort (cluster, node) pairs packed into one 64-bit key
+            lo = int(nodes.min())
+            keys = np.sort((codes << 32) | (nodes.astype(np.int64) - lo))
+            nodes, codes = (keys & 0xFFFFFFFF) + lo, keys >> 32
+        else:
+            if nodes.dtype == object:
+                _, node_codes = factorize(nodes)
+                order = np.lexsort((node_codes, codes))
+            else:
+                order = np.lexsort((nodes, codes))
+            nodes, codes = nodes[order], codes[order]
+        if len(nodes) > 1:
+            mask = np.empty(len(nodes), dtype=bool)
+            mask[0] = True
+            mask[1:] = (nodes[1:] != nodes[:-1]) | (codes[1:] != codes[:-1])
+            nodes, codes = nodes[mask], codes[mask]
+        sizes = np.bincount(codes, minlength=len(cluster_ids))
+        cluster_ids = np.asarray(cluster_ids)
+        if (sizes == 0).any():
+            cluster_ids, sizes = cluster_ids[sizes > 0], sizes[sizes > 0]
+        offsets = np.zeros(len(sizes) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        return Membership(compact_ids(nodes), offsets, compact_ids(cluster_ids))
+
+    @staticmethod
+    def from_pairs(nodes, clusters):
+        '''
+        build from a node array and an array of the cluster of each node.
+        '''
+        cluster_ids, codes = factorize(clusters)
+        return Membership.from_codes(nodes, codes, cluster_ids)
+
+    @staticmethod
+    def from_frame(df):
+        '''
+        build from a dataframe with columns node and cluster.
+        '''
+        return Membership.from_pairs(df['node'].values, df['cluster'].values)
+
+    @staticmethod
+    def from_dict(d):
+        '''
+        build from a dict of cluster id to list of nodes.
+        '''
+        keys = list(d.keys())
+        if not keys:
+            return Membership(np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int32))
+        sizes = np.fromiter((len(u) for u in d.values()), dtype=np.int64, count=len(keys))
+        nodes = np.array(list(itertools.chain.from_iterable(d.values())))
+        if len(nodes) == 0:
+            nodes = np.zeros(0, dtype=np.int64)
+        cluster_ids, codes = factorize(np.array(keys))
+        return Membership.from_codes(nodes, np.repeat(codes, sizes), cluster_ids)
+
+    @property
+    def num_cluster(self):
+        return len(self.cluster_ids)
+
+    @property
+    def num_node(self):
+        '''
+        number of distinct nodes
+        '''
+        return len(self.inverse[0])
+
+    @property
+    def sizes(self):
+        '''
+        number of nodes of each cluster, aligned with cluster_ids
+        '''
+        return np.diff(self.offsets)
+
+    @property
+    def inverse(self):
+        '''
+        the clusters of each node in CSR form
+
+        :rtype: (sorted unique nodes, offsets, cluster positions). The clusters of node_ids[i] are
+                cluster_ids[positions[offsets[i]:offsets[i+1]]].
+        '''
+
+        def f():
+            codes = np.repeat(np.arange(self.num_cluster, dtype=np.int64), self.sizes)
+            order = np.argsort(self.nodes, kind='stable')
+            node_ids, node_codes = factorize(self.nodes[order])
+            offsets = np.zeros(len(node_ids) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(node_codes, minlength=len(node_ids)), out=offsets[1:])
+            return node_ids, offsets, codes[order]
+
+        return utils.set_if_not_exists(self, "_inverse", f)
+
+    @property
+    def overlaps(self):
+        '''
+        number of clusters of each node, aligned with the sorted unique nodes of :attr:`inverse`
+        '''
+        return np.diff(self.inverse[1])
+
+    @property
+    def is_overlap(self):
+        return len(self.nodes) > self.num_node
+
+    def members(self, i):
+        '''
+        nodes of the i-th cluster (in the order of cluster_ids)
+        '''
+        return self.nodes[self.offsets[i]:self.offsets[i + 1]]
+
+    def position(self, cluster_id):
+        '''
+        position of a cluster id in cluster_ids
+
+        :raises KeyError: if there is no such cluster
+        '''
+        try:
+            i = int(np.searchsorted(self.cluster_ids, cluster_id))
+            if i < self.num_cluster and self.cluster_ids[i] == cluster_id:
+                return i
+        except TypeError:
+            pass
+        raise KeyError(cluster_id)
+
+    def __getitem__(self, cluster_id):
+        return self.members(self.position(cluster_id)).tolist()
+
+    def __iter__(self):
+        return iter(self.cluster_ids.tolist())
+
+    def clusters_of(self, node):
+        '''
+        ids of the clusters a node belongs to
+        '''
+        node_ids, offsets, positions = self.inverse
+        i = int(np.searchsorted(node_ids, node))
+        if i == len(node_ids) or node_ids[i] != node:
+            return self.cluster_ids[:0]
+        return self.cluster_ids[positions[offsets[i]:offsets[i + 1]]]
+
+    def add_cluster(self, cluster_id, nodes):
+        '''
+        a new membership with one more cluster. The existing arrays are not sorted again.
+
+        :param cluster_id: id of the new cluster. If it exists, the nodes are added to it.
+        :param nodes: members of the cluster
+        '''
+        nodes = np.unique(np.asarray(nodes))
+        ids, new_id = self.cluster_ids, np.asarray([cluster_id])
+        if np.issubdtype(ids.dtype, np.integer) and np.issubdtype(new_id.dtype, np.integer):
+            ids, new_id = dtypes.widen(ids), new_id.astype(np.int64)
+        i = int(np.searchsorted(ids, new_id[0]))
+        if i < len(ids) and ids[i] == new_id[0]:
+            return Membership.from_pairs(np.concatenate([self.nodes, nodes]),
+                                         np.concatenate([ids[np.repeat(np.arange(len(ids)), self.sizes)], np.repeat(new_id, len(nodes))]))
+        if len(nodes) == 0:
+            return self
+        start = self.offsets[i]
+        offsets = np.concatenate([self.offsets[:i + 1], self.offsets[i:] + len(nodes)])
+        return Membership(compact_ids(np.concatenate([self.nodes[:start], nodes, self.nodes[start:]])), offsets,
+                          compact_ids(np.concatenate([ids[:i], new_id, ids[i:]])))
+
+    def cluster_column(self):
+        '''
+        the cluster id of every entry of nodes
+        '''
+        return np.repeat(self.cluster_ids, self.sizes)
+
+    def to_frame(self):
+        '''
+        :rtype: Pandas dataframe with columns node, cluster
+        '''
+        return pd.DataFrame({'node': self.nodes, 'cluster': self.cluster_column()})
+
+    def to_dict(self):
+        '''
+        :rtype: dict of cluster id to list of nodes
+        '''
+        nodes = self.nodes.tolist()
+        offsets = self.offsets.tolist()
+        return {k: nodes[offsets[i]:offsets[i + 1]] for i, k in enumerate(self.cluster_ids.tolist())}
+
+    def __len__(self):
+        '''
+        number of clusters, as for the dict of :meth:`to_dict`
+        '''
+        return self.num_cluster
@@ -0,0 +1,54 @@
+'''
+Compact (dense) node id space for programs which assume node ids are 0..n-1 without gaps.
+
+The node map is the sorted array of the original node ids, so dense id i stands for node_map[i].
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import numpy as np
+
+
+def build_node_map(src, dest):
+    '''
+    sorted unique node ids of an edge list.
+    '''
+    return np.unique(np.concatenate([np.asarray(src), np.asarray(dest)]))
+
+
+def is_dense(node_map):
+    '''
+    True if the node ids are already 0..n-1
+    '''
+    n = len(node_map)
+    return n == 0 or (node_map[0] == 0 and node_map[-1] == n - 1)
+
+
+def dense_dtype(node_map):
+    return np.int32 if len(node_map) < np.iinfo(np.int32).max else np.int64
+
+
+def to_dense(node_map, ids):
+    '''
+    translate original node ids to dense ids. All ids must be present in the node map.
+    '''
+    return np.searchsorted(node_map, np.asarray(ids)).astype(dense_dtype(node_map))
+
+
+def from_dense(node_map, dense_ids):
+    '''
+    translate dense ids back to original node ids.
+    '''
+    return np.asarray(node_map)[np.asarray(dense_ids)]
+
+
+def save_array(filepath, arr):
+    '''
+    save a .npy file through a temporary file, so a reader never sees a partial file.
+    '''
+    tmppath = filepath + ".tmp.npy"
+    np.save(tmppath, arr)
+    os.replace(tmppath, filepath)
+    return filepath
@@ -1,4 +1,4 @@
-from gct import utils, config
+from gct import utils, config, process
 import pandas as pd
 import numpy as np  
 import snap 
@@ -17,7 +17,10 @@ class RandomGenerator():
         params = self.params
         if params['name'] == 'Erdos-Renyi':
             gtype = snap.PNGraph if params['directed'] else snap.PUNGraph
-            g = snap.GenRndGnm(gtype , params['n_node'], params['n_edge'])
+            if seed is None:
+                g = snap.GenRndGnm(gtype , params['n_node'], params['n_edge'], params['directed'])
+            else:
+                g = snap.GenRndGnm(gtype , params['n_node'], params['n_edge'], params['directed'], snap.TRnd(seed))
             lst = [] 
             for EI in g.Edges():
                 lst.append([EI.GetSrcNId(), EI.GetDstNId()])
@@ -36,7 +39,7 @@ class RandomGenerator():
                 cmd = program + " " + " ".join([ "-" + str(u[0]) + " " + str(u[1]) for u in newparams.items() if u[1] is not None])
                 self.logger.info("Runing '{}' with seed {}".format(cmd, seed))
                 self.logger.info("working dir: " + tmpdir)
-                status = utils.shell_run_and_wait(cmd, working_dir=tmpdir)
+                status = process.run(cmd, cwd=tmpdir)
                 if status != 0:
                     raise Exception("run command failed. status={}".format(status))
 
@@ -69,7 +72,7 @@ class RandomGenerator():
                 cmd = program + " " + " ".join([ "-" + str(u[0]) + " " + str(u[1]) for u in newparams.items() if u[1] is not None])
                 self.logger.info("Runing '{}'  with seed {}".format(cmd, seed))
                 self.logger.info("working dir: " + tmpdir)
-                status = utils.shell_run_and_wait(cmd, working_dir=tmpdir)
+                status = process.run(cmd, cwd=tmpdir)
                 if status != 0:
                     raise Exception("run command failed. status={} with seed {}".format(status, seed))
 
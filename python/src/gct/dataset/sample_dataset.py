@@ -1,6 +1,6 @@
 import pandas as pd 
 from gct.dataset.dataset import local_exists, load_local 
-from gct.dataset import convert
+from gct.dataset import ingest
 from gct import config
 import os
 
@@ -27,11 +27,13 @@ def load_sample_dataset(name, overide=False):
     
     else:
         path = os.path.join(config.GCT_HOME, 'data',_DATASET_[name ])
-        edges = pd.read_csv(path)
-        gt = pd.read_csv(path.replace("_edges", '_gt'))
+        weighted = 'weight' in pd.read_csv(path, nrows=0).columns
+        edges = ingest.read_edge_chunks(path, sep=",", header=0, weighted=weighted)
+        gt = pd.read_csv(path.replace("_edges", '_gt'), chunksize=ingest.DEFAULT_CHUNK_SIZE)
         description = ""
         directed = False
-        return convert.from_edgelist(name, edges, groundtruth=gt, directed=directed, description=description, overide=overide)    
+        return ingest.create_dataset(name, edges, groundtruth_chunks=gt, directed=directed, weighted=weighted, 
+                                     description=description, overide=overide)    
 
 
 def list_datasets():
@@ -3,7 +3,7 @@ import urllib
 import gzip
 import pandas as pd 
 import json 
-from . import dataset 
+from . import dataset, ingest
 from gct.dataset.dataset import local_exists, load_local, Dataset
  
     
@@ -35,49 +35,41 @@ class SNAPConfig(object):
             utils.urlretrieve (rfile, fname)
         assert self.has_downloaded()
 
-    def get_edges(self):
+    def iter_edges(self, chunk_size=ingest.DEFAULT_CHUNK_SIZE):
+        '''
+        edges in chunks of dataframes, read by the C parser.
+        '''
         if not self.has_downloaded():
             self.download()
-
         self.logger.info("reading {}".format(self.graph_file))
-        edges = []
-        with gzip.open(self.graph_file, 'rt') as f:
-            for line in f:
-                if not line.startswith("#"):
-                    a, b = line.split("\t")
-                    edges.append([int(a), int(b)])
-                else:
-                    self.logger.info(line)  
-        edges = pd.DataFrame(edges, columns=['src', 'dest'])
+        return ingest.read_edge_chunks(self.graph_file, sep="\t", chunk_size=chunk_size, weighted=False)
+
+    def get_edges(self):
+        edges = pd.concat(list(self.iter_edges()), ignore_index=True)
         self.logger.info("Loaded {} edges".format(len(edges)))
-        self.logger.info("The graph have {} nodes".format(len(set(edges.values.ravel()))))
         self.logger.info("\n" + str(edges.head()))
         return edges 
                          
+    def iter_ground_truth(self, chunk_size=ingest.DEFAULT_CHUNK_SIZE):
+        '''
+        (node, cluster) in chunks of dataframes, clusters are numbered from 1 in the order of lines.
+        '''
+        if not self.with_ground_truth:
+            return None 
+        if not self.has_downloaded():
+            self.download()
+        self.logger.info("reading {}".format(self.ground_truth_file))
+        return ingest.read_community_chunks(self.ground_truth_file, chunk_size=chunk_size)
+
     # return
     def get_ground_truth(self):
         if self.with_ground_truth:
-            if not self.has_downloaded():
-                self.download()
-        
-            self.logger.info("reading {}".format(self.ground_truth_file))
-            ground_truth = []
-            i = 1
-            with gzip.open(self.ground_truth_file, 'rt') as f:
-                for line in f:
-                    if not line.startswith("#"):
-                        for node in  line.split("\t"):
-                            ground_truth.append([int(node), i])
-                        i = i + 1
-                    else:
-                        self.logger.info(line)
-            ground_truth = pd.DataFrame(ground_truth, columns=['node', 'cluster'])
+            ground_truth = pd.concat(list(self.iter_ground_truth()), ignore_index=True)
             n_node = len(set(ground_truth['node']))
             n_cluster = len(set(ground_truth['cluster']))
             self.logger.info("Loaded {} nodes that have ground truth".format(n_node))  
             self.logger.info("The graph have  {} clusters".format(n_cluster))
             self.logger.info("Mean cluster size: {}".format(float(ground_truth.shape[0]) / n_cluster))
-            self.logger.info("Mean #membership: {}".format(ground_truth.groupby('node').count().mean()[0]))
             self.logger.info("\n" + str(ground_truth.head()))
             return ground_truth
                         
@@ -119,12 +111,8 @@ def load_snap_dataset(name, overide=False):
     
     else:
         conf = _DATASET_[name ]
-        edges = conf.get_edges()
-        gt = conf.get_ground_truth()
-        description = conf.description
-        weighted = conf.weighted
-        directed = conf.directed
-        return Dataset(name, description=description, groundtruthObj=gt, edgesObj=edges, directed=directed, weighted=weighted, overide=overide)    
+        return ingest.create_dataset(name, conf.iter_edges(), groundtruth_chunks=conf.iter_ground_truth(),
+                                     directed=conf.directed, weighted=conf.weighted, description=conf.description, overide=overide)
 
 
 def list_datasets():
@@ -7,3 +7,10 @@ Created on Nov 11, 2018
 class UnsupportedException(Exception):
     def __init__(self,reason):
         super(UnsupportedException, self).__init__(reason)
+
+
+class TimeoutException(Exception):
+    def __init__(self, command, timeout):
+        super(TimeoutException, self).__init__("timeout after {} seconds: {}".format(timeout, " ".join(command)))
+        self.command = command
+        self.timeout = timeout
@@ -1 +1,2 @@
-from .metrics import GraphMetrics, GraphClusterMetrics, ClusterComparator, SNAPGraphMetrics
\ No newline at end of file
+from .metrics import GraphMetrics, GraphClusterMetrics, ClusterComparator, SNAPGraphMetrics
+from .batch_comparator import BatchComparator
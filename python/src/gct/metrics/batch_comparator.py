@@ -0,0 +1,198 @@
+'''
+Scores of many clusterings against one ground truth.
+
+:class:`ClusterComparator` prepares both of its clusterings for every pair. A :class:`BatchComparator` prepares
+the ground truth once: its sorted nodes, the codes of its hard labels, and its membership matrix with the cluster
+sizes, entropies and node pair counts (see :class:`gct.metrics.overlap.Cover`). A clustering is then placed on
+that node index; its nodes that are not in the ground truth are appended after the ground truth nodes, so the
+ground truth side is only padded with empty rows.
+
+Clusterings are scored by a process pool, each worker receiving the prepared ground truth once.
+
+    comparator = BatchComparator(data.get_ground_truth())
+    df = comparator.score(results, measures=['NMI_arithmetic', 'ARI', 'NMImax', 'omega', 'F1'])
+    df.pivot(index='name', columns='measure', values='value')
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import multiprocessing
+import concurrent.futures
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from gct import utils
+from gct.alg.clustering import Result
+from gct.dataset.membership import factorize
+from .contingency import Contingency, AVERAGE_METHODS
+from .overlap import Cover, CoverScores, membership_matrix
+from .metrics import to_clustering, hard_labels
+
+# measure name -> function of a :class:`Pair`. The NMI_* ones are partition NMIs of the hard labels,
+# NMImax, NMIsqrt, NMIavg and NMIlfk are overlapping NMIs of the covers.
+MEASURES = {'NMI_' + u: (lambda u: lambda p: p.contingency.nmi(u))(u) for u in AVERAGE_METHODS}
+MEASURES.update({
+    'AMI': lambda p: p.contingency.ami(),
+    'ARI': lambda p: p.contingency.ari(),
+    'homogeneity': lambda p: p.contingency.homogeneity(),
+    'completeness': lambda p: p.contingency.completeness(),
+    'v_measure': lambda p: p.contingency.v_measure(),
+    'purity': lambda p: p.contingency.purity(),
+    'pair_precision': lambda p: p.contingency.pair_scores()['precision'],
+    'pair_recall': lambda p: p.contingency.pair_scores()['recall'],
+    'pair_f1': lambda p: p.contingency.pair_scores()['f1'],
+    'NMImax': lambda p: p.cover.nmi()['NMImax'],
+    'NMIsqrt': lambda p: p.cover.nmi()['NMIsqrt'],
+    'NMIavg': lambda p: p.cover.nmi()['NMIavg'],
+    'NMIlfk': lambda p: p.cover.nmi_lfk(),
+    'omega': lambda p: p.cover.omega(),
+    'F1': lambda p: p.cover.best_match_f1(),
+})
+
+DEFAULT_MEASURES = ['NMI_arithmetic', 'ARI', 'NMImax', 'NMIlfk', 'omega', 'F1']
+
+
+class Pair(object):
+    '''
+    a clustering placed on the node index of a :class:`BatchComparator`, its tables are built on first use
+    '''
+
+    def __init__(self, comparator, clusterobj):
+        self.comparator = comparator
+        self.clusterobj = clusterobj
+
+    @property
+    def contingency(self):
+        '''
+        :class:`gct.metrics.contingency.Contingency` of the hard labels on the union of the nodes
+        '''
+
+        def f():
+            ref = self.comparator
+            nodes, clusters = hard_labels(self.clusterobj, ref.seed)
+            pos, n = ref.index(nodes)
+            _, codes = factorize(clusters)
+            pred = np.full(n, codes.max() + 1 if len(codes) else 0, dtype=np.int64)
+            pred[pos] = codes
+            true = np.concatenate([ref.codes, np.full(n - ref.num_node, ref.num_class, dtype=np.int64)])
+            return Contingency(true, pred)
+
+        return utils.set_if_not_exists(self, "_contingency", f)
+
+    @property
+    def cover(self):
+        '''
+        :class:`gct.metrics.overlap.CoverScores` of the memberships on the union of the nodes
+        '''
+
+        def f():
+            ref = self.comparator
+            m = self.clusterobj.get_membership()
+            pos, n = ref.index(m.nodes)
+            cols = np.repeat(np.arange(m.num_cluster), m.sizes)
+            Y = csr_matrix((np.ones(len(pos)), (pos, cols)), shape=(n, m.num_cluster))
+            return CoverScores(ref.cover.extend(n), Y)
+
+        return utils.set_if_not_exists(self, "_cover", f)
+
+
+class BatchComparator(object):
+    '''
+    metrics of many clusterings against one ground truth, see :class:`gct.metrics.ClusterComparator` for
+    the comparison of two clusterings.
+    '''
+
+    def __init__(self, ground_truth, seed=0):
+        '''
+        :param ground_truth: a :class:`gct.Clustering` object or refer to the *groundtruth* parameter of  :meth:`gct.from_edgelist`
+        :param seed:         seed for keeping a random cluster of each overlapped node, see :meth:`gct.Clustering.value`
+        '''
+        self.logger = utils.get_logger("{}".format(type(self).__name__))
+        self.seed = seed
+        self.ground_truth = to_clustering(ground_truth)
+        m = self.ground_truth.get_membership()
+        self.nodes = m.inverse[0]
+        self.cover = Cover(membership_matrix(m, self.nodes))
+        nodes, clusters = hard_labels(self.ground_truth, seed)
+        _, codes = factorize(clusters)
+        self.num_class = codes.max() + 1 if len(codes) else 0
+        self.codes = np.empty(len(self.nodes), dtype=np.int64)
+        self.codes[np.searchsorted(self.nodes, nodes)] = codes
+
+    @property
+    def num_node(self):
+        return len(self.nodes)
+
+    def index(self, nodes):
+        '''
+        positions of nodes in the ground truth nodes followed by the nodes that are not in the ground truth
+
+        :rtype: (positions, number of nodes of the union)
+        '''
+        nodes = np.asarray(nodes)
+        pos = np.minimum(np.searchsorted(self.nodes, nodes), max(self.num_node - 1, 0))
+        found = (self.nodes[pos] == nodes) if self.num_node else np.zeros(len(nodes), dtype=bool)
+        extra, extra_pos = factorize(nodes[~found])
+        pos[~found] = self.num_node + extra_pos
+        return pos, self.num_node + len(extra)
+
+    def compare(self, clusteringobj, measures=None):
+        '''
+        :param clusteringobj: a :class:`gct.Clustering`, :class:`gct.alg.clustering.Result` or anything :class:`gct.Clustering` accepts
+        :param measures: names of :data:`MEASURES`, :data:`DEFAULT_MEASURES` by default
+        :rtype: dict of measure to value
+        '''
+        measures = DEFAULT_MEASURES if measures is None else measures
+        for u in measures:
+            if u not in MEASURES:
+                raise ValueError("Unknown measure {}, must be one of {}".format(u, sorted(MEASURES)))
+        pair = Pair(self, to_clustering(clusteringobj))
+        return {u: MEASURES[u](pair) for u in measures}
+
+    def score(self, clusterings, measures=None, num_worker=None, mp_context=None):
+        '''
+        score clusterings in parallel.
+
+        :param clusterings: list of clusterings (see :meth:`compare`) or dict of name to clustering. A :class:`gct.alg.clustering.Result`
+                            is named by its runname, others by their position in the list.
+        :param measures: names of :data:`MEASURES`, :data:`DEFAULT_MEASURES` by default
+        :param num_worker: number of processes, all the cores by default. 1 to score in the current process.
+        :param mp_context: multiprocessing context of the pool
+        :rtype: DataFrame with columns name, measure and value, a row per clustering and measure
+        '''
+        measures = list(DEFAULT_MEASURES if measures is None else measures)
+        if isinstance(clusterings, dict):
+            names, objs = list(clusterings.keys()), list(clusterings.values())
+        else:
+            objs = list(clusterings)
+            names = [u.runname if isinstance(u, Result) and u.runname is not None else i for i, u in enumerate(objs)]
+        num_worker = min(num_worker or multiprocessing.cpu_count(), len(objs))
+        self.logger.info("scoring {} clusterings on {} workers".format(len(objs), num_worker))
+
+        if 'omega' in measures:
+            # computed once here rather than by every worker
+            self.cover.pair_counts
+
+        if num_worker <= 1:
+            values = [self.compare(u, measures) for u in objs]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=num_worker, mp_context=mp_context,
+                                                        initializer=_init_worker, initargs=(self,)) as executor:
+                values = list(executor.map(_compare, objs, [measures] * len(objs)))
+
+        rows = [(name, u, v[u]) for name, v in zip(names, values) for u in measures]
+        return pd.DataFrame(rows, columns=['name', 'measure', 'value'])
+
+
+# the comparator of a worker process
+_worker_comparator = None
+
+
+def _init_worker(comparator):
+    global _worker_comparator
+    _worker_comparator = comparator
+
+
+def _compare(clusteringobj, measures):
+    return _worker_comparator.compare(clusteringobj, measures)
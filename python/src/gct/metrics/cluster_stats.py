@@ -0,0 +1,249 @@
+'''
+Per-cluster edge statistics of a clustering, computed in one pass over the edges.
+
+Nodes and clusters are turned into dense integer positions once: every edge gets the cluster positions of its
+two ends (-1 for a node without cluster), and all the per-cluster and per-node sums are then plain
+np.bincount calls over these label arrays. The dict valued metrics of
+:class:`gct.metrics.GraphClusterMetrics` are built from the arrays kept here.
+
+A node which belongs to several clusters is labeled with the last of them (largest cluster id), which is
+what a node to cluster dict of the clustering gives. :class:`MembershipMatrixStats` keeps every membership
+instead: the same sums come from products of the adjacency matrix A with the sparse node x cluster
+membership matrix H, e.g. the intra-cluster weights are diag(H^T A H).
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix
+from gct.dataset.membership import factorize
+
+
+class ClusterStats(object):
+    '''
+    :param src: source nodes of the edges
+    :param dest: destination nodes of the edges
+    :param weight: edge weights, None for an unweighted graph
+    :param membership: :py:class:`gct.dataset.membership.Membership` of the clustering
+    '''
+
+    def __init__(self, src, dest, weight, membership):
+        src, dest = np.asarray(src), np.asarray(dest)
+        m = len(src)
+        weight = np.ones(m, dtype=np.float64) if weight is None else np.asarray(weight, dtype=np.float64)
+        self.cluster_ids = membership.cluster_ids
+        k = self.num_cluster = len(membership.cluster_ids)
+
+        # dense node ids of the graph
+        self.node_ids, codes = factorize(np.concatenate([src, dest]))
+        n = self.num_node = len(self.node_ids)
+        s, d = self.src_node, self.dest_node = codes[:m], codes[m:]
+        self.unweighted_degrees = np.bincount(s, minlength=n) + np.bincount(d, minlength=n)
+        self.weighted_degrees = np.bincount(s, weight, minlength=n) + np.bincount(d, weight, minlength=n)
+
+        # cluster of each node, -1 if none
+        entry_cluster = np.repeat(np.arange(k), np.diff(membership.offsets))
+        pos = np.searchsorted(self.node_ids, membership.nodes) if n else np.zeros(len(membership.nodes), dtype=np.int64)
+        pos = np.minimum(pos, max(n - 1, 0))
+        in_graph = (self.node_ids[pos] == membership.nodes) if n else np.zeros(len(pos), dtype=bool)
+        label = np.full(n, -1, dtype=np.int64)
+        np.maximum.at(label, pos[in_graph], entry_cluster[in_graph])
+        self.node_label = label
+        sc, dc = label[s], label[d]
+        self.src_label, self.dest_label = sc, dc
+
+        # per-cluster sums
+        intra = (sc == dc) & (sc >= 0)
+        self.intra_mask = intra
+        inter_src = (sc != dc) & (sc >= 0)
+        inter_dest = (sc != dc) & (dc >= 0)
+        self.intra_count = np.bincount(sc[intra], minlength=k)
+        self.intra_weight = np.bincount(sc[intra], weight[intra], minlength=k)
+        self.src_count = np.bincount(sc[sc >= 0], minlength=k)
+        self.out_src_count = np.bincount(sc[inter_src], minlength=k)
+        self.out_dest_count = np.bincount(dc[inter_dest], minlength=k)
+        self.out_src_weight = np.bincount(sc[inter_src], weight[inter_src], minlength=k)
+        self.out_dest_weight = np.bincount(dc[inter_dest], weight[inter_dest], minlength=k)
+        self.out_weight = self.out_src_weight + self.out_dest_weight
+
+        # all memberships count, not only the labels
+        self.sizes = np.diff(membership.offsets)
+        node_wd = np.zeros(len(membership.nodes))
+        node_wd[in_graph] = self.weighted_degrees[pos[in_graph]]
+        self.volume = np.bincount(entry_cluster, node_wd, minlength=k)
+
+        # per-node weights to the own cluster and to the others
+        self.node_intra_weight = np.bincount(s[intra], weight[intra], minlength=n) + np.bincount(d[intra], weight[intra], minlength=n)
+        self.node_out_weight = np.bincount(s[inter_src], weight[inter_src], minlength=n) \
+            +np.bincount(d[inter_dest], weight[inter_dest], minlength=n)
+
+    @property
+    def has_intra(self):
+        return self.intra_count > 0
+
+    @property
+    def has_out(self):
+        return (self.out_src_count + self.out_dest_count) > 0
+
+    @property
+    def has_src(self):
+        return self.src_count > 0
+
+    def modularity(self):
+        c = self.weighted_degrees.sum()
+        return self.intra_weight.sum() * 2 / c - np.sum(self.volume * self.volume) / (c * c)
+
+    def to_dict(self, values, mask=None):
+        '''
+        dict of cluster id to value, for the clusters selected by mask
+        '''
+        ids = self.cluster_ids
+        if mask is not None:
+            ids, values = ids[mask], values[mask]
+        return dict(zip(ids.tolist(), np.asarray(values).tolist()))
+
+    def out_degree_fractions(self):
+        '''
+        max and average out degree fraction, and the fraction of nodes with more weight outside than inside,
+        of each cluster. Only labeled nodes with edges are taken into account.
+
+        :rtype: (max, avg, flake) arrays of length num_cluster, nan for clusters without such nodes
+        '''
+        k = self.num_cluster
+        nodes = np.flatnonzero((self.node_label >= 0) & (self.unweighted_degrees > 0))
+        label = self.node_label[nodes]
+        inter, intra = self.node_out_weight[nodes], self.node_intra_weight[nodes]
+        total = inter + intra
+        with np.errstate(invalid='ignore', divide='ignore'):
+            odf = inter / total
+        count = np.bincount(label, minlength=k)
+        max_odf = np.full(k, -np.inf)
+        np.maximum.at(max_odf, label, odf)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_odf = np.bincount(label, odf, minlength=k) / count
+            flake = np.bincount(label, (inter > intra).astype(np.float64), minlength=k) / self.sizes
+        max_odf[count == 0] = np.nan
+        return max_odf, avg_odf, flake
+
+
+class MembershipMatrixStats(object):
+    '''
+    the sums of :class:`ClusterStats` for an overlapping clustering, where every membership of a node counts.
+    Edges are taken as undirected.
+
+    :param src: source nodes of the edges
+    :param dest: destination nodes of the edges
+    :param weight: edge weights, None for an unweighted graph
+    :param membership: :py:class:`gct.dataset.membership.Membership` of the clustering
+    '''
+
+    def __init__(self, src, dest, weight, membership):
+        src, dest = np.asarray(src), np.asarray(dest)
+        m = len(src)
+        self.cluster_ids = membership.cluster_ids
+        k = self.num_cluster = len(membership.cluster_ids)
+
+        self.node_ids, codes = factorize(np.concatenate([src, dest]))
+        n = self.num_node = len(self.node_ids)
+        s, d = self.src_node, self.dest_node = codes[:m], codes[m:]
+        A1 = coo_matrix((np.ones(m), (s, d)), shape=(n, n)).tocsr()
+        A1 = A1 + A1.T
+        if weight is None:
+            A = A1
+        else:
+            A = coo_matrix((np.asarray(weight, dtype=np.float64), (s, d)), shape=(n, n)).tocsr()
+            A = A + A.T
+        self.weighted_degrees = np.asarray(A.sum(axis=1)).ravel()
+        self.unweighted_degrees = np.asarray(A1.sum(axis=1)).ravel().astype(np.int64)
+
+        # memberships of the nodes of the graph, the entries of H sorted by (node, cluster)
+        entry_cluster = np.repeat(np.arange(k), np.diff(membership.offsets))
+        pos = np.searchsorted(self.node_ids, membership.nodes) if n else np.zeros(len(membership.nodes), dtype=np.int64)
+        pos = np.minimum(pos, max(n - 1, 0))
+        in_graph = (self.node_ids[pos] == membership.nodes) if n else np.zeros(len(pos), dtype=bool)
+        H = self.H = csr_matrix((np.ones(in_graph.sum()), (pos[in_graph], entry_cluster[in_graph])), shape=(n, k))
+        H.sort_indices()
+        self.entry_node = np.repeat(np.arange(n), np.diff(H.indptr))
+        self.entry_cluster = H.indices.astype(np.int64)
+        self.node_overlap = np.bincount(self.entry_node, minlength=n)
+
+        # weight from each node to the other members of each of its clusters, i.e. (A H)[i, c]
+        AH = A @ H
+        self.entry_intra_weight = self._at_entries(AH)
+        entry_intra_count = self.entry_intra_weight if A is A1 else self._at_entries(A1 @ H)
+        self.intra_weight = np.bincount(self.entry_cluster, self.entry_intra_weight, minlength=k) / 2
+        self.intra_count = np.rint(np.bincount(self.entry_cluster, entry_intra_count, minlength=k) / 2).astype(np.int64)
+
+        self.sizes = np.diff(membership.offsets)
+        self.volume = np.bincount(self.entry_cluster, self.weighted_degrees[self.entry_node], minlength=k)
+        self.unweighted_volume = np.bincount(self.entry_cluster, self.unweighted_degrees[self.entry_node], minlength=k)
+        self.out_weight = np.maximum(self.volume - self.intra_weight * 2, 0)
+        self.out_count = np.rint(self.unweighted_volume - self.intra_count * 2).astype(np.int64)
+
+        # belonging factor 1/O_i of each membership, for the modularity
+        belonging = 1.0 / self.node_overlap[self.entry_node]
+        if (self.node_overlap <= 1).all():
+            self._belonging_intra = self.entry_intra_weight.sum()
+        else:
+            B = csr_matrix((belonging, H.indices, H.indptr), shape=(n, k))
+            self._belonging_intra = np.sum(self._at_entries(A @ B) * belonging)
+        self._belonging_volume = np.bincount(self.entry_cluster, self.weighted_degrees[self.entry_node] * belonging,
+                                             minlength=k)
+
+    def _at_entries(self, M):
+        '''
+        values of a node x cluster sparse matrix at the memberships
+        '''
+        # the product with H keeps only (a subset of) the entries of H, then both are in (node, cluster) order
+        P = csr_matrix(M.multiply(self.H))
+        P.sum_duplicates()
+        k = max(self.num_cluster, 1)
+        keys = self.entry_node * k + self.entry_cluster
+        pkeys = np.repeat(np.arange(self.num_node), np.diff(P.indptr)) * k + P.indices
+        ret = np.zeros(len(keys))
+        ret[np.searchsorted(keys, pkeys)] = P.data
+        return ret
+
+    @property
+    def has_intra(self):
+        return self.intra_count > 0
+
+    @property
+    def has_out(self):
+        return self.out_count > 0
+
+    @property
+    def has_src(self):
+        return self.unweighted_volume > 0
+
+    def modularity(self):
+        '''
+        overlapping modularity where each membership of node i counts 1/O_i, O_i being the number of clusters of i
+        (Shen et al., 2009). It is the usual modularity when there is no overlap.
+        '''
+        c = self.weighted_degrees.sum()
+        return self._belonging_intra / c - np.sum(self._belonging_volume * self._belonging_volume) / (c * c)
+
+    to_dict = ClusterStats.to_dict
+
+    def out_degree_fractions(self):
+        '''
+        see :meth:`ClusterStats.out_degree_fractions`. A node in several clusters has a fraction in each of them.
+        '''
+        k = self.num_cluster
+        mask = self.unweighted_degrees[self.entry_node] > 0
+        label = self.entry_cluster[mask]
+        total = self.weighted_degrees[self.entry_node[mask]]
+        intra = self.entry_intra_weight[mask]
+        inter = np.maximum(total - intra, 0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            odf = inter / total
+        count = np.bincount(label, minlength=k)
+        max_odf = np.full(k, -np.inf)
+        np.maximum.at(max_odf, label, odf)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_odf = np.bincount(label, odf, minlength=k) / count
+            flake = np.bincount(label, (inter > intra).astype(np.float64), minlength=k) / self.sizes
+        max_odf[count == 0] = np.nan
+        return max_odf, avg_odf, flake
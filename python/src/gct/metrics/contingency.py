@@ -0,0 +1,223 @@
+'''
+Partition comparison scores derived from one contingency table.
+
+The two clusterings are aligned on the union of their nodes (a node missing from one side is put in an extra
+cluster of that side), the cluster labels are turned into codes, and the table n_ij of the nodes in true class i
+and predicted cluster j is counted once, sparse. NMI with any normalization, AMI, ARI, homogeneity,
+completeness, V-measure, purity and the pair counting precision, recall and F1 are then plain sums over its
+nonzero cells and its marginals. The definitions and the special cases follow sklearn.metrics.cluster.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import numpy as np
+from scipy.sparse import csr_matrix
+from gct import utils
+from gct.dataset.membership import factorize
+
+# label of the nodes missing from one side
+MISSING_CLUSTER = -9999
+
+AVERAGE_METHODS = ['min', 'geometric', 'arithmetic', 'max']
+
+
+def align(nodes1, clusters1, nodes2, clusters2):
+    '''
+    the two labelings on the union of their nodes. Each side has at most one cluster per node.
+
+    :rtype: (nodes, (cluster ids, codes) of each side), codes are positions in the sorted cluster ids, 
+            len(cluster ids) for a missing node
+    '''
+    # the union and the position of every node in it, like np.union1d but without a second search
+    nodes, pos = factorize(np.concatenate([nodes1, nodes2]))
+
+    def fill(p, c):
+        ids, codes = factorize(c)
+        ret = np.full(len(nodes), len(ids), dtype=np.int64)
+        ret[p] = codes
+        return ids, ret
+
+    return nodes, fill(pos[:len(nodes1)], clusters1), fill(pos[len(nodes1):], clusters2)
+
+
+def comb2(n):
+    n = np.asarray(n, dtype=np.float64)
+    return n * (n - 1) / 2
+
+
+def generalized_average(u, v, average_method):
+    if average_method == 'min':
+        return min(u, v)
+    elif average_method == 'geometric':
+        return np.sqrt(u * v)
+    elif average_method == 'arithmetic':
+        return np.mean([u, v])
+    elif average_method == 'max':
+        return max(u, v)
+    else:
+        raise ValueError("average_method must be one of {}".format(AVERAGE_METHODS))
+
+
+def entropy(counts, n):
+    # in the order of sklearn's operations, so that the rounding is the same
+    counts = counts[counts > 0]
+    return -np.sum((counts / float(n)) * (np.log(counts) - np.log(float(n))))
+
+
+class Contingency(object):
+    '''
+    :param labels_true: class code of each node, e.g. of the ground truth
+    :param labels_pred: cluster code of each node
+    '''
+
+    def __init__(self, labels_true, labels_pred):
+        rows, a = factorize(labels_true)
+        cols, b = factorize(labels_pred)
+        self.num_class, self.num_cluster = len(rows), len(cols)
+        self.n = len(a)
+        cells, code = factorize(a * max(self.num_cluster, 1) + b)
+        # nonzero cells
+        self.nij = np.bincount(code, minlength=len(cells)).astype(np.float64)
+        self.row = cells // max(self.num_cluster, 1)
+        self.col = cells % max(self.num_cluster, 1)
+        # marginals: class sizes and cluster sizes
+        self.ai = np.bincount(a, minlength=self.num_class).astype(np.float64)
+        self.bj = np.bincount(b, minlength=self.num_cluster).astype(np.float64)
+
+    @property
+    def matrix(self):
+        '''
+        the table as a scipy csr_matrix, classes by clusters
+        '''
+        return csr_matrix((self.nij, (self.row, self.col)), shape=(self.num_class, self.num_cluster))
+
+    def _trivial(self):
+        # a single cluster on both sides, or no node: a perfect match
+        return self.num_class == self.num_cluster == 1 or self.num_class == self.num_cluster == 0
+
+    @property
+    def entropy_true(self):
+        return entropy(self.ai, self.n)
+
+    @property
+    def entropy_pred(self):
+        return entropy(self.bj, self.n)
+
+    def mutual_info(self):
+        # a single cluster on one side tells nothing about the other, the sum of the cells would only leave residue
+        if self.n == 0 or self.num_class == 1 or self.num_cluster == 1: return 0.0
+        nij, n = self.nij, float(self.n)
+        # in the order of sklearn's operations, so that the rounding is the same
+        p = nij / n
+        log_outer = -np.log(self.ai[self.row].astype(np.int64) * self.bj[self.col].astype(np.int64)) + np.log(n) + np.log(n)
+        mi = p * (np.log(nij) - np.log(n)) + p * log_outer
+        mi[np.abs(mi) < np.finfo('float64').eps] = 0.0
+        return max(0.0, float(np.sum(mi)))
+
+    def nmi(self, average_method='arithmetic'):
+        '''
+        normalized mutual information, MI / average of the two entropies
+        '''
+        if self._trivial(): return 1.0
+        mi = self.mutual_info()
+        if mi == 0: return 0.0
+        normalizer = generalized_average(self.entropy_true, self.entropy_pred, average_method)
+        return float(mi / max(normalizer, np.finfo('float64').eps))
+
+    def labels(self):
+        '''
+        a pair of labelings with this table, the nodes ordered by cell
+
+        :rtype: (class codes, cluster codes)
+        '''
+        counts = self.nij.astype(np.int64)
+        return np.repeat(self.row, counts), np.repeat(self.col, counts)
+
+    def expected_mutual_info(self):
+        '''
+        expected mutual information of two random labelings with the same marginals (sklearn's implementation).
+        It is in a private module of sklearn.
+
+        :raises ImportError: if this version of sklearn does not have it
+        '''
+        from sklearn.metrics.cluster._expected_mutual_info_fast import expected_mutual_information
+        return utils.set_if_not_exists(self, "_emi", lambda: expected_mutual_information(self.matrix, self.n))
+
+    def ami(self, average_method='arithmetic'):
+        '''
+        adjusted mutual information, (MI - E[MI]) / (average of the entropies - E[MI]). If the expected mutual 
+        information is not available, sklearn.metrics.adjusted_mutual_info_score of :meth:`labels` is returned.
+        '''
+        if self._trivial(): return 1.0
+        if self.num_class == 1 or self.num_cluster == 1: return 0.0
+        try:
+            emi = self.expected_mutual_info()
+        except ImportError:
+            from sklearn.metrics import adjusted_mutual_info_score
+            return float(adjusted_mutual_info_score(*self.labels(), average_method=average_method))
+        mi = self.mutual_info()
+        normalizer = generalized_average(self.entropy_true, self.entropy_pred, average_method)
+        denominator = normalizer - emi
+        eps = np.finfo('float64').eps
+        denominator = min(denominator, -eps) if denominator < 0 else max(denominator, eps)
+        numerator = mi - emi
+        numerator = min(numerator, -eps) if numerator < 0 else max(numerator, eps)
+        return float(numerator / denominator)
+
+    def pair_counts(self):
+        '''
+        :rtype: (pairs together in both, pairs together in the truth, pairs together in the prediction, all pairs)
+        '''
+        return np.sum(comb2(self.nij)), np.sum(comb2(self.ai)), np.sum(comb2(self.bj)), float(comb2(self.n))
+
+    def ari(self):
+        '''
+        adjusted Rand index
+        '''
+        both, true, pred, total = self.pair_counts()
+        if self.n == 0 or (true == pred == both): return 1.0
+        expected = true * pred / total if total else 0.0
+        return float((both - expected) / ((true + pred) / 2.0 - expected))
+
+    def homogeneity(self):
+        h = self.entropy_true
+        return float(self.mutual_info() / h) if h else 1.0
+
+    def completeness(self):
+        h = self.entropy_pred
+        return float(self.mutual_info() / h) if h else 1.0
+
+    def v_measure(self, beta=1.0):
+        h, c = self.homogeneity(), self.completeness()
+        if h + c == 0: return 0.0
+        return float((1 + beta) * h * c / (beta * h + c))
+
+    def purity(self):
+        '''
+        fraction of the nodes that are in the most common class of their cluster
+        '''
+        if self.n == 0: return 1.0
+        best = np.zeros(self.num_cluster)
+        np.maximum.at(best, self.col, self.nij)
+        return float(best.sum() / self.n)
+
+    def pair_scores(self):
+        '''
+        precision, recall and F1 of the pairs of nodes put together by the prediction, with respect to the truth
+        '''
+        both, true, pred, _ = self.pair_counts()
+        precision = both / pred if pred else 1.0
+        recall = both / true if true else 1.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        return {'precision': float(precision), 'recall': float(recall), 'f1': float(f1)}
+
+    def scores(self):
+        '''
+        all the scores, dict of name to value
+        '''
+        ret = {'NMI_' + u: self.nmi(u) for u in AVERAGE_METHODS}
+        ret.update({'AMI': self.ami(), 'ARI': self.ari(), 'homogeneity': self.homogeneity(),
+                    'completeness': self.completeness(), 'v_measure': self.v_measure(), 'purity': self.purity()})
+        ret.update({'pair_' + u: v for u, v in self.pair_scores().items()})
+        return ret
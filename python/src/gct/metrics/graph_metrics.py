@@ -52,7 +52,7 @@ class GraphMetrics(object):
         def f():
             df = self.data.get_edges()
             if not self.data.is_weighted():
-                df['weight'] = float(1)
+                df = df.assign(weight=float(1))
             return df 
 
         return self.set_if_not_exists("_edges", f)
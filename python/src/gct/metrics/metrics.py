@@ -10,10 +10,15 @@ from gct.alg.clustering import Result
 import sys
 from gct.dataset import convert
 from gct.dataset.dataset import Clustering
-from gct import utils, config
+from gct.dataset.membership import Membership
+from gct import utils, config, process
 import os
 
 from .graph_metrics import GraphMetrics, SNAPGraphMetrics
+from .cluster_stats import ClusterStats, MembershipMatrixStats
+from . import triangles
+from .overlap import CoverScores, cover_matrices
+from .contingency import Contingency, align, MISSING_CLUSTER
 
 class GraphClusterMetrics(object):
     '''
@@ -21,10 +26,12 @@ class GraphClusterMetrics(object):
     
     '''
 
-    def __init__(self, data, clusteringobj):
+    def __init__(self, data, clusteringobj, overlap=None):
         '''
         :param data:             a :class:`gct.Dataset` object 
         :param clusteringobj:         a :class:`gct.Clustering` object or refer to the *groundtruth* parameter of  :meth:`gct.from_edgelist`
+        :param overlap:          count every cluster of a node (see :class:`gct.metrics.cluster_stats.MembershipMatrixStats`),
+                                 otherwise a node is in its last cluster only. None to do so if the clustering is overlapping.
         '''
         if data.is_directed() or data.is_weighted():
             print ("Warning! Graph will be taken as undirected and unweighted.")
@@ -34,12 +41,12 @@ class GraphClusterMetrics(object):
             ##self.clusterobj = Clustering(clusteringobj.clusters(as_dataframe=True))
             self.clusterobj = Clustering(clusteringobj.clustering(as_dataframe=True))
         elif isinstance(clusteringobj, pd.DataFrame) or isinstance(clusteringobj, list) \
-            or isinstance(clusteringobj, np.ndarray) or isinstance(clusteringobj, str) or isinstance(clusteringobj, dict):
+            or isinstance(clusteringobj, np.ndarray) or isinstance(clusteringobj, str) or isinstance(clusteringobj, (dict, Membership)):
             self.clusterobj = Clustering(clusteringobj)
         else:
             raise Exception("Unsupported " + str(type(clusteringobj)))
         self.data = data 
-        self.clusters = self.clusterobj.value()
+        self.overlap = self.clusterobj.is_overlap if overlap is None else overlap
 
     def set_if_not_exists(self, name, fun):
         if hasattr(self, name):
@@ -49,6 +56,14 @@ class GraphClusterMetrics(object):
             value = fun()
             setattr(self, name, value)
             return value 
+
+    @property
+    def clusters(self):
+        '''
+        dataframe of the node and cluster pairs of the clustering
+        '''
+        prop_name = "_" + sys._getframe().f_code.co_name
+        return self.set_if_not_exists(prop_name, lambda: self.clusterobj.value())
     
     @property
     def edges(self):
@@ -56,12 +71,41 @@ class GraphClusterMetrics(object):
         def f():
             df = self.data.get_edges()
             if not self.data.is_weighted():
-                df['weight'] = float(1)
+                df = df.assign(weight=float(1))
             return df         
 
         prop_name = "_" + sys._getframe().f_code.co_name 
         return self.set_if_not_exists(prop_name, f)
     
+    @property
+    def stats(self):
+        '''
+        per-cluster sums of the clustering, a :class:`gct.metrics.cluster_stats.MembershipMatrixStats` if 
+        self.overlap else the :attr:`cluster_stats`
+        '''
+
+        def f():
+            if not self.overlap:
+                return self.cluster_stats
+            df = self.edges
+            return MembershipMatrixStats(df['src'].values, df['dest'].values, df['weight'].values, self.clusterobj.get_membership())
+
+        prop_name = "_" + sys._getframe().f_code.co_name
+        return self.set_if_not_exists(prop_name, f)
+
+    @property
+    def cluster_stats(self):
+        '''
+        per-cluster sums where each node is in one cluster, see :class:`gct.metrics.cluster_stats.ClusterStats`
+        '''
+
+        def f():
+            df = self.edges
+            return ClusterStats(df['src'].values, df['dest'].values, df['weight'].values, self.clusterobj.get_membership())
+
+        prop_name = "_" + sys._getframe().f_code.co_name
+        return self.set_if_not_exists(prop_name, f)
+
     @property 
     def num_edges(self):
         '''
@@ -75,7 +119,7 @@ class GraphClusterMetrics(object):
         number of vertices (nodes) of the graph
         '''
         prop_name = "_" + sys._getframe().f_code.co_name        
-        return self.set_if_not_exists(prop_name, lambda: len(set(np.unique(self.edges[['src', 'dest']].values))))
+        return self.set_if_not_exists(prop_name, lambda: self.stats.num_node)
 
     @property
     def node_degrees(self):
@@ -102,9 +146,7 @@ class GraphClusterMetrics(object):
         '''
 
         def f():
-            arr = self.edges[['src', 'dest']].values.ravel() 
-            unique, counts = np.unique(arr, return_counts=True)
-            return dict(zip(unique, counts))
+            return dict(zip(self.stats.node_ids.tolist(), self.stats.unweighted_degrees.tolist()))
 
         prop_name = "_" + sys._getframe().f_code.co_name        
         return self.set_if_not_exists(prop_name, f)
@@ -116,11 +158,7 @@ class GraphClusterMetrics(object):
         '''
 
         def f():
-            df1 = self.edges[['src', 'weight']]
-            df2 = self.edges[['dest', 'weight']]
-            df2.columns = df1.columns
-            df = pd.concat([df1, df2])
-            return df.groupby('src')['weight'].sum().to_dict()
+            return dict(zip(self.stats.node_ids.tolist(), self.stats.weighted_degrees.tolist()))
 
         prop_name = "_" + sys._getframe().f_code.co_name        
         return self.set_if_not_exists(prop_name, f)
@@ -145,20 +183,14 @@ class GraphClusterMetrics(object):
         return cluster size for each cluster
         """
         prop_name = "_" + sys._getframe().f_code.co_name        
-        return self.set_if_not_exists(prop_name, lambda: self.clusters[['node', 'cluster']].groupby('cluster')['node'].count().to_dict())
+        return self.set_if_not_exists(prop_name, lambda: self.stats.to_dict(self.stats.sizes))
     
     @property 
     def cluster_sum_intra_weights(self):
 
         def f():
-            df = self.edges[['src', 'dest', 'weight']]
-            c_df = self.clusters[['node', 'cluster']].set_index('node')['cluster'].to_dict()
-            df['src_c'] = df['src'].map(c_df) 
-            df['dest_c'] = df['dest'].map(c_df)
-            df = df [(df['src_c'] == df['dest_c'])]
-
-            a = df[['src_c', 'weight']].groupby('src_c')['weight'].sum() * 2
-            return a.to_dict()
+            st = self.stats
+            return st.to_dict(st.intra_weight * 2, st.has_intra)
                 
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -168,10 +200,7 @@ class GraphClusterMetrics(object):
     def cluster_sum_weighted_degrees(self):
 
         def f():
-            df = self.clusters[['node', 'cluster']]
-            d = self.weighted_degrees
-            df['wd'] = df['node'].map(d)
-            return df.groupby("cluster")['wd'].sum().to_dict()
+            return self.stats.to_dict(self.stats.volume)
                 
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -181,14 +210,8 @@ class GraphClusterMetrics(object):
     def cluster_edge_sizes(self):
 
         def f():
-            df = self.edges[['src', 'dest']]
-            c_df = self.clusters[['node', 'cluster']].set_index('node')['cluster'].to_dict()
-            df['src_c'] = df['src'].map(c_df) 
-            df['dest_c'] = df['dest'].map(c_df)
-            df['is_intra'] = (df['src_c'] == df['dest_c']).astype(np.float)
-
-            a = df[['src_c', 'is_intra']].groupby('src_c')['is_intra'].sum().to_dict()
-            return a 
+            st = self.stats
+            return st.to_dict(st.intra_count.astype(np.float64), st.has_src)
                 
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -198,17 +221,8 @@ class GraphClusterMetrics(object):
     def cluster_out_sum_weights(self):
 
         def f():
-            df = self.edges[['src', 'dest', 'weight']]
-            c_df = self.clusters[['node', 'cluster']].set_index('node')['cluster'].to_dict()
-            df['src_c'] = df['src'].map(c_df) 
-            df['dest_c'] = df['dest'].map(c_df)
-            df = df[(df['src_c'] != df['dest_c'])]
-            
-            a = df.groupby('src_c')[['weight']].sum().reset_index()
-            b = df.groupby('dest_c')[['weight']].sum().reset_index() 
-            b.columns = a.columns
-            a = pd.concat([a, b]).groupby('src_c').sum()
-            return a['weight'].to_dict()
+            st = self.stats
+            return st.to_dict(st.out_weight, st.has_out)
                 
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -334,22 +348,10 @@ class GraphClusterMetrics(object):
         '''
 
         def f():
-            df = self.edges[['src', 'dest', 'weight']]
-            c_df = self.clusters[['node', 'cluster']].set_index('node')['cluster'].to_dict()
-            df['src_c'] = df['src'].map(c_df) 
-            df['dest_c'] = df['dest'].map(c_df)
-            df['is_intra'] = (df['src_c'] == df['dest_c'])
-            df['is_inter'] = (df['src_c'] != df['dest_c'])
-
-            a = df[df['is_intra']].groupby('src_c')['weight'].sum()
-            b = df[df['is_inter']].groupby('src_c')['weight'].sum()
-            c = df[df['is_inter']].groupby('dest_c')['weight'].sum()
-
-            newdf = pd.concat([a, b, c], axis=1).fillna(0)
-            newdf.columns = ['intra', 'inter1', 'inter2']
-            newdf['density'] = newdf['intra'] / (newdf['inter1'] + newdf['inter2'] + newdf['intra'])
-            
-            return newdf['density'].to_dict()
+            st = self.stats
+            with np.errstate(invalid='ignore', divide='ignore'):
+                density = st.intra_weight / (st.intra_weight + st.out_weight)
+            return st.to_dict(density, st.has_intra | st.has_out)
                 
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -384,6 +386,9 @@ class GraphClusterMetrics(object):
              Q=1/(2m)  \sum_{i,j} (A_{ij}- \\frac{k_i k_j}{2m}) 1_{(i=j)}
 
         where m is the number of edges, A is the adjacency matrix, 1 is indicator function, :math:`k_i k_j` is the expected number of random edges between the two nodes.  
+        
+        For an overlapping clustering (self.overlap) each membership of node i counts :math:`1/O_i` where :math:`O_i` is
+        the number of clusters of i, see :meth:`gct.metrics.cluster_stats.MembershipMatrixStats.modularity`.
         '''        
         return self.modularity2
 
@@ -391,11 +396,7 @@ class GraphClusterMetrics(object):
     def modularity2(self):  # another formula
 
         def f():
-            c = self.sum_weight
-            d = 1.0 / (c * c)
-            a = np.sum(list(self.cluster_sum_intra_weights.values())) / c
-            b = np.sum([u * u * d for u in self.cluster_sum_weighted_degrees.values()])
-            return a - b
+            return self.stats.modularity()
             
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -413,20 +414,11 @@ class GraphClusterMetrics(object):
         '''        
 
         def f():
-            a = self.cluster_out_sum_weights
-            d = self.cluster_sum_intra_weights
-            keys=set(a.keys()).union(d.keys())
-            ret={}
-            for u in keys:
-                if u in a:
-                    v=a[u]
-                    if u in d:
-                        ret[u] = v / (v + d[u]) 
-                    else:
-                        ret[u] = v / (v + 0) 
-                else:
-                    ret[u]=0
-            return ret
+            st = self.stats
+            v, d = st.out_weight, st.intra_weight * 2
+            with np.errstate(invalid='ignore', divide='ignore'):
+                ret = np.where(st.has_out, v / (v + d), 0.0)
+            return st.to_dict(ret, st.has_intra | st.has_out)
                     
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -439,21 +431,12 @@ class GraphClusterMetrics(object):
         '''
 
         def f():
-            m = self.sum_weight
-            a = self.cluster_out_sum_weights
-            d = self.cluster_sum_intra_weights
-            keys=set(a.keys()).union(d.keys())
-            ret={}
-            for u in keys:
-                if u in a:
-                    v=a[u]
-                    if u in d:
-                        ret[u] = v / (v + d[u]) + v / (v + m - d[u])
-                    else:
-                        ret[u] = v / (v + 0) + v / (v + m - 0)
-                else:
-                    ret[u]=0
-            return ret
+            st = self.stats
+            m = st.weighted_degrees.sum()
+            v, d = st.out_weight, st.intra_weight * 2
+            with np.errstate(invalid='ignore', divide='ignore'):
+                ret = np.where(st.has_out, v / (v + d) + v / (v + m - d), 0.0)
+            return st.to_dict(ret, st.has_intra | st.has_out)
                 
         prop_name = "_" + sys._getframe().f_code.co_name
         
@@ -482,39 +465,20 @@ class GraphClusterMetrics(object):
         
     @property
     def cluster_out_degree_fraction(self):
+        '''
+        (max, average, Flake) out degree fractions, dicts of cluster to value. The out degree fraction of a node
+        is the weight of its edges to other clusters over its weighted degree.
+        '''
 
-        def f1():
-            df = self.edges[['src', 'dest', 'weight']]
-            df2 = self.edges[['dest', 'src', 'weight']]
-            df2.columns = df.columns 
-            df = pd.concat([df, df2]);del df2 
-            c_df = self.clusters[['node', 'cluster']].set_index('node')['cluster'].to_dict()
-            df['src_c'] = df['src'].map(c_df) 
-            df['dest_c'] = df['dest'].map(c_df)
-            df1 = df[(df['src_c'] != df['dest_c'])].drop(['dest_c', 'dest'], axis=1)
-            df1 = df1.groupby(['src_c', 'src'])["weight"].sum().reset_index()
-            df1.columns = ['cluster', 'node', 'inter_weight']
-            df2 = df[(df['src_c'] == df['dest_c'])].drop(['dest_c', 'dest'], axis=1)
-            df2 = df.groupby(['src_c', 'src'])["weight"].sum().reset_index()
-            df2.columns = ['cluster', 'node', 'intra_weight']
-            df = pd.merge(df1, df2, on=['cluster', 'node'], how='outer')
-            return df.fillna(0)
-
-        def f2():
-            df = f1()
-            df['odf'] = df['inter_weight'] / (df['inter_weight'] + df['intra_weight'])
-            df['flake'] = (df['inter_weight'] > df['intra_weight']).astype(np.float)
-            max_odf = df.groupby('cluster')['odf'].max().to_dict()
-            avg_odf = df.groupby('cluster')['odf'].mean().to_dict()
-            flake_odf = df.groupby('cluster')[['flake']].sum()
-            d = self.cluster_sizes
-            flake_odf['cluster_size'] = flake_odf.index.map(d)
-            flake_odf = (flake_odf['flake'] / flake_odf['cluster_size']).to_dict()
-            return max_odf, avg_odf, flake_odf
+        def f():
+            st = self.stats
+            max_odf, avg_odf, flake_odf = st.out_degree_fractions()
+            mask = ~np.isnan(max_odf)
+            return st.to_dict(max_odf, mask), st.to_dict(avg_odf, mask), st.to_dict(flake_odf, mask)
 
         prop_name = "_" + sys._getframe().f_code.co_name
         
-        return self.set_if_not_exists(prop_name, f2)
+        return self.set_if_not_exists(prop_name, f)
         
     @property
     def separability(self):
@@ -537,62 +501,65 @@ class GraphClusterMetrics(object):
         return ret
             
     @property
-    def cluster_clustering_coefficient(self):
+    def cluster_transitivity(self):
         '''
-        (global) clustering coefficient
+        triangles inside the clusters, see :mod:`gct.metrics.triangles`. Each cluster is the subgraph induced by its 
+        nodes if self.overlap, otherwise the nodes of the :attr:`cluster_stats` labels.
+
+        :rtype: (transitivity of each cluster, local transitivity of each membership, node ids and cluster positions of the memberships)
         '''
 
-        def f1(edges):
-            import igraph 
-            g = igraph.Graph(edges=edges[['src', 'dest']].values.tolist(), directed=False) 
-            return g.transitivity_undirected()
+        def f():
+            st = self.stats
+            if self.overlap:
+                order = np.lexsort((st.entry_node, st.entry_cluster))
+                entry_node, entry_cluster = st.entry_node[order], st.entry_cluster[order]
+                src, dest = st.src_node, st.dest_node
+            else:
+                entry_node = np.flatnonzero(st.node_label >= 0)
+                order = np.argsort(st.node_label[entry_node], kind='stable')
+                entry_node = entry_node[order]
+                entry_cluster = st.node_label[entry_node]
+                src, dest = st.src_node[st.intra_mask], st.dest_node[st.intra_mask]
+            a, b = triangles.intra_edges(src, dest, entry_node, entry_cluster, st.num_node)
+            tri, deg = triangles.cluster_triangles(a, b, entry_cluster, st.num_cluster)
+            glob, local = triangles.transitivity(tri, deg, entry_cluster, st.num_cluster)
+            return glob, local, st.node_ids[entry_node], entry_cluster
 
-        def f2():
-            df = self.edges[['src', 'dest']]
-            c_df = self.clusters[['node', 'cluster']].set_index('node')['cluster'].to_dict()
-            df['src_c'] = df['src'].map(c_df) 
-            df['dest_c'] = df['dest'].map(c_df)
-            df = df[(df['src_c'] == df['dest_c'])]
-            
-            ret = {}
-            for i in self.cluster_indexes:
-                edges = df[df['src_c'] == i]
-                ret[i] = f1(edges)
-                if np.isnan(ret[i]):
-                    ret[i]=0.0
-            return ret 
+        prop_name = "_" + sys._getframe().f_code.co_name
+        
+        return self.set_if_not_exists(prop_name, f)
+
+    @property
+    def cluster_clustering_coefficient(self):
+        '''
+        (global) clustering coefficient, the transitivity of igraph. 0 for a cluster without connected triples.
+        '''
+
+        def f():
+            glob = self.cluster_transitivity[0]
+            return self.stats.to_dict(np.nan_to_num(glob, nan=0.0))
         
         prop_name = "_" + sys._getframe().f_code.co_name
         
-        return self.set_if_not_exists(prop_name, f2)
+        return self.set_if_not_exists(prop_name, f)
 
     @property
     def cluster_local_clustering_coefficient(self):
         '''
-        local clustering coefficient
+        local clustering coefficient, dict of cluster to a dict of its nodes to their local transitivity in the cluster
+        (nan for nodes with less than two neighbors in the cluster)
         '''
 
-        def f1(edges):
-            import igraph 
-            g = igraph.Graph(edges=edges[['src', 'dest']].values.tolist(), directed=False) 
-            return g.transitivity_local_undirected()
-
-        def f2():
-            df = self.edges[['src', 'dest']]
-            c_df = self.clusters[['node', 'cluster']].set_index('node')['cluster'].to_dict()
-            df['src_c'] = df['src'].map(c_df) 
-            df['dest_c'] = df['dest'].map(c_df)
-            df = df[(df['src_c'] == df['dest_c'])]
-            
-            ret = {}
-            for i in self.cluster_indexes:
-                edges = df[df['src_c'] == i]
-                ret[i] = f1(edges)
-            return ret 
+        def f():
+            _, local, nodes, clusters = self.cluster_transitivity
+            bounds = np.searchsorted(clusters, np.arange(self.stats.num_cluster + 1))
+            return {c: dict(zip(nodes[bounds[i]:bounds[i + 1]].tolist(), local[bounds[i]:bounds[i + 1]].tolist()))
+                    for i, c in enumerate(self.stats.cluster_ids.tolist())}
         
         prop_name = "_" + sys._getframe().f_code.co_name
         
-        return self.set_if_not_exists(prop_name, f2)
+        return self.set_if_not_exists(prop_name, f)
 
     def graph_tool_draw(self, node_size=6, output_size=(1000, 500), edge_pen_width=1,
                    edge_color=[0.0, 0, 0, 0.05], cmap='nipy_spectral', vertex_shape='circle', layout=None):
@@ -608,7 +575,7 @@ class GraphClusterMetrics(object):
         node_size = g_gtool.new_vertex_property("double", np.zeros(g_gtool.num_vertices()) + node_size)
         c_map = plt.get_cmap(cmap)
         n_cluster = self.clusterobj.num_cluster
-        d = self.clusterobj.value(erase_overlap=self.clusterobj.is_overlap).set_index('node')['cluster'].to_dict()
+        d = self.clusterobj.value(erase_overlap=self.clusterobj.is_overlap, seed=0).set_index('node')['cluster'].to_dict()
         if layout is None: layout = 'sfdp_layout'
         
         # pos = gall.draw.sfdp_layout(g_gtool)
@@ -629,6 +596,35 @@ class GraphClusterMetrics(object):
                    vcmap=c_map)
 
 
+def to_clustering(clusterobj):
+    '''
+    :param clusterobj: a :class:`gct.Clustering`, a :class:`gct.alg.clustering.Result` or anything :class:`gct.Clustering` accepts
+    :rtype: a :class:`gct.Clustering`
+    '''
+    if isinstance(clusterobj, Clustering):
+        return  clusterobj
+    elif isinstance(clusterobj, Result):
+        return  Clustering(clusterobj.clustering(as_dataframe=True))
+    elif isinstance(clusterobj, pd.DataFrame) or isinstance(clusterobj, list) \
+        or isinstance(clusterobj, np.ndarray) or isinstance(clusterobj, str) or isinstance(clusterobj, (dict, Membership)):
+        return Clustering(clusterobj)
+    else:
+        raise Exception("Unsupported " + str(type(clusterobj)))
+
+
+def hard_labels(clusterobj, seed=0):
+    '''
+    one cluster per node, a random one for the overlapped nodes (see :meth:`gct.Clustering.value`)
+
+    :rtype: (nodes, clusters) arrays
+    '''
+    if clusterobj.is_overlap:
+        df = clusterobj.value(True, seed=seed)
+        return df['node'].values, df['cluster'].values
+    m = clusterobj.get_membership()
+    return m.nodes, m.cluster_column()
+
+
 class ClusterComparator(object):
     '''
     metrics for two clustering. e.g. nmi, overlap nmi etc.
@@ -637,53 +633,56 @@ class ClusterComparator(object):
     When calculating a metric that does not support overlapping, the overlapped nodes are removed or retrun None
     '''
 
-    def __init__(self, clusteringobj1, clusteringobj2):
+    def __init__(self, clusteringobj1, clusteringobj2, seed=0):
         '''
         clusteringobj1 will be taken as ground truth if necessary.
         
         :param clusteringobj1:         a :class:`gct.Clustering` object or refer to the *groundtruth* parameter of  :meth:`gct.from_edgelist`
         :param clusteringobj2:         a :class:`gct.Clustering` object or refer to the *groundtruth* parameter of  :meth:`gct.from_edgelist`        
+        :param seed:                   seed for keeping a random cluster of each overlapped node, see :meth:`gct.Clustering.value`
         '''
         
         self.logger = utils.get_logger("{}".format(type(self).__name__))
 
-        def to_obj(clusterobj):
-            if isinstance(clusterobj, Clustering):
-                return  clusterobj
-            elif isinstance(clusterobj, Result):
-                return  Clustering(clusterobj.clustering(as_dataframe=True))
-            elif isinstance(clusterobj, pd.DataFrame) or isinstance(clusterobj, list) \
-                or isinstance(clusterobj, np.ndarray) or isinstance(clusterobj, str) or isinstance(clusterobj, dict):
-                return Clustering(clusterobj)
-            else:
-                raise Exception("Unsupported " + str(type(clusterobj)))
-        
-        self.clusterobj1 = to_obj(clusteringobj1) 
-        self.clusterobj2 = to_obj(clusteringobj2)
+        self.clusterobj1 = to_clustering(clusteringobj1) 
+        self.clusterobj2 = to_clustering(clusteringobj2)
         
         if self.clusterobj1.is_overlap or  self.clusterobj2.is_overlap: 
             self.overlap = True 
         else:
             self.overlap = False  
         
-        def clean():
-            df1 = self.clusterobj1.value(self.clusterobj1.is_overlap)
-            df2 = self.clusterobj2.value(self.clusterobj2.is_overlap)
-            nodes = set(df1['node']).union(set(df2['node']))
-            
-            for n in nodes.difference(set(df1['node'])):
-                df1=df1.append({'node':n, "cluster": -9999}, ignore_index=True)
-            for n in nodes.difference(set(df2['node'])):
-                df2=df2.append({'node':n, "cluster": -9999}, ignore_index=True)
-            self.logger.info ("resulting {} nodes out of {},{}".format(len(nodes), len(df1), len(df2)))
-            df1 = df1[df1['node'].isin(nodes)].set_index('node')
-            df2 = df2[df2['node'].isin(nodes)].set_index('node').loc[df1.index]
-            df1.index.name = 'node'
-            df2.index.name = 'node'
-            return df1, df2 
-
-        clean_clusterobj1, clean_clusterobj2 = clean()
-        self.clean_clusterobj1, self.clean_clusterobj2 =clean_clusterobj1, clean_clusterobj2 
+        # one cluster per node on the union of the nodes, the missing ones in cluster MISSING_CLUSTER
+        (nodes1, clusters1), (nodes2, clusters2) = hard_labels(self.clusterobj1, seed), hard_labels(self.clusterobj2, seed)
+        self.nodes, (ids1, self.codes1), (ids2, self.codes2) = align(nodes1, clusters1, nodes2, clusters2)
+        self._cluster_ids = [ids1, ids2]
+        self.logger.info ("resulting {} nodes out of {},{}".format(len(self.nodes), len(nodes1), len(nodes2)))
+
+    def _clean(self, i, codes):
+        ids = self._cluster_ids[i]
+        if len(ids) and np.issubdtype(ids.dtype, np.number):
+            ids = np.append(ids, MISSING_CLUSTER)
+        else:
+            ids = np.append(ids.astype(object), MISSING_CLUSTER)
+        return pd.DataFrame({'cluster': ids[codes]}, index=pd.Index(self.nodes, name='node'))
+
+    @property
+    def clean_clusterobj1(self):
+        '''
+        dataframe of the cluster of each node of the union, indexed by node
+        '''
+        return utils.set_if_not_exists(self, "_clean_clusterobj1", lambda: self._clean(0, self.codes1))
+
+    @property
+    def clean_clusterobj2(self):
+        return utils.set_if_not_exists(self, "_clean_clusterobj2", lambda: self._clean(1, self.codes2))
+
+    @property
+    def contingency(self):
+        '''
+        contingency table of the aligned clusterings, ground truth by prediction, see :class:`gct.metrics.contingency.Contingency`
+        '''
+        return utils.set_if_not_exists(self, "_contingency", lambda: Contingency(self.codes1, self.codes2))
     
     @property 
     def ground_truth(self):  # assume the first one is ground truth
@@ -707,50 +706,106 @@ class ClusterComparator(object):
     def clean_prediction(self): 
         return self.clean_clusterobj2
     
-    def sklean_nmi(self):
+    def nmi(self, average_method='arithmetic'):
         '''
-        sklearn `normalized_mutual_info_score <https://scikit-learn.org/stable/modules/generated/sklearn.metrics.normalized_mutual_info_score.html>`_
+        normalized mutual information of the clean clusterings
+        
+        :param average_method: normalization by the min, geometric, arithmetic or max mean of the entropies
         '''
-        if False and self.overlap:
-            return None 
-        else:
-            prop_name = "_" + sys._getframe().f_code.co_name 
+        return self.contingency.nmi(average_method)
+
+    def ami(self, average_method='arithmetic'):
+        '''
+        adjusted mutual information of the clean clusterings
+        '''
+        return self.contingency.ami(average_method)
+
+    def ari(self):
+        '''
+        adjusted Rand index of the clean clusterings
+        '''
+        return self.contingency.ari()
+
+    def homogeneity(self):
+        return self.contingency.homogeneity()
 
-            def f():
-                from sklearn.metrics.cluster import normalized_mutual_info_score
-                return normalized_mutual_info_score(self.clean_clusterobj1['cluster'].values, self.clean_clusterobj2['cluster'].values)
+    def completeness(self):
+        return self.contingency.completeness()
 
-            return utils.set_if_not_exists(self, prop_name, f)
+    def v_measure(self, beta=1.0):
+        return self.contingency.v_measure(beta)
+
+    def purity(self):
+        '''
+        fraction of nodes in the most common ground truth cluster of their predicted cluster
+        '''
+        return self.contingency.purity()
+
+    def pair_f1(self):
+        '''
+        precision, recall and F1 of the node pairs clustered together, dict
+        '''
+        return self.contingency.pair_scores()
+
+    def scores(self):
+        '''
+        all the scores of the contingency table, see :meth:`gct.metrics.contingency.Contingency.scores`
+        '''
+        return self.contingency.scores()
+
+    @property
+    def cover_scores(self):
+        '''
+        the two clusterings with their overlaps, as membership matrices on the union of their nodes,
+        see :class:`gct.metrics.overlap.CoverScores`
+        '''
+
+        def f():
+            _, X, Y = cover_matrices(self.clusterobj1.get_membership(), self.clusterobj2.get_membership())
+            return CoverScores(X, Y)
+
+        return utils.set_if_not_exists(self, "_cover_scores", f)
+
+    def overlap_nmi(self):
+        '''
+        overlapping NMIs computed in process, same measures as :meth:`OvpNMI` with allnmi
+
+        :rtype: dict with keys NMImax, NMIsqrt, NMIavg (McDaid et al.) and NMIlfk (Lancichinetti et al.)
+        '''
+        return self.cover_scores.nmi()
+
+    def omega(self):
+        '''
+        Omega index computed in process, the adjusted Rand index for non overlapping clusterings of the same nodes
+        '''
+        return self.cover_scores.omega()
+
+    def best_match_f1(self, weighted=False, mean='average'):
+        '''
+        average F1 of the best matching clusters computed in process, see :meth:`xmeasure` with f1
+
+        :param weighted: weight each cluster by its size
+        :param mean: 'average' or 'harmonic' mean of the averages over each side
+        '''
+        return self.cover_scores.best_match_f1(weighted=weighted, mean=mean)
+
+    def sklean_nmi(self):
+        '''
+        sklearn `normalized_mutual_info_score <https://scikit-learn.org/stable/modules/generated/sklearn.metrics.normalized_mutual_info_score.html>`_
+        '''
+        return self.nmi()
     
     def sklean_ami(self):
         '''
         sklearn `adjusted_mutual_info_score <https://scikit-learn.org/stable/modules/generated/sklearn.metrics.adjusted_mutual_info_score.html>`_
         '''
-        if False and self.overlap:
-            return None 
-        else:
-            prop_name = "_" + sys._getframe().f_code.co_name 
-
-            def f():
-                from sklearn.metrics.cluster import adjusted_mutual_info_score            
-                return adjusted_mutual_info_score(self.clean_clusterobj1['cluster'].values, self.clean_clusterobj2['cluster'].values)
-
-            return utils.set_if_not_exists(self, prop_name, f)
+        return self.ami()
 
     def sklean_ars(self):
         '''
         sklearn `adjusted_rand_score <https://scikit-learn.org/stable/modules/generated/sklearn.metrics.adjusted_rand_score.html>`_
         '''
-        if False and self.overlap:
-            return None 
-        else:
-            prop_name = "_" + sys._getframe().f_code.co_name 
-
-            def f():
-                from sklearn.metrics.cluster import adjusted_rand_score            
-                return adjusted_rand_score(self.clean_clusterobj1['cluster'].values, self.clean_clusterobj2['cluster'].values)
-
-            return utils.set_if_not_exists(self, prop_name, f)
+        return self.ari()
 
     def sklean_completeness(self):
         '''
@@ -758,14 +813,7 @@ class ClusterComparator(object):
         '''        
         if self.overlap:
             print("warning! completeness for overlap graph ")
-        if True:
-            prop_name = "_" + sys._getframe().f_code.co_name 
-
-            def f():
-                from sklearn.metrics.cluster import completeness_score            
-                return completeness_score(self.clean_ground_truth['cluster'].values, self.clean_prediction['cluster'].values)
-
-            return utils.set_if_not_exists(self, prop_name, f)
+        return self.completeness()
 
     def GenConvNMI(self, sync=None, id_remap=None, nmis=None, fnmi=True, risk=None, error=None, fast=None, membership=None, retain_dups=None):
         '''
@@ -824,11 +872,9 @@ class ClusterComparator(object):
             cnl2 = self.clusterobj2.make_cnl_file(filepath=os.path.join(tmp_dir, 'cluster2.cnl'))
             cmd.append(cnl1)
             cmd.append(cnl2)
-            cmd.append("> nmioutput")
             cmd = " ".join(cmd)            
-            self.logger.info("Running " + cmd)
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f: f.write(cmd)            
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash tmpcmd", tmp_dir))
+            self.logger.info("Running " + cmd + " > nmioutput")
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir, stdout="nmioutput"))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -891,11 +937,9 @@ class ClusterComparator(object):
             cnl2 = self.clusterobj2.make_cnl_file(filepath=os.path.join(tmp_dir, 'cluster2.cnl'))
             cmd.append(cnl1)
             cmd.append(cnl2)
-            cmd.append("> ovpnmioutput")
             cmd = " ".join(cmd)            
-            self.logger.info("Running " + cmd)
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f: f.write(cmd)            
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash tmpcmd", tmp_dir))
+            self.logger.info("Running " + cmd + " > ovpnmioutput")
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir, stdout="ovpnmioutput"))
             if status != 0: 
                 self.logger.error(Exception("Run command with error status code {}".format(status)))
                 return {"NMImax":None} 
@@ -967,11 +1011,9 @@ class ClusterComparator(object):
             cnl2 = Clustering(self.clean_prediction.reset_index()).make_cnl_file(filepath=os.path.join(tmp_dir, 'cluster2.cnl'))
             cmd.append(cnl1)
             cmd.append(cnl2)
-            cmd.append("> xmeasurenmioutput")
             cmd = " ".join(cmd)            
-            self.logger.info("Running " + cmd)
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f: f.write(cmd)            
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash tmpcmd", tmp_dir))
+            self.logger.info("Running " + cmd + " > xmeasurenmioutput")
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir, stdout="xmeasurenmioutput"))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
@@ -1088,11 +1130,9 @@ class ClusterComparator(object):
             cnl2 = Clustering(self.clean_prediction.reset_index()).make_cnl_file(filepath=os.path.join(tmp_dir, 'cluster2.cnl'))
             cmd.append(cnl1)
             cmd.append(cnl2)
-            cmd.append("> xmeasureoutput")
             cmd = " ".join(cmd)            
-            self.logger.info("Running " + cmd)
-            with open(os.path.join(tmp_dir, "tmpcmd"), 'wt') as f: f.write(cmd)            
-            timecost, status = utils.timeit(lambda: utils.shell_run_and_wait("bash tmpcmd", tmp_dir))
+            self.logger.info("Running " + cmd + " > xmeasureoutput")
+            timecost, status = utils.timeit(lambda: process.run(cmd, cwd=tmp_dir, stdout="xmeasureoutput"))
             if status != 0: 
                 raise Exception("Run command with error status code {}".format(status))
             
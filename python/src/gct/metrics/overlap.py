@@ -0,0 +1,318 @@
+'''
+Comparison of overlapping clusterings (covers) on their membership matrices.
+
+Each cover is a sparse node x cluster matrix over the union of the nodes of both covers. Cluster sizes and the
+intersection sizes X^T Y are all the overlapping NMIs and the best match F1 need:
+
+- NMI of Lancichinetti, Fortunato and Kertesz (LFK) and the NMI of McDaid, Greene and Hurley (max, sqrt and
+  avg normalizations), as computed by the onmi program of :meth:`gct.metrics.ClusterComparator.OvpNMI`.
+  A pair of clusters that do not intersect can only be the best match of each other when one of them has
+  more than N/e nodes, so only the intersecting pairs and the pairs with such a large cluster are evaluated.
+- the average F1 of the best matches (Yang and Leskovec), as xmeasures -f computes it.
+
+The Omega index (Collins and Dent) compares the number of clusters shared by every pair of nodes. When both
+covers are partitions, the pairs in a common cluster are counted from the cluster sizes and X^T Y. Otherwise
+they are the nonzeros of X X^T and Y Y^T, which are as many as the sum of the squared cluster sizes; they are
+computed for blocks of rows of about OMEGA_BLOCK_PAIRS pairs, so the memory is bounded but the time is not.
+
+A :class:`Cover` keeps the terms of one side (cluster sizes, entropies, number of node pairs by common clusters)
+so that a ground truth compared with many covers computes them once.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import numpy as np
+from scipy.sparse import csr_matrix, triu
+from gct import utils
+from gct.dataset.membership import factorize
+
+# node pairs of X X^T computed at once by the Omega index
+OMEGA_BLOCK_PAIRS = 1 << 22
+
+
+def membership_matrix(membership, nodes):
+    '''
+    :param membership: a :class:`gct.dataset.membership.Membership`
+    :param nodes: sorted nodes of the rows, a superset of the members
+    :rtype: binary csr_matrix of nodes x clusters
+    '''
+    rows = np.searchsorted(nodes, membership.nodes)
+    cols = np.repeat(np.arange(membership.num_cluster), membership.sizes)
+    return csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(nodes), membership.num_cluster))
+
+
+def cover_matrices(membership1, membership2):
+    '''
+    membership matrices of two covers on the union of their nodes
+
+    :rtype: (nodes, X, Y)
+    '''
+    nodes, _ = factorize(np.concatenate([membership1.nodes, membership2.nodes]))
+    return nodes, membership_matrix(membership1, nodes), membership_matrix(membership2, nodes)
+
+
+def h(count, n):
+    '''
+    -p log2(p) of p = count / n, 0 for p = 0
+    '''
+    p = np.asarray(count, dtype=np.float64) / n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(p > 0, -p * np.log2(np.where(p > 0, p, 1)), 0.0)
+
+
+def cluster_entropy(sizes, n):
+    return h(sizes, n) + h(n - sizes, n)
+
+
+def num_pairs(sizes):
+    sizes = np.asarray(sizes, dtype=np.float64)
+    return np.sum(sizes * (sizes - 1) / 2)
+
+
+def row_blocks(weights, budget):
+    '''
+    consecutive row ranges whose weights sum to about budget, at least one row each
+
+    :rtype: list of (start, end)
+    '''
+    cum = np.cumsum(weights)
+    bounds = [0]
+    while bounds[-1] < len(cum):
+        start = bounds[-1]
+        end = int(np.searchsorted(cum, (cum[start - 1] if start else 0) + budget, side='right'))
+        bounds.append(min(len(cum), max(start + 1, end)))
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+class Cover(object):
+    '''
+    a membership matrix with the terms that do not depend on the cover it is compared with, computed once
+    when it is compared with many covers, see :class:`gct.metrics.batch_comparator.BatchComparator`
+
+    :param M: membership matrix, nodes x clusters
+    '''
+
+    def __init__(self, M):
+        self.matrix = csr_matrix(M)
+        self.sizes = np.asarray(self.matrix.sum(axis=0)).ravel()
+
+    @property
+    def num_node(self):
+        return self.matrix.shape[0]
+
+    def entropies(self, n):
+        '''
+        H(X_k) of each cluster among n nodes
+        '''
+        return utils.set_if_not_exists(self, "_entropies_{}".format(n), lambda: cluster_entropy(self.sizes, n))
+
+    @property
+    def is_partition(self):
+        '''
+        True if every node is in at most one cluster
+        '''
+        indptr = self.matrix.indptr
+        return utils.set_if_not_exists(self, "_is_partition", lambda: bool(np.all(np.diff(indptr) <= 1)))
+
+    @property
+    def pair_weights(self):
+        '''
+        sum of the sizes of the clusters of each node, a bound of the nonzeros of its row of X X^T
+        '''
+        return self.matrix @ self.sizes
+
+    def co_membership(self, start, end):
+        '''
+        the pairs of nodes in a common cluster whose first node is in rows [start, end), keyed by
+        (row << 32) | col with row < col, and their number of common clusters, sorted by key
+        '''
+        C = (self.matrix[start:end] @ self.matrix.T).tocoo()
+        rows = C.row.astype(np.int64) + start
+        upper = C.col > rows
+        keys = (rows[upper] << 32) | C.col[upper].astype(np.int64)
+        order = np.argsort(keys)
+        return keys[order], np.rint(C.data[upper][order]).astype(np.int64)
+
+    @property
+    def pair_counts(self):
+        '''
+        number of node pairs sharing t clusters at position t >= 1, position 0 is left to the caller
+        '''
+
+        def f():
+            if self.is_partition:
+                return np.array([0.0, num_pairs(self.sizes)])
+            counts = np.zeros(2)
+            for start, end in row_blocks(self.pair_weights, OMEGA_BLOCK_PAIRS):
+                c = np.bincount(self.co_membership(start, end)[1])
+                if len(c) > len(counts):
+                    counts = np.concatenate([counts, np.zeros(len(c) - len(counts))])
+                counts[:len(c)] += c
+            counts[0] = 0
+            return counts
+
+        return utils.set_if_not_exists(self, "_pair_counts", f)
+
+    def extend(self, num_node):
+        '''
+        the same cover with empty rows appended up to num_node rows, sharing the terms already computed
+        '''
+        if num_node == self.num_node: return self
+        M = self.matrix
+        indptr = np.concatenate([M.indptr, np.full(num_node - M.shape[0], M.indptr[-1])])
+        ret = Cover(csr_matrix((M.data, M.indices, indptr), shape=(num_node, M.shape[1])))
+        for u in ["_is_partition", "_pair_counts"]:
+            if hasattr(self, u): setattr(ret, u, getattr(self, u))
+        return ret
+
+
+class CoverScores(object):
+    '''
+    :param X: membership matrix of the first cover, e.g. the ground truth, or a :class:`Cover`
+    :param Y: membership matrix of the second cover, with the same rows, or a :class:`Cover`
+    '''
+
+    def __init__(self, X, Y):
+        self.cover_x = X if isinstance(X, Cover) else Cover(X)
+        self.cover_y = Y if isinstance(Y, Cover) else Cover(Y)
+        self.X, self.Y = self.cover_x.matrix, self.cover_y.matrix
+        self.n = self.X.shape[0]
+        self.size_x, self.size_y = self.cover_x.sizes, self.cover_y.sizes
+
+    @property
+    def intersections(self):
+        '''
+        nonzero |X_k & Y_l| as (k, l, size) arrays
+        '''
+
+        def f():
+            D = (self.X.T @ self.Y).tocoo()
+            return D.row.astype(np.int64), D.col.astype(np.int64), D.data
+
+        return utils.set_if_not_exists(self, "_intersections", f)
+
+    def _candidate_pairs(self):
+        k, l, d = self.intersections
+        # with a cluster of more than n/e nodes even a disjoint pair may match
+        big_x = np.flatnonzero(self.size_x * np.e > self.n * 0.99)
+        big_y = np.flatnonzero(self.size_y * np.e > self.n * 0.99)
+        if len(big_x) or len(big_y):
+            ks = [k, np.repeat(big_x, len(self.size_y)), np.tile(np.arange(len(self.size_x)), len(big_y))]
+            ls = [l, np.tile(np.arange(len(self.size_y)), len(big_x)), np.repeat(big_y, len(self.size_x))]
+            k, l = np.concatenate(ks), np.concatenate(ls)
+            # intersection sizes of the pairs, zero for the disjoint ones
+            num_y = max(len(self.size_y), 1)
+            ik, il, isize = self.intersections
+            keys = ik * num_y + il
+            order = np.argsort(keys)
+            keys, isize = keys[order], isize[order]
+            query = k * num_y + l
+            pos = np.minimum(np.searchsorted(keys, query), max(len(keys) - 1, 0))
+            d = np.where(keys[pos] == query, isize[pos], 0.0) if len(keys) else np.zeros(len(query))
+        return k, l, d
+
+    @property
+    def conditional_entropies(self):
+        '''
+        H(X_k|Y) and H(Y_l|X) of each cluster, under the LFK constraint, and H(X_k), H(Y_l)
+        '''
+
+        def f():
+            n = self.n
+            hx, hy = self.cover_x.entropies(n), self.cover_y.entropies(n)
+            k, l, d = self._candidate_pairs()
+            nx, ny = self.size_x[k], self.size_y[l]
+            a, b, c = n - nx - ny + d, ny - d, nx - d
+            ha, hb, hc, hd = h(a, n), h(b, n), h(c, n), h(d, n)
+            joint = ha + hb + hc + hd
+            ok = ha + hd > hb + hc
+            hx_y, hy_x = hx.copy(), hy.copy()
+            np.minimum.at(hx_y, k[ok], (joint - hy[l])[ok])
+            np.minimum.at(hy_x, l[ok], (joint - hx[k])[ok])
+            return hx_y, hy_x, hx, hy
+
+        return utils.set_if_not_exists(self, "_conditional_entropies", f)
+
+    def nmi_lfk(self):
+        '''
+        overlapping NMI of Lancichinetti, Fortunato and Kertesz
+        '''
+        hx_y, hy_x, hx, hy = self.conditional_entropies
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nx = np.mean(np.where(hx > 0, hx_y / hx, 0.0)) if len(hx) else 0.0
+            ny = np.mean(np.where(hy > 0, hy_x / hy, 0.0)) if len(hy) else 0.0
+        return float(1 - (nx + ny) / 2)
+
+    def nmi(self):
+        '''
+        overlapping NMI of McDaid, Greene and Hurley with the max, sqrt and avg normalizations, and the LFK one
+
+        :rtype: dict with keys NMImax, NMIsqrt, NMIavg, NMIlfk
+        '''
+        hx_y, hy_x, hx, hy = self.conditional_entropies
+        HX, HY = hx.sum(), hy.sum()
+        mi = ((HX - hx_y.sum()) + (HY - hy_x.sum())) / 2
+
+        def norm(u):
+            return float(mi / u) if u > 0 else 0.0
+
+        return {'NMImax': norm(max(HX, HY)), 'NMIsqrt': norm(np.sqrt(HX * HY)), 'NMIavg': norm((HX + HY) / 2),
+                'NMIlfk': self.nmi_lfk()}
+
+    def best_match_f1(self, weighted=False, mean='average'):
+        '''
+        F1 of each cluster with its best match in the other cover, averaged over the clusters of each side
+        (weighted by the cluster sizes if weighted), and the two averages combined by their arithmetic ('average')
+        or harmonic ('harmonic') mean.
+        '''
+        k, l, d = self.intersections
+        f1 = 2 * d / (self.size_x[k] + self.size_y[l])
+        best_x, best_y = np.zeros(len(self.size_x)), np.zeros(len(self.size_y))
+        np.maximum.at(best_x, k, f1)
+        np.maximum.at(best_y, l, f1)
+        if weighted:
+            fx = np.sum(best_x * self.size_x) / self.size_x.sum() if self.size_x.sum() else 0.0
+            fy = np.sum(best_y * self.size_y) / self.size_y.sum() if self.size_y.sum() else 0.0
+        else:
+            fx = best_x.mean() if len(best_x) else 0.0
+            fy = best_y.mean() if len(best_y) else 0.0
+        if mean == 'average':
+            return float((fx + fy) / 2)
+        elif mean == 'harmonic':
+            return float(2 * fx * fy / (fx + fy)) if fx + fy else 0.0
+        else:
+            raise ValueError("mean must be average or harmonic")
+
+    def omega(self):
+        '''
+        Omega index. It is the adjusted Rand index when both covers are partitions of the same nodes.
+        '''
+        n = self.n
+        total = n * (n - 1) / 2.0
+        if total == 0: return 1.0
+
+        count_x, count_y = self.cover_x.pair_counts.copy(), self.cover_y.pair_counts.copy()
+        in_x, in_y = count_x.sum(), count_y.sum()
+        if self.cover_x.is_partition and self.cover_y.is_partition:
+            # pairs in a common cluster on both sides share one cluster on both sides
+            both = agree = num_pairs(self.intersections[2])
+        else:
+            both = agree = 0
+            weights = self.cover_x.pair_weights + self.cover_y.pair_weights
+            for start, end in row_blocks(weights, OMEGA_BLOCK_PAIRS):
+                kx, tx = self.cover_x.co_membership(start, end)
+                ky, ty = self.cover_y.co_membership(start, end)
+                pos = np.minimum(np.searchsorted(ky, kx), max(len(ky) - 1, 0))
+                common = (ky[pos] == kx) if len(ky) else np.zeros(len(kx), dtype=bool)
+                both += common.sum()
+                agree += np.sum(tx[common] == ty[pos[common]])
+        # pairs in no common cluster on both sides
+        agree += total - (in_x + in_y - both)
+        observed = agree / total
+
+        count_x[0], count_y[0] = total - in_x, total - in_y
+        j = min(len(count_x), len(count_y))
+        expected = np.sum(count_x[:j] * count_y[:j]) / (total * total)
+        if expected == 1: return 1.0
+        return float((observed - expected) / (1 - expected))
@@ -0,0 +1,144 @@
+'''
+Execution of external programs.
+
+Every program runs in its own working directory and environment (nothing is changed in the calling
+process), so wrappers can be run from several threads at once. A program is started in a new process
+group, which is killed as a whole when the wall-clock timeout is reached or the caller is interrupted.
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import shlex
+import signal
+import threading
+import contextlib
+import subprocess
+import concurrent.futures
+from gct.exception import TimeoutException
+
+# seconds between SIGTERM and SIGKILL of a process group
+KILL_GRACE_PERIOD = 5
+
+# timeout (in seconds) of the programs run without an explicit one. None for no limit.
+DEFAULT_TIMEOUT = None
+
+_local = threading.local()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_default_timeout():
+    return getattr(_local, 'timeout', DEFAULT_TIMEOUT)
+
+
+@contextlib.contextmanager
+def timeout_limit(seconds):
+    '''
+    set the default timeout of the programs run by the current thread, e.g.
+
+        with process.timeout_limit(3600):
+            alg.run(data)
+    '''
+    old = get_default_timeout()
+    _local.timeout = seconds
+    try:
+        yield
+    finally:
+        _local.timeout = old
+
+
+def to_argv(command):
+    '''
+    :param command: a list of arguments, or a command line which is split like a shell does (without redirection or pipes)
+    :rtype: list of str
+    '''
+    if isinstance(command, str):
+        return shlex.split(command)
+    return [str(u) for u in command]
+
+
+def _open(f, cwd, mode):
+    if f is None or not isinstance(f, (str, bytes, os.PathLike)):
+        return f, False
+    if cwd is not None:
+        f = os.path.join(cwd, f)
+    return open(f, mode), True
+
+
+def kill_group(proc, grace=KILL_GRACE_PERIOD):
+    '''
+    terminate the process group of proc, and kill it if it is still alive after the grace period
+    '''
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+    try:
+        proc.wait(grace)
+    except subprocess.TimeoutExpired:
+        pass
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+    proc.wait()
+
+
+def run(command, cwd=None, env=None, stdin=None, stdout=None, stderr=None, timeout=None, inherit_env=True):
+    '''
+    run a program and wait for it.
+
+    :param command: list of arguments, or a command line (see :func:`to_argv`)
+    :param cwd: working directory of the program
+    :param env: environment variables of the program, added to the ones of this process if inherit_env
+    :param stdin: file to read standard input from. A path (relative to cwd), a file object or None to inherit.
+    :param stdout: file to write standard output to. A path (relative to cwd), a file object or None to inherit.
+    :param stderr: like stdout. subprocess.STDOUT to merge it into stdout.
+    :param timeout: wall-clock limit in seconds, the default one (see :func:`timeout_limit`) if None
+    :rtype: return code of the program
+    '''
+    argv = to_argv(command)
+    if timeout is None: timeout = get_default_timeout()
+    if env is not None:
+        env = {str(u): str(v) for u, v in env.items()}
+        if inherit_env: env = dict(os.environ, **env)
+
+    opened = []
+    try:
+        files = []
+        for f, mode in [(stdin, 'rb'), (stdout, 'wb'), (stderr, 'wb')]:
+            f, is_opened = _open(f, cwd, mode)
+            if is_opened: opened.append(f)
+            files.append(f)
+        proc = subprocess.Popen(argv, cwd=cwd, env=env, stdin=files[0], stdout=files[1], stderr=files[2],
+                                start_new_session=True)
+        try:
+            return proc.wait(timeout)
+        except subprocess.TimeoutExpired:
+            kill_group(proc)
+            raise TimeoutException(argv, timeout)
+        except BaseException:
+            kill_group(proc)
+            raise
+    finally:
+        for f in opened: f.close()
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix='gct-process')
+        return _executor
+
+
+def run_async(command, **kwargs):
+    '''
+    start :func:`run` in a background thread. The default timeout of the calling thread applies.
+
+    :rtype: concurrent.futures.Future of the return code. Use asyncio.wrap_future to await it.
+    '''
+    if kwargs.get('timeout') is None: kwargs['timeout'] = get_default_timeout()
+    return get_executor().submit(run, command, **kwargs)
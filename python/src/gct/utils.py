@@ -33,6 +33,17 @@ def remove_if_file_exit(fname, is_dir=False):
             os.remove(fname)
 
 
+def parse_size(s):
+    '''
+    parse a size in bytes with an optional K, M, G or T suffix, e.g. '50G'
+    '''
+    s = str(s).strip().upper().rstrip('B')
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+    if s and s[-1] in units:
+        return int(float(s[:-1]) * units[s[-1]])
+    return int(float(s))
+
+
 def set_if_not_exists(self, name, fun):
     if hasattr(self, name):
         return getattr(self, name)
@@ -87,11 +98,12 @@ def get_logger(name):
 
 class TempDir():
 
-    def __init__(self):
+    def __init__(self, dir=None):
         self.dirpath = None  
+        self.dir = dir 
         
     def __enter__(self):
-        self.dirpath = tempfile.mkdtemp()
+        self.dirpath = tempfile.mkdtemp(dir=self.dir)
         return self.dirpath
 
     def __exit__(self, type, value, traceback):
@@ -99,19 +111,12 @@ class TempDir():
             shutil.rmtree(self.dirpath)
 
         
-def shell_run_and_wait(command, working_dir=None, env=None):
-    curr_dir = os.getcwd()
-    if working_dir is not None:
-        os.chdir(working_dir)
-    command = command.split(" ")
-    import subprocess
-    
-    # process = subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
-    process = subprocess.Popen(command, env=env)
-    process.wait()
-    if working_dir is not None:
-        os.chdir(curr_dir)
-    return process.returncode
+def shell_run_and_wait(command, working_dir=None, env=None, **kwargs):
+    '''
+    run a command in working_dir, see :func:`gct.process.run` for the other arguments.
+    '''
+    from gct import process
+    return process.run(command, cwd=working_dir, env=env, **kwargs)
 
 
 def timeit(fun):
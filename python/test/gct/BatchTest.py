@@ -0,0 +1,50 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import json
+from gct import batch, config, utils
+from gct.dataset import convert
+from gct.alg import has_clustering_result
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.name = "BatchTest"
+        edges = [[0, 1], [1, 2], [0, 2], [3, 4], [4, 5], [3, 5], [2, 3]]
+        convert.from_edgelist(self.name, edges, directed=False, overide=True)
+        utils.remove_if_file_exit(config.get_batch_path(self.name), is_dir=True)
+
+    def testMakeJobs(self):
+        jobs = batch.make_jobs(['a', {'b': [{'k': 1}, {'k': 2}], 'c': {'k': 1}}], ['d1', 'd2'], seeds=[1, 2])
+        self.assertEqual(16, len(jobs))
+        self.assertEqual(16, len(set(u.runname for u in jobs)) * 2)
+        self.assertEqual('a_seed1', jobs[0].runname)
+        self.assertEqual(batch.make_runname('c', {'k': 1}, 2), jobs[7].runname)
+
+    def testRun(self):
+        # n_clusters=0 is rejected by sklearn
+        jobs = batch.make_jobs([{'sklearn_SpectralClustering': [{'n_clusters': 2}, {'n_clusters': 0}]}], [self.name], seeds=[1])
+        df = batch.run(self.name, jobs, threads_per_run=2, num_cpu=4)
+        self.assertEqual(['done', 'failed'], df['status'].tolist())
+        self.assertTrue(has_clustering_result(self.name, jobs[0].runname))
+        self.assertIn('n_clusters', df['error'][1])
+        with open(os.path.join(config.get_batch_path(self.name), batch.job_key(jobs[1]) + ".failed")) as f:
+            failure = json.load(f)
+        self.assertIn('n_clusters', failure['traceback'])
+        self.assertIn('start ' + batch.job_key(jobs[1]), failure['stderr'])
+        self.assertTrue(utils.file_exists(config.get_data_file_path(self.name, 'node_map.npy')))
+
+        df = batch.run(self.name, jobs)
+        self.assertEqual(['skipped', 'failed'], df['status'].tolist())
+        self.assertEqual(['done', 'failed'], batch.status(self.name, jobs)['status'].tolist())
+        df = batch.run(self.name, jobs, retry_failed=True)
+        self.assertEqual(['skipped', 'failed'], df['status'].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
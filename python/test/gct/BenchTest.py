@@ -0,0 +1,60 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from gct import bench, utils
+from gct.dataset import convert
+
+
+class Test(unittest.TestCase):
+
+    def testSizes(self):
+        self.assertEqual([1000, 2000, 4000, 8000], bench.graph_sizes(1000, 10000))
+        self.assertEqual([100, 1000, 10000], bench.graph_sizes(100, 10000, factor=10))
+        names = set([bench.graph_name('LFR', 1000, 1), bench.graph_name('LFR', 1000, 1, avg_degree=10),
+                     bench.graph_name('LFR', 1000, 1, mu=0.5), bench.graph_name('Erdos-Renyi', 1000, 1)])
+        self.assertEqual(4, len(names))
+        self.assertEqual('bench_LFR_1000_k20_mu0p3_s1', bench.graph_name('LFR', 1000, 1))
+
+    def testFit(self):
+        n = np.array([1e3, 1e4, 1e5, 1e6])
+        df = pd.DataFrame({'tag': 'v1', 'family': 'LFR', 'algname': ['a'] * 4 + ['b'] * 4, 'status': 'done',
+                           'n_edge': np.concatenate([n, n]), 'wall_time': np.concatenate([2e-3 * n, 1e-6 * n ** 1.5])})
+        fit = bench.fit_scaling(df).set_index('algname')
+        self.assertAlmostEqual(1.0, fit.loc['a', 'exponent'])
+        self.assertAlmostEqual(1.5, fit.loc['b', 'exponent'])
+        self.assertAlmostEqual(2e-3, fit.loc['a', 'c'])
+        self.assertAlmostEqual(1.0, fit.loc['b', 'r2'])
+
+    def testMeasure(self):
+        name = "BenchTest"
+        edges = [[0, 1], [1, 2], [0, 2], [3, 4], [4, 5], [3, 5], [2, 3]]
+        convert.from_edgelist(name, edges, directed=False, overide=True)
+        row = bench.run_measure('sklearn_SpectralClustering', name, seed=1, params={'n_clusters': 2})
+        self.assertEqual('done', row['status'])
+        self.assertEqual(6, row['n_node'])
+        self.assertEqual(2, row['num_cluster'])
+        self.assertGreater(row['peak_rss_mb'], 0)
+        self.assertGreater(row['output_bytes'], 0)
+        self.assertGreaterEqual(row['wall_time'], row['alg_time'])
+        self.assertGreaterEqual(row['wall_time'], row['convert_time'])
+        # n_clusters=0 is rejected by sklearn
+        row2 = bench.run_measure('sklearn_SpectralClustering', name, seed=1, params={'n_clusters': 0})
+        self.assertEqual('failed', row2['status'])
+        self.assertIn('n_clusters', row2['error'])
+
+        with utils.TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, "bench.parq")
+            bench.append_rows(path, [dict(row, tag='v1')])
+            df = bench.append_rows(path, [dict(row2, tag='v1')])
+            self.assertEqual(['done', 'failed'], bench.read_table(path)['status'].tolist())
+            self.assertEqual(bench.COLUMNS, list(df.columns))
+
+
+if __name__ == "__main__":
+    unittest.main()
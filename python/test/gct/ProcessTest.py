@@ -0,0 +1,77 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import time
+import threading
+from gct import utils, process
+from gct.exception import TimeoutException
+
+
+def is_running(pid):
+    try:
+        with open("/proc/{}/stat".format(pid)) as f:
+            return f.read().split(")")[-1].split()[0] != 'Z'
+    except IOError:
+        return False
+
+
+class Test(unittest.TestCase):
+
+    def testRun(self):
+        with utils.TempDir() as tmp_dir:
+            cwd = os.getcwd()
+            self.assertEqual(0, process.run(["sh", "-c", "pwd; echo $GCT_X; echo err >&2"], cwd=tmp_dir,
+                                            env={'GCT_X': 'abc'}, stdout="out.txt", stderr="err.txt"))
+            self.assertEqual(cwd, os.getcwd())
+            with open(os.path.join(tmp_dir, "out.txt")) as f:
+                self.assertEqual([os.path.realpath(tmp_dir), "abc"], f.read().split())
+            with open(os.path.join(tmp_dir, "err.txt")) as f:
+                self.assertEqual("err", f.read().strip())
+            # env is added to the one of this process
+            self.assertEqual(0, process.run("sh -c 'test -n \"$PATH\"'", env={'GCT_X': '1'}))
+            self.assertEqual(3, process.run(["sh", "-c", "exit 3"]))
+            self.assertEqual(0, process.run(["cat"], cwd=tmp_dir, stdin="out.txt", stdout="copy.txt"))
+            with open(os.path.join(tmp_dir, "copy.txt")) as f:
+                self.assertEqual("abc", f.read().split()[1])
+
+    def testTimeout(self):
+        with utils.TempDir() as tmp_dir:
+            t0 = time.time()
+            # the child of the shell is killed too
+            with self.assertRaises(TimeoutException):
+                process.run(["sh", "-c", "sleep 30 & echo $! > pid; wait"], cwd=tmp_dir, timeout=0.5)
+            self.assertLess(time.time() - t0, 10)
+            with open(os.path.join(tmp_dir, "pid")) as f:
+                pid = int(f.read())
+            time.sleep(0.1)
+            self.assertFalse(is_running(pid))
+
+            with process.timeout_limit(0.5):
+                self.assertRaises(TimeoutException, process.run, ["sleep", "30"])
+                future = process.run_async(["sleep", "30"])
+            self.assertIsNone(process.get_default_timeout())
+            self.assertRaises(TimeoutException, future.result)
+
+    def testThreads(self):
+        with utils.TempDir() as tmp_dir:
+            dirs = [os.path.join(tmp_dir, str(i)) for i in range(8)]
+            for u in dirs: os.makedirs(u)
+            futures = [process.run_async(["sh", "-c", "sleep 0.2; pwd"], cwd=u, stdout="out.txt") for u in dirs]
+            self.assertEqual([0] * len(dirs), [u.result() for u in futures])
+            for u in dirs:
+                with open(os.path.join(u, "out.txt")) as f:
+                    self.assertEqual(os.path.realpath(u), f.read().strip())
+
+            results = []
+            threads = [threading.Thread(target=lambda u=u: results.append(utils.shell_run_and_wait("sh -c pwd", u, stdout="pwd.txt"))) for u in dirs]
+            for t in threads: t.start()
+            for t in threads: t.join()
+            self.assertEqual([0] * len(dirs), results)
+
+
+if __name__ == "__main__":
+    unittest.main()
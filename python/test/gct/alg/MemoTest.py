@@ -0,0 +1,93 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import numpy as np
+from gct import config
+from gct.alg import memo, run_alg, load_clustering_result, function
+from gct.alg.clustering import save_result
+from gct.dataset import convert
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.name = "MemoTest"
+        self.edges = [[0, 1], [1, 2], [0, 2], [3, 4], [4, 5], [3, 5], [2, 3]]
+        self.data = convert.from_edgelist(self.name, self.edges, directed=False, overide=True)
+        memo.clear()
+
+    def testParams(self):
+        p1 = memo.normalize_params(function.sklearn_AffinityPropagation, (), {'damping': np.float64(0.5)})
+        p2 = memo.normalize_params(function.sklearn_AffinityPropagation, (0.5,), {})
+        self.assertEqual(p1, p2)
+        self.assertEqual({'damping': 0.5, 'max_iter': None, 'convergence': None, 'verbose': None, 'seed': None}, p1)
+        self.assertEqual({'n_clusters': 2, 'seed': 1},
+                         memo.normalize_params(function.sklearn_SpectralClustering, (), {'seed': 1, 'n_clusters': 2}))
+
+    def testMemoized(self):
+        r1 = run_alg("run1", self.data, "sklearn_SpectralClustering", n_clusters=2, seed=1)
+        self.assertEqual(1, len(memo.list_entries()))
+        r2 = run_alg("run2", self.data, "sklearn_SpectralClustering", n_clusters=2, seed=1)
+        self.assertEqual("run2", r2.runname)
+        self.assertEqual(r1.timecost, r2.timecost)
+        self.assertEqual(r1.clustering().get_membership().to_dict(), r2.clustering().get_membership().to_dict())
+        self.assertEqual("run2", load_clustering_result(self.name, "run2").runname)
+
+        # another seed, forced or a changed graph runs again
+        run_alg("run3", self.data, "sklearn_SpectralClustering", n_clusters=2, seed=2)
+        self.assertEqual(2, len(memo.list_entries()))
+        r4 = run_alg("run1", self.data, "sklearn_SpectralClustering", force=True, n_clusters=2, seed=1)
+        self.assertNotEqual(r1.timecost, r4.timecost)
+        self.assertEqual(2, len(memo.list_entries()))
+        data = convert.from_edgelist(self.name, self.edges + [[5, 6]], directed=False, overide=True)
+        run_alg("run1", data, "sklearn_SpectralClustering", n_clusters=2, seed=1)
+        self.assertEqual(3, len(memo.list_entries()))
+
+        self.assertEqual(1, len(memo.evict(max_entries=2)))
+        self.assertEqual(2, len(memo.list_entries()))
+        self.assertTrue(os.path.isdir(config.RESULT_CACHE_PATH))
+
+    def testUnseeded(self):
+        # a run without a seed is random, it is cached only when asked
+        r1 = run_alg("run1", self.data, "sklearn_SpectralClustering", n_clusters=2)
+        self.assertEqual(0, len(memo.list_entries()))
+        r2 = run_alg("run2", self.data, "sklearn_SpectralClustering", n_clusters=2, seed=None)
+        self.assertNotEqual(r1.timecost, r2.timecost)
+        self.assertEqual(0, len(memo.list_entries()))
+        r3 = run_alg("run3", self.data, "sklearn_SpectralClustering", memoize=True, n_clusters=2)
+        self.assertEqual(1, len(memo.list_entries()))
+        r4 = run_alg("run4", self.data, "sklearn_SpectralClustering", memoize=True, n_clusters=2)
+        self.assertEqual(r3.timecost, r4.timecost)
+        run_alg("run5", self.data, "sklearn_SpectralClustering", memoize=False, n_clusters=2, seed=1)
+        self.assertEqual(1, len(memo.list_entries()))
+
+
+    def testDeterministic(self):
+        self.assertFalse(memo.is_random(function.scan_pScan, 'scan_pScan', {}))
+        self.assertFalse(memo.is_random(function.mcl_MCL, 'mcl_MCL', {'I': 2}))
+        self.assertTrue(memo.is_random(function.sklearn_SpectralClustering, 'sklearn_SpectralClustering', {}))
+        self.assertTrue(memo.is_random(function.oslom_Infomap, 'oslom_Infomap', {'seed': None}))
+        self.assertFalse(memo.is_random(function.oslom_Infomap, 'oslom_Infomap', {'seed': 1}))
+
+        calls = []
+
+        def deterministic(name, graph, **kwargs):
+            calls.append(name)
+            save_result({'runname': name, 'dataname': graph.name, 'params': kwargs, 'meta': {'lib': 'test'},
+                         'timecost': 1.5, 'clusters': {1: [0, 1, 2], 2: [3, 4, 5]}})
+            return load_clustering_result(graph.name, name)
+
+        fun = memo.memoized(deterministic, 'test_deterministic')
+        fun("run1", self.data, k=1)
+        r2 = fun("run2", self.data, k=1)
+        self.assertEqual(["run1"], calls)
+        self.assertEqual("run2", r2.runname)
+        self.assertEqual(1, len(memo.list_entries()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+'''
+Parse time and file size of the binary result format against the former result.txt JSON.
+
+    python ResultStoreBenchmark.py [num_nodes] [num_levels]
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import sys
+import json
+import numpy as np
+from gct import utils
+from gct.alg import result_store
+from gct.alg.clustering import labels_to_clusters
+
+
+def make_result(num_nodes, num_levels):
+    rng = np.random.RandomState(123)
+    nodes = np.arange(num_nodes)
+    clusters = {}
+    for level in range(num_levels):
+        num_cluster = max(1, num_nodes // (10 * 4 ** level))
+        clusters[level] = labels_to_clusters(nodes, rng.randint(0, num_cluster, num_nodes))
+    return {'runname': 'bench', 'dataname': 'bench', 'params': {}, 'meta': {}, 'timecost': 0,
+            'multilevel': True, 'max_level': num_levels - 1, 'clusters': clusters}
+
+
+def size_of(path, names):
+    return sum(os.path.getsize(os.path.join(path, u)) for u in names)
+
+
+def bench(num_nodes, num_levels):
+    result = make_result(num_nodes, num_levels)
+    with utils.TempDir() as tmp_dir:
+        old_dir, new_dir = os.path.join(tmp_dir, 'old'), os.path.join(tmp_dir, 'new')
+        os.makedirs(old_dir); os.makedirs(new_dir)
+
+        def save_json():
+            with open(os.path.join(old_dir, 'result.txt'), 'wt') as f:
+                json.dump(result, f)
+
+        def load_json():
+            with open(os.path.join(old_dir, 'result.txt'), 'rt') as f:
+                return json.load(f)
+
+        t_save_old, _ = utils.timeit(save_json)
+        t_save_new, _ = utils.timeit(lambda: result_store.write(new_dir, result))
+        t_load_old, _ = utils.timeit(load_json)
+        t_load_one, _ = utils.timeit(lambda: result_store.read(new_dir)['clusters'][num_levels - 1])
+        t_load_all, _ = utils.timeit(lambda: [u for u in result_store.read(new_dir)['clusters'].values()])
+        assert result_store.read(new_dir)['clusters'][0].to_dict() == {k: sorted(v) for k, v in result['clusters'][0].items()}
+        size_old = size_of(old_dir, os.listdir(old_dir))
+        size_new = size_of(new_dir, os.listdir(new_dir))
+
+    print("nodes={:,} levels={}".format(num_nodes, num_levels))
+    print("  size       json: {:10,} bytes  npz: {:10,} bytes  ({:.1f}x smaller)".format(size_old, size_new, size_old / size_new))
+    print("  save       json: {:8.2f}s  npz: {:8.2f}s".format(t_save_old, t_save_new))
+    print("  load all   json: {:8.2f}s  npz: {:8.2f}s  ({:.1f}x)".format(t_load_old, t_load_all, t_load_old / t_load_all))
+    print("  load level json: {:8.2f}s  npz: {:8.2f}s  ({:.1f}x)".format(t_load_old, t_load_one, t_load_old / t_load_one))
+
+
+if __name__ == "__main__":
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    num_levels = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    bench(num_nodes, num_levels)
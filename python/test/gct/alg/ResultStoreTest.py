@@ -0,0 +1,107 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import sys
+import json
+import time
+from gct import config, utils
+from gct.dataset import convert
+from gct.alg import result_store
+from gct.alg.clustering import save_result, load_result, has_result, Result
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        self.name = "ResultStoreTest"
+        convert.from_edgelist(self.name, [[1, 2], [2, 3], [3, 4], [4, 5], [5, 6]], directed=False, overide=True)
+
+    def result(self, runname, clusters, **kwargs):
+        d = {'runname': runname, 'dataname': self.name, 'params': {'seed': 1}, 'meta': {'lib': 'test'},
+             'timecost': 1.5, 'clusters': clusters}
+        d.update(kwargs)
+        return d
+
+    def testSingle(self):
+        runname = sys._getframe().f_code.co_name
+        save_result(self.result(runname, {1: [1, 2, 3], 2: [3, 4]}))
+        path = config.get_result_file_path(self.name, runname)
+        self.assertTrue(utils.file_exists(os.path.join(path, 'result.json')))
+        self.assertTrue(utils.file_exists(os.path.join(path, 'clusters.npz')))
+        self.assertTrue(has_result(self.name, runname))
+
+        result = load_result(self.name, runname)
+        self.assertEqual(runname, result.runname)
+        self.assertEqual({'seed': 1}, result.params)
+        self.assertEqual(1.5, result.timecost)
+        self.assertEqual({1: [1, 2, 3], 2: [3, 4], -9999: [5, 6]}, result['clusters'].to_dict())
+        c = result.clustering()
+        self.assertEqual(3, c.num_cluster)
+        self.assertTrue(c.is_overlap)
+        self.assertEqual([[5, -9999], [6, -9999], [1, 1], [2, 1], [3, 1], [3, 2], [4, 2]],
+                         result.clustering(as_dataframe=True).values.tolist())
+
+        # saving a loaded result again
+        Result(result).save()
+        self.assertEqual(3, load_result(self.name, runname).clustering().num_cluster)
+
+    def testMultilevel(self):
+        runname = sys._getframe().f_code.co_name
+        clusters = {0: {1: [1, 2], 2: [3, 4], 3: [5, 6]}, 1: {1: [1, 2, 3, 4, 5, 6]}}
+        save_result(self.result(runname, clusters, multilevel=True, max_level=1))
+        path = config.get_result_file_path(self.name, runname)
+        self.assertEqual(['clusters_0.npz', 'clusters_1.npz', 'result.json'], sorted(os.listdir(path)))
+
+        result = load_result(self.name, runname)
+        self.assertEqual([], list(result['clusters'].loaded))
+        self.assertEqual(1, result.clustering().num_cluster)
+        self.assertEqual([1], list(result['clusters'].loaded))
+        self.assertEqual(3, result.clustering(key=0).num_cluster)
+        self.assertEqual([0, 1], sorted(result.clustering_keys))
+
+    def testMemoized(self):
+        runname = sys._getframe().f_code.co_name
+        save_result(self.result(runname, {1: [1, 2, 3]}))
+        result = load_result(self.name, runname)
+        self.assertTrue(utils.file_exists(config.get_data_file_path(self.name, 'node_map.npy')))
+        again = load_result(self.name, runname)
+        self.assertIsNot(result, again)
+        self.assertIs(result['clusters'], again['clusters'])
+        result['runname'] = 'changed'
+        self.assertEqual(runname, load_result(self.name, runname).runname)
+
+        time.sleep(0.01)
+        save_result(self.result(runname, {1: [1, 2], 2: [3, 4, 5, 6]}))
+        result2 = load_result(self.name, runname)
+        self.assertIsNot(result, result2)
+        self.assertEqual({1: [1, 2], 2: [3, 4, 5, 6]}, result2['clusters'].to_dict())
+
+    def testLegacy(self):
+        runname = sys._getframe().f_code.co_name
+        path = config.get_result_file_path(self.name, runname, create=True)
+        with open(os.path.join(path, 'result.txt'), 'wt') as f:
+            json.dump(self.result(runname, {1: [1, 2, 3], 2: [4]}), f)
+        result = load_result(self.name, runname)
+        self.assertEqual({'1': [1, 2, 3], '2': [4], '-9999': [5, 6]}, result['clusters'].to_dict())
+
+        runname = runname + "_multilevel"
+        path = config.get_result_file_path(self.name, runname, create=True)
+        with open(os.path.join(path, 'result.txt'), 'wt') as f:
+            json.dump(self.result(runname, {0: {1: [1, 2, 3, 4, 5, 6]}, 1: {7: [1, 2]}}, multilevel=True, max_level=1), f)
+        result = load_result(self.name, runname)
+        self.assertEqual({7: [1, 2], -9999: [3, 4, 5, 6]}, result.clustering().get_membership().to_dict())
+        self.assertEqual({1: [1, 2, 3, 4, 5, 6]}, result.clustering(key=0).get_membership().to_dict())
+
+        # a result saved again is written in the binary format
+        Result(result).save()
+        self.assertFalse(utils.file_exists(os.path.join(path, 'result.txt')))
+        self.assertTrue(result_store.exists(path))
+        self.assertEqual({7: [1, 2], -9999: [3, 4, 5, 6]}, load_result(self.name, runname).clustering().get_membership().to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
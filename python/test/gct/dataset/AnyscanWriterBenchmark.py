@@ -0,0 +1,51 @@
+'''
+Throughput of the CSR based anyscan writer against the former pandas groupby.
+
+    python AnyscanWriterBenchmark.py [num_edges]
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import sys
+import numpy as np
+import pandas as pd
+from gct import utils
+from gct.dataset import fileformat
+
+
+def legacy_to_anyscan(edges1, filepath):
+    max_node = max(edges1['src'].max(), edges1['dest'].max())
+    self_edges = pd.DataFrame([[u, u] for u in range(max_node + 1)], columns=['src', 'dest'])
+    edges2 = edges1[['dest', 'src']].copy();  edges2.columns = ['src', 'dest']
+    edges = pd.concat([edges1, edges2, self_edges], axis=0)
+
+    def fun(df):
+        values = sorted(list(set(df['dest'])))
+        return str(len(values)) + " " + " ".join([str(u) for u in values])
+
+    grouped = edges.groupby('src').apply(fun).reset_index()
+    with open(filepath, 'wt') as f:
+        f.write(str(max_node + 1) + "\n")
+        for i in grouped.index: 
+            f.write(grouped.loc[i, 0] + "\n")
+    return filepath 
+
+
+def bench(num_edges):
+    rng = np.random.RandomState(123)
+    num_node = max(10, num_edges // 10)
+    df = pd.DataFrame({'src': rng.randint(0, num_node, num_edges), 'dest': rng.randint(0, num_node, num_edges)})
+    with utils.TempDir() as tmp_dir:
+        old, new = os.path.join(tmp_dir, 'old.txt'), os.path.join(tmp_dir, 'new.txt')
+        t_new, _ = utils.timeit(lambda: fileformat.write_anyscan(new, df['src'].values, df['dest'].values))
+        t_old, _ = utils.timeit(lambda: legacy_to_anyscan(df, old))
+        with open(old) as f1, open(new) as f2:
+            assert f1.read() == f2.read()
+    print("edges={:>10,}  groupby: {:8.2f}s  csr: {:8.2f}s  speedup: {:.1f}x".format(num_edges, t_old, t_new, t_old / t_new))
+
+
+if __name__ == "__main__":
+    num_edges = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    bench(num_edges)
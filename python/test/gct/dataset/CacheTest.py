@@ -0,0 +1,147 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import sys
+import time
+import concurrent.futures
+from gct.dataset import cache, convert
+from gct import utils
+
+
+def write(path, content):
+    with open(path, 'wt') as f:
+        f.write(content)
+
+
+def read(path):
+    with open(path, 'rt') as f:
+        return f.read()
+
+
+def convert_slowly(home):
+
+    def build(path):
+        with open(os.path.join(home, 'builds.log'), 'at') as f:
+            f.write("build\n")
+        time.sleep(0.2)
+        write(path, "converted")
+
+    return read(cache.ConversionCache(home, os.path.join(home, 'edges.parq')).get('edges.txt', build))
+
+
+class Test(unittest.TestCase):
+
+    def testGet(self):
+        with utils.TempDir() as home:
+            source = os.path.join(home, 'edges.parq')
+            write(source, "v1")
+            c = cache.ConversionCache(home, source)
+            calls = []
+
+            def build(path):
+                calls.append(path)
+                write(path, read(source))
+
+            path = c.get('edges.txt', build)
+            self.assertEqual(os.path.join(home, 'edges.txt'), path)
+            self.assertEqual("v1", read(path))
+            self.assertTrue(c.is_valid('edges.txt'))
+            c.get('edges.txt', build)
+            self.assertEqual(1, len(calls))
+            self.assertNotEqual(path, calls[0])  # built under a temporary name
+
+            # new converter version
+            c.get('edges.txt', build, version=2)
+            self.assertEqual(2, len(calls))
+
+            # source changed
+            write(source, "v22")
+            self.assertFalse(c.is_valid('edges.txt', version=2))
+            self.assertEqual("v22", read(c.get('edges.txt', build, version=2)))
+            self.assertEqual(3, len(calls))
+
+    def testBuildTime(self):
+        with utils.TempDir() as home:
+            source = os.path.join(home, 'edges.parq')
+            write(source, "v1")
+            c = cache.ConversionCache(home, source)
+
+            def build(path):
+                time.sleep(0.1)
+                # a nested conversion is counted once
+                write(path, read(c.get('pajek.txt', lambda u: (time.sleep(0.1), write(u, "p")))))
+
+            t0 = cache.build_time()
+            c.get('edges.txt', build)
+            self.assertTrue(0.2 <= cache.build_time() - t0 < 0.3)
+            c.get('edges.txt', build)
+            self.assertTrue(cache.build_time() - t0 < 0.3)
+
+    def testUntrustedAndFailedBuild(self):
+        with utils.TempDir() as home:
+            source = os.path.join(home, 'edges.parq')
+            write(source, "v1")
+            c = cache.ConversionCache(home, source)
+            write(os.path.join(home, 'pajek.txt'), "half written")
+            self.assertEqual("ok", read(c.get('pajek.txt', lambda u: write(u, "ok"))))
+
+            def fail(path):
+                write(path, "partial")
+                raise IOError("disk full")
+
+            self.assertRaises(IOError, lambda: c.get('anyscan.txt', fail))
+            self.assertEqual(['cache.json', 'cache.lock', 'edges.parq', 'pajek.txt'], sorted(os.listdir(home)))
+
+    def testEvict(self):
+        with utils.TempDir() as data_path:
+            for name in ['a', 'b']:
+                home = os.path.join(data_path, name)
+                os.makedirs(home)
+                write(os.path.join(home, 'edges.parq'), name)
+            ca = cache.ConversionCache(os.path.join(data_path, 'a'), os.path.join(data_path, 'a', 'edges.parq'))
+            cb = cache.ConversionCache(os.path.join(data_path, 'b'), os.path.join(data_path, 'b', 'edges.parq'))
+            ca.get('edges.txt', lambda u: write(u, "x" * 100))
+            time.sleep(0.01)
+            cb.get('edges.txt', lambda u: write(u, "x" * 100))
+            time.sleep(0.01)
+            ca.get('pajek.txt', lambda u: write(u, "x" * 100))
+            time.sleep(0.01)
+            ca.get('edges.txt', lambda u: None)  # touch
+            self.assertEqual(300, sum(u[1] for u in cache.list_entries(data_path)))
+
+            self.assertEqual([], cache.evict(250, data_path=data_path))  # all in use
+            removed = cache.evict(250, data_path=data_path, min_idle=0)
+            self.assertEqual([os.path.join(data_path, 'b', 'edges.txt')], removed)
+            self.assertFalse(utils.file_exists(removed[0]))
+            self.assertFalse(cb.is_valid('edges.txt'))
+            self.assertTrue(ca.is_valid('edges.txt'))
+
+    def testConcurrent(self):
+        with utils.TempDir() as home:
+            source = os.path.join(home, 'edges.parq')
+            write(source, "v1")
+            with concurrent.futures.ProcessPoolExecutor(max_workers=4) as executor:
+                self.assertEqual(["converted"] * 4, list(executor.map(convert_slowly, [home] * 4)))
+            self.assertEqual("build\n", read(os.path.join(home, 'builds.log')))
+
+    def testDataset(self):
+        name = sys._getframe().f_code.co_name
+        d = convert.from_edgelist(name, [[1, 2], [2, 3]], directed=False, overide=True)
+        path = d.to_edgelist()
+        self.assertEqual(d.file_edges, path)
+        self.assertEqual("1 2\n2 3\n", read(path))
+        write(path, "1 2\n")  # modified behind the cache is trusted until invalidated
+        self.assertEqual(path, d.to_edgelist())
+        cache.ConversionCache(d.home, d.parq_edges).invalidate()
+        self.assertFalse(utils.file_exists(path))
+        self.assertEqual("1 2\n2 3\n", read(d.to_edgelist()))
+        self.assertEqual((4, 4), d.to_csr().shape)
+        self.assertTrue(utils.file_exists(d.file_csr))
+
+
+if __name__ == "__main__":
+    unittest.main()
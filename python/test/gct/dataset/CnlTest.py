@@ -0,0 +1,68 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import numpy as np
+from gct import utils
+from gct.dataset import cnl
+from gct.dataset.membership import Membership
+from gct.dataset.dataset import Clustering
+
+
+class Test(unittest.TestCase):
+
+    def write(self, tmp_dir, text):
+        path = os.path.join(tmp_dir, 'clusters.cnl')
+        with open(path, 'wt') as f:
+            f.write(text)
+        return path
+
+    def testTokenize(self):
+        with utils.TempDir() as tmp_dir:
+            path = self.write(tmp_dir, "# header 1 2\n3 1 2\n\n-5\t7,7|8\n12: 4 5")
+            for block_size in [3, 1 << 20]:
+                values, offsets = cnl.tokenize(path, block_size=block_size)
+                self.assertEqual([3, 1, 2, -5, 7, 7, 8, 12, 4, 5], values.tolist())
+                self.assertEqual([0, 0, 3, 3, 7, 10], offsets.tolist())
+            values, offsets = cnl.tokenize(path, comment=None, header_lines=2)
+            self.assertEqual([0, 0, 4, 7], offsets.tolist())
+            self.assertEqual([0, 0, 1, 2], cnl.line_ranks(np.array([0, 1, 1, 4])).tolist())
+
+    def testInvalidTokens(self):
+        with utils.TempDir() as tmp_dir:
+            for text in ["1 0.5\n", "1-2\n", "3 -\n", "--4\n", "1e5\n", "7 12abc\n", "x1\n", "1234567890123456789\n"]:
+                self.assertRaises(ValueError, cnl.tokenize, self.write(tmp_dir, text))
+            values, _ = cnl.tokenize(self.write(tmp_dir, "# 0.5 abc1\n-123456789012345678 123456789012345678\n"))
+            self.assertEqual([-123456789012345678, 123456789012345678], values.tolist())
+
+    def testReadCnl(self):
+        with utils.TempDir() as tmp_dir:
+            path = self.write(tmp_dir, "# header\n3 1 2 2\n\n-5 7 8\n12 4 5\n")
+            self.assertEqual({1: [1, 2, 3], 3: [-5, 7, 8], 4: [4, 5, 12]}, cnl.read_cnl(path).to_dict())
+            self.assertEqual({1: [1, 2], 3: [7, 8], 4: [4, 5]}, cnl.read_cnl(path, first_field='skip').to_dict())
+            self.assertEqual({-5: [7, 8], 3: [1, 2], 12: [4, 5]}, cnl.read_cnl(path, first_field='label').to_dict())
+            node_map = np.arange(20) * 10
+            self.assertEqual({-5: [70, 80], 3: [10, 20], 12: [40, 50]},
+                             cnl.read_cnl(path, first_field='label', node_map=node_map).to_dict())
+            self.assertRaises(ValueError, cnl.read_cnl, path, first_field='x')
+            self.assertEqual(0, cnl.read_cnl(self.write(tmp_dir, "")).num_cluster)
+
+    def testWriteCnl(self):
+        m = Membership.from_dict({2: [7, 5], 1: [3], 3: [1, 2, 3, 4]})
+        with utils.TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, 'out.cnl')
+            for chunk_size in [1, 2, 100]:
+                cnl.write_cnl(path, m, chunk_size=chunk_size)
+                with open(path) as f:
+                    self.assertEqual("3\n5 7\n1 2 3 4\n", f.read())
+                self.assertEqual(m.to_dict(), {k + 1: v for k, v in cnl.read_cnl(path).to_dict().items()})
+            Clustering(m).save_to_cnl_file(path)
+            with open(path) as f:
+                self.assertEqual("3\n5 7\n1 2 3 4\n", f.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import sys
+import numpy as np
+from gct.dataset import csr, convert
+from gct.dataset.dataset import load_local
+from gct import utils
+
+
+class Test(unittest.TestCase):
+
+    def testBuildCsr(self):
+        indptr, indices, weights = csr.build_csr([0, 2, 1, 2], [1, 0, 2, 2], [0.5, 1, 2, 3], symmetric=True)
+        self.assertEqual([0, 2, 4, 7], indptr.tolist())
+        self.assertEqual([1, 2, 0, 2, 0, 1, 2], indices.tolist())
+        self.assertEqual([0.5, 1, 0.5, 2, 1, 2, 6], weights.tolist())
+        self.assertEqual(np.int32, indptr.dtype)
+
+    def testSaveLoad(self):
+        arrays = csr.build_csr([0, 1, 3], [1, 2, 0])
+        with utils.TempDir() as tmp_dir:
+            self.assertFalse(csr.csr_exists(tmp_dir))
+            csr.save_csr(tmp_dir, *arrays)
+            self.assertTrue(csr.csr_exists(tmp_dir))
+            loaded = csr.load_csr(tmp_dir)
+            for a, b in zip(arrays, loaded):
+                self.assertTrue(isinstance(b, np.memmap))
+                self.assertEqual(a.tolist(), b.tolist())
+            A = csr.to_scipy(*loaded)
+            self.assertTrue(np.shares_memory(A.indices, loaded[1]))
+            self.assertEqual((4, 4), A.shape)
+
+    def testDatasetToCsr(self):
+        name = sys._getframe().f_code.co_name
+        lst = [[1, 2], [2, 2], [2, 3], [3, 2]]
+        d = convert.from_edgelist(name, lst, directed=False, overide=True)
+        A = d.to_csr()
+        self.assertTrue(csr.csr_exists(d.file_csr))
+        self.assertEqual([[0, 0, 0, 0], [0, 0, 1, 0], [0, 1, 2, 1], [0, 0, 1, 0]], A.toarray().tolist())
+        
+        A = load_local(name).to_csr()
+        self.assertFalse(A.indices.flags.writeable)  # read-only memory map
+        self.assertEqual(5, A.nnz)
+        
+        d = convert.from_edgelist(name, lst, directed=True, overide=True)
+        self.assertEqual([[0, 0, 0, 0], [0, 0, 1, 0], [0, 0, 1, 1], [0, 0, 1, 0]], d.to_csr().toarray().tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
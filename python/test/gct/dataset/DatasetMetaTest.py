@@ -0,0 +1,56 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import json
+import os
+import sys
+from unittest import mock
+from gct.dataset import dataset, convert
+from gct import config
+
+
+class Test(unittest.TestCase):
+
+    def testEdgeStats(self):
+        stats = dataset.edge_stats([1, 1, 5], [5, 7, 7])
+        self.assertEqual({'num_node': 3, 'num_edge': 3, 'min_node': 1, 'max_node': 7,
+                          'degree': {'min': 2, 'max': 2, 'mean': 2.0, 'median': 2.0}}, stats)
+        stats = dataset.edge_stats([1, 2, 1, 3], [2, 1, 3, 1], is_edge_mirrored=True)
+        self.assertEqual({'min': 1, 'max': 2, 'mean': 4.0 / 3, 'median': 1.0}, stats['degree'])
+        self.assertEqual({'num_node': 0, 'num_edge': 0}, dataset.edge_stats([], []))
+
+    def testLazyLoad(self):
+        name = sys._getframe().f_code.co_name
+        d = convert.from_edgelist(name, [[1, 2], [2, 3], [3, 10]], directed=False, overide=True)
+        self.assertEqual(4, d.num_node)
+        self.assertEqual(10, dataset.load_local_meta(name)['stats']['max_node'])
+
+        with mock.patch('fastparquet.ParquetFile', side_effect=AssertionError("edges read")):
+            d = dataset.load_local(name)
+            self.assertEqual((4, 3), d.num_node_edge)
+            self.assertEqual(1.5, d.get_stats()['degree']['mean'])
+            summary = dataset.local_summary(name)
+            self.assertEqual([name], summary['name'].tolist())
+            self.assertEqual([3], summary['num_edge'].tolist())
+            self.assertEqual([2], summary['max_degree'].tolist())
+
+    def testBackfillStats(self):
+        name = sys._getframe().f_code.co_name
+        convert.from_edgelist(name, [[1, 2], [2, 3]], directed=False, overide=True)
+        meta_file = config.get_data_file_path(name, 'meta.info')
+        meta = dataset.load_local_meta(name)
+        del meta['stats']
+        with open(meta_file, 'wt') as f:
+            json.dump(meta, f)
+        self.assertTrue(dataset.local_summary(name)['num_node'].isnull().all())
+
+        self.assertEqual(3, dataset.load_local(name).num_node)
+        self.assertEqual(3, dataset.load_local_meta(name)['stats']['num_node'])
+        self.assertEqual([3], dataset.local_summary(name)['num_node'].tolist())
+
+
+if __name__ == "__main__":
+    unittest.main()
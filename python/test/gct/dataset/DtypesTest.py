@@ -0,0 +1,63 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import sys
+import numpy as np
+import pandas as pd
+from gct.dataset import dtypes, convert, ingest
+from gct.dataset.dataset import load_local, Clustering
+
+
+class Test(unittest.TestCase):
+
+    def testIdDtype(self):
+        self.assertEqual(np.int32, dtypes.id_dtype(np.array([-5, 7])))
+        self.assertEqual(np.int32, dtypes.id_dtype(np.array([], dtype=np.int64)))
+        self.assertEqual(np.uint32, dtypes.id_dtype(np.array([0, 1 << 31])))
+        self.assertEqual(np.int64, dtypes.id_dtype(np.array([-1, 1 << 31])))
+        self.assertEqual(np.int64, dtypes.id_dtype(np.array([1, 2]), np.array([1 << 40])))
+        src, dest = dtypes.narrow(np.array([1, 2]), np.array([3, 1 << 31]))
+        self.assertEqual(np.uint32, src.dtype)
+        self.assertEqual(np.uint32, dest.dtype)
+        self.assertRaises(ValueError, dtypes.narrow, np.array([1.5]))
+        self.assertEqual(np.int64, dtypes.widen(np.array([1], dtype=np.uint32)).dtype)
+        self.assertEqual(np.float64, dtypes.widen(np.array([1], dtype=np.float32)).dtype)
+
+    def testCompactFrames(self):
+        df = dtypes.compact_edges(pd.DataFrame({'src': [1, 2], 'dest': [3, 4], 'weight': [0.5, 1.0]}))
+        self.assertEqual([np.int32, np.int32, np.float32], df.dtypes.tolist())
+        self.assertIs(df, dtypes.compact_edges(df))
+        df = dtypes.compact_clustering(pd.DataFrame({'node': [1, 1 << 40], 'cluster': [-9999, 2]}))
+        self.assertEqual([np.int64, np.int32], df.dtypes.tolist())
+        df = pd.DataFrame({'node': [1, 2], 'cluster': ['-9999', '1']})
+        self.assertIs(df, dtypes.compact_clustering(df))
+
+    def testDataset(self):
+        name = sys._getframe().f_code.co_name
+        d = convert.from_edgelist(name, [[1, 2, 0.5], [2, 1 << 40, 1.0]], directed=False, overide=True)
+        self.assertEqual([np.int64, np.int64, np.float32], d.get_edges().dtypes.tolist())
+        d = convert.from_edgelist(name, [[1, 2], [2, 3]], directed=False, overide=True,
+                                  groundtruth=[[1, 1], [2, 1], [3, 2]])
+        self.assertEqual([np.int32, np.int32], d.get_edges().dtypes.tolist())
+        d = load_local(name)
+        self.assertEqual([np.int32, np.int32], d.get_edges().dtypes.tolist())
+        self.assertEqual([[1, 2], [2, 3]], d.get_edges().values.tolist())
+        self.assertEqual([np.int32, np.int32], d.get_ground_truth()['default'].value().dtypes.tolist())
+
+        # packed keys are computed in 64 bits
+        keys = ingest.edge_keys(d.get_edges())
+        self.assertEqual(np.int64, keys.dtype)
+        self.assertEqual([(1 << 32) | 2, (2 << 32) | 3], keys.tolist())
+
+    def testClustering(self):
+        c = Clustering([[10, 1], [11, 1], [11, 2], [12, 2]])
+        self.assertEqual([np.int32, np.int32], c.value().dtypes.tolist())
+        self.assertEqual(2, c.num_cluster)
+        self.assertTrue(c.is_overlap)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+'''
+Throughput of the bulk edge list writer against the former row-by-row loop.
+
+    python EdgelistWriterBenchmark.py [num_edges]
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import sys
+import numpy as np
+import pandas as pd
+from gct import utils
+from gct.dataset import fileformat
+
+
+def legacy_to_edgelist(df, filepath, sep=" ", sort=False):
+    with open(filepath, 'wt') as f :
+        if sort:
+            df = df.sort_values(by=['src', 'dest'])
+        for i in range(df.shape[0]):
+            r = df.iloc[i]
+            r = ['%g' % (u) for u in r ]
+            row = sep.join(r)
+            row += "\n"
+            f.write(row)
+    return filepath
+
+
+def bench(num_edges, weighted, sort, legacy_limit=200000):
+    rng = np.random.RandomState(123)
+    df = pd.DataFrame({'src': rng.randint(0, 100000, num_edges), 'dest': rng.randint(0, 100000, num_edges)})
+    if weighted:
+        df['weight'] = rng.rand(num_edges).astype(np.float32)
+    weight = df['weight'].values if weighted else None
+    with utils.TempDir() as tmp_dir:
+        path = os.path.join(tmp_dir, 'edges.txt')
+        t_new, _ = utils.timeit(lambda: fileformat.write_edgelist(path, df['src'].values, df['dest'].values, weight, sort=sort))
+        n_legacy = min(num_edges, legacy_limit)
+        t_old, _ = utils.timeit(lambda: legacy_to_edgelist(df.iloc[:n_legacy], path, sort=sort))
+    new_rate = num_edges / t_new
+    old_rate = n_legacy / t_old
+    print("weighted={:<5} sort={:<5} legacy: {:>12,.0f} edges/s  bulk: {:>12,.0f} edges/s  speedup: {:.1f}x".format(
+        str(weighted), str(sort), old_rate, new_rate, new_rate / old_rate))
+
+
+if __name__ == "__main__":
+    num_edges = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for weighted in [False, True]:
+        for sort in [False, True]:
+            bench(num_edges, weighted, sort)
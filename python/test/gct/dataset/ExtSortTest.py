@@ -0,0 +1,68 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from gct.dataset import extsort, ingest, convert
+from gct.dataset.dataset import load_local
+from gct import utils
+
+
+def sorted_values(df, columns):
+    return sorted(map(tuple, df[columns].values.tolist()))
+
+
+class Test(unittest.TestCase):
+
+    def testSortUnique(self):
+        rng = np.random.RandomState(5)
+        keys = rng.randint(0, 500, 3000).astype(np.int64)
+        chunks = [keys[i:i + 170] for i in range(0, len(keys), 170)]
+        with utils.TempDir() as tmp_dir:
+            paths = extsort.write_runs(chunks, tmp_dir, run_size=400)
+            self.assertEqual(8, len(paths))
+            out = list(extsort.merge_runs(paths, block_size=30))
+            self.assertTrue(len(out) > 1)
+            self.assertEqual(np.unique(keys).tolist(), np.concatenate(out).tolist())
+            self.assertEqual([], list(extsort.sort_unique([], tmp_dir)))
+
+    def testMixedKeys(self):
+        small = ingest.edge_keys(pd.DataFrame({'src': [3, 1, 1], 'dest': [4, 2, 2]}))
+        large = ingest.edge_keys(pd.DataFrame({'src': [1 << 40, 1], 'dest': [1, 2]}))
+        self.assertEqual(None, small.dtype.names)
+        with utils.TempDir() as tmp_dir:
+            out = np.concatenate(list(extsort.sort_unique([small, large, small], tmp_dir, run_size=2, block_size=1)))
+        self.assertEqual([[1, 2], [3, 4], [1 << 40, 1]], ingest.keys_to_frame(out).values.tolist())
+
+    def testOutOfCoreDataset(self):
+        rng = np.random.RandomState(7)
+        default_run_size = extsort.DEFAULT_RUN_SIZE
+        extsort.DEFAULT_RUN_SIZE = 100
+        try:
+            for weighted in [False, True]:
+                for directed in [False, True]:
+                    edges = pd.DataFrame({'src': rng.randint(0, 40, 800), 'dest': rng.randint(0, 40, 800)})
+                    columns = ['src', 'dest']
+                    if weighted:
+                        edges['weight'] = rng.randint(1, 3, 800).astype(np.float32)
+                        columns.append('weight')
+                    d1 = convert.from_edgelist("extsort_mem", edges.copy(), directed=directed, overide=True)
+                    d2 = convert.from_edgelist("extsort_disk", edges, directed=directed, overide=True, out_of_core=True)
+                    self.assertEqual(d1.get_stats(), d2.get_stats())
+                    self.assertEqual(d1.get_stats(), load_local("extsort_disk").get_stats())
+                    e2 = load_local("extsort_disk").get_edges()
+                    self.assertEqual(sorted_values(d1.get_edges(), columns), sorted_values(e2, columns))
+                    self.assertEqual(sorted_values(e2, columns), list(map(tuple, e2[columns].values.tolist())))
+                    self.assertEqual([], [u for u in os.listdir(d2.home) if u.startswith("tmp")])
+        finally:
+            extsort.DEFAULT_RUN_SIZE = default_run_size
+
+        self.assertRaises(ValueError, lambda: convert.Dataset(edgesObj=[[1, 2]], out_of_core=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
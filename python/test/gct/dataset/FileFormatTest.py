@@ -0,0 +1,94 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import os
+import numpy as np
+from gct.dataset import fileformat
+from gct import utils
+
+
+class Test(unittest.TestCase):
+
+    def read(self, path):
+        with open(path, 'rt') as f:
+            return f.read()
+
+    def testWriteEdgelist(self):
+        src = np.array([3, 1, 2, 1])
+        dest = np.array([4, 5, 3, 2])
+        with utils.TempDir() as tmp_dir:
+            path = fileformat.write_edgelist(os.path.join(tmp_dir, 'edges.txt'), src, dest, chunk_size=3)
+            self.assertEqual("3 4\n1 5\n2 3\n1 2\n", self.read(path))
+
+            path = fileformat.write_edgelist(os.path.join(tmp_dir, 'edges.txt'), src, dest, sort=True, chunk_size=3)
+            self.assertEqual("1 2\n1 5\n2 3\n3 4\n", self.read(path))
+
+    def testWriteWeightedEdgelist(self):
+        src = np.array([1, 2, 1234567])
+        dest = np.array([2, 3, 1])
+        weight = np.array([0.5, 2, 1.0 / 3], dtype=np.float32)
+        with utils.TempDir() as tmp_dir:
+            path = fileformat.write_edgelist(os.path.join(tmp_dir, 'edges.txt'), src, dest, weight, sep="\t")
+            self.assertEqual("1\t2\t0.5\n2\t3\t2\n1234567\t1\t0.333333\n", self.read(path))
+
+    def testEdgeOrder(self):
+        src = np.array([2, 1, 2, -1])
+        dest = np.array([1, 9, 0, 3])
+        self.assertEqual([3, 1, 2, 0], fileformat.edge_order(src, dest).tolist())
+        self.assertEqual([1, 2, 0], fileformat.edge_order(src[:3], dest[:3]).tolist())
+
+    def testWritePajek(self):
+        src = np.array([10, 3, 7])
+        dest = np.array([3, 7, 10])
+        with utils.TempDir() as tmp_dir:
+            path = fileformat.write_pajek(os.path.join(tmp_dir, 'pajek.txt'), src, dest, chunk_size=2)
+            expected = '*Vertices\t3\n\t1 "3"\n\t2 "7"\n\t3 "10"\n*Edges\n\t3\t1\n\t1\t2\n\t2\t3\n'
+            self.assertEqual(expected, self.read(path))
+
+            path = fileformat.write_pajek(os.path.join(tmp_dir, 'pajek.txt'), src, dest, [1, 0.5, 2], directed=True)
+            expected = '*Vertices\t3\n\t1 "3"\n\t2 "7"\n\t3 "10"\n*Arcs\n\t3\t1\t1.000000\n\t1\t2\t0.500000\n\t2\t3\t2.000000\n'
+            self.assertEqual(expected, self.read(path))
+
+    def testWritePajekAsEdgelist2Pajek(self):
+        from gct.dataset import edgelist2pajek
+        rng = np.random.RandomState(1)
+        src, dest = rng.randint(0, 50, 200), rng.randint(0, 50, 200)
+        weight = rng.randint(1, 10, 200).astype(np.float32)
+        with utils.TempDir() as tmp_dir:
+            for directed in [True, False]:
+                for w in [None, weight]:
+                    edgefile = fileformat.write_edgelist(os.path.join(tmp_dir, 'edges.txt'), src, dest, w)
+                    old = os.path.join(tmp_dir, 'old.txt')
+                    edgelist2pajek.edgelist_to_pajek(edgefile, old, directed, w is not None)
+                    new = fileformat.write_pajek(os.path.join(tmp_dir, 'new.txt'), src, dest, w, directed=directed, chunk_size=7)
+                    self.assertEqual(self.read(old), self.read(new))
+
+    def testWriteAnyscan(self):
+        src = np.array([1, 3, 1, 3])
+        dest = np.array([3, 1, 2, 3])
+        with utils.TempDir() as tmp_dir:
+            path = fileformat.write_anyscan(os.path.join(tmp_dir, 'anyscan.txt'), src, dest, chunk_size=3)
+            self.assertEqual("4\n1 0\n3 1 2 3\n2 1 2\n2 1 3\n", self.read(path))
+
+    def testWriteAnyscanAsGroupby(self):
+        import pandas as pd
+        rng = np.random.RandomState(2)
+        src, dest = rng.randint(1, 60, 300), rng.randint(1, 60, 300)
+        edges1 = pd.DataFrame({'src': src, 'dest': dest})
+        max_node = max(src.max(), dest.max())
+        self_edges = pd.DataFrame([[u, u] for u in range(max_node + 1)], columns=['src', 'dest'])
+        edges2 = edges1[['dest', 'src']].copy(); edges2.columns = ['src', 'dest']
+        edges = pd.concat([edges1, edges2, self_edges], axis=0)
+        grouped = edges.groupby('src')['dest'].apply(lambda u: " ".join([str(len(set(u)))] + [str(v) for v in sorted(set(u))]))
+        expected = str(max_node + 1) + "\n" + "".join(u + "\n" for u in grouped)
+        with utils.TempDir() as tmp_dir:
+            for chunk_size in [1, 17, 1 << 20]:
+                path = fileformat.write_anyscan(os.path.join(tmp_dir, 'anyscan.txt'), src, dest, chunk_size=chunk_size)
+                self.assertEqual(expected, self.read(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
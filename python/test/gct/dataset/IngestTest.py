@@ -0,0 +1,107 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import gzip
+import os
+import numpy as np
+import pandas as pd
+from gct.dataset import ingest, convert
+from gct.dataset.dataset import load_local
+from gct import utils, config
+
+
+def sorted_values(df, columns):
+    return sorted(map(tuple, df[columns].values.tolist()))
+
+
+class Test(unittest.TestCase):
+
+    def testReadChunks(self):
+        with utils.TempDir() as tmp_dir:
+            path = os.path.join(tmp_dir, 'graph.txt.gz')
+            with gzip.open(path, 'wt') as f:
+                f.write("# comment\n# FromNodeId\tToNodeId\n1\t2\n3\t1\n2\t5\n")
+            chunks = list(ingest.read_edge_chunks(path, chunk_size=2, weighted=False))
+            self.assertEqual([2, 1], [len(u) for u in chunks])
+            self.assertEqual([[1, 2], [3, 1], [2, 5]], pd.concat(chunks)[['src', 'dest']].values.tolist())
+
+            path = os.path.join(tmp_dir, 'cmty.txt.gz')
+            with gzip.open(path, 'wt') as f:
+                f.write("1\t2\t3\n4\n2\t4\n")
+            df = pd.concat(ingest.read_community_chunks(path, chunk_size=2))
+            self.assertEqual([[1, 1], [2, 1], [3, 1], [4, 2], [2, 3], [4, 3]], df[['node', 'cluster']].values.tolist())
+
+    def testDeduplicator(self):
+        dedup = ingest.Deduplicator()
+        df = pd.DataFrame({'src': [1, 2, 1], 'dest': [2, 3, 2]})
+        self.assertEqual([0, 1], dedup.new_rows(df).tolist())
+        df = pd.DataFrame({'src': [2, 5, 1 << 40, 5], 'dest': [3, 1, 2, 1]})
+        self.assertEqual([1, 2], dedup.new_rows(df).tolist())
+        df = pd.DataFrame({'src': [1 << 40, 1, 7], 'dest': [2, 2, 7]})
+        self.assertEqual([2], dedup.new_rows(df).tolist())
+
+        dedup = ingest.Deduplicator()
+        df = pd.DataFrame({'src': [1, 1, 1], 'dest': [2, 2, 2], 'weight': np.array([1, 2, 1], dtype=np.float32)})
+        self.assertEqual([0, 1], dedup.new_rows(df).tolist())
+
+    def testManyChunks(self):
+        from gct.dataset.dataset import edge_stats
+        rng = np.random.RandomState(5)
+        edges = pd.DataFrame({'src': rng.randint(0, 300, 3000), 'dest': rng.randint(0, 300, 3000)})
+        dedup, stats = ingest.Deduplicator(), ingest.StatsAccumulator()
+        parts = []
+        for i in range(0, len(edges), 7):
+            df = edges.iloc[i:i + 7]
+            df = df.iloc[dedup.new_rows(df)]
+            stats.add(df)
+            parts.append(df)
+        self.assertLess(len(dedup.levels.levels), 20)
+        expected = edges.drop_duplicates()
+        self.assertEqual(expected.values.tolist(), pd.concat(parts).values.tolist())
+        self.assertEqual(edge_stats(expected["src"], expected["dest"]), stats.value())
+
+    def testSameAsInMemory(self):
+        rng = np.random.RandomState(3)
+        for weighted in [False, True]:
+            for directed in [False, True]:
+                edges = pd.DataFrame({'src': rng.randint(0, 30, 500), 'dest': rng.randint(0, 30, 500)})
+                columns = ['src', 'dest']
+                if weighted:
+                    edges['weight'] = rng.randint(1, 3, 500).astype(np.float32)
+                    columns.append('weight')
+                gt = pd.DataFrame({'node': np.arange(30), 'cluster': np.arange(30) % 4})
+                d1 = convert.from_edgelist("ingest_mem", edges.copy(), groundtruth=gt, directed=directed, overide=True)
+                chunks = [edges.iloc[i:i + 37] for i in range(0, len(edges), 37)]
+                gt_chunks = [gt.iloc[:10], gt.iloc[10:]]
+                d2 = ingest.create_dataset("ingest_stream", chunks, groundtruth_chunks=gt_chunks, directed=directed, 
+                                           weighted=weighted, overide=True)
+                self.assertEqual(d1.get_stats(), d2.get_stats())
+                d2 = load_local("ingest_stream")
+                self.assertEqual(sorted_values(d1.get_edges(), columns), sorted_values(d2.get_edges(), columns))
+                self.assertEqual(sorted_values(gt, ['node', 'cluster']), 
+                                 sorted_values(d2.get_ground_truth()['default'].value(), ['node', 'cluster']))
+
+    def testFailureLeavesNothing(self):
+
+        def chunks():
+            yield pd.DataFrame({'src': [1], 'dest': [2]})
+            raise IOError("truncated file")
+
+        self.assertRaises(IOError, lambda: ingest.create_dataset("ingest_fail", chunks(), overide=True))
+        self.assertFalse(utils.file_exists(config.get_data_file_path("ingest_fail")))
+
+    def testSampleDataset(self):
+        from gct.dataset import sample_dataset
+        d = sample_dataset.load_sample_dataset("cities", overide=True)
+        path = os.path.join(config.GCT_HOME, 'data', 'cities_edges.csv.gz')
+        d1 = convert.from_edgelist("ingest_cities", pd.read_csv(path), groundtruth=pd.read_csv(path.replace("_edges", "_gt")), overide=True)
+        self.assertTrue(d.is_weighted())
+        self.assertEqual(d1.get_stats(), d.get_stats())
+        self.assertEqual(sorted_values(d1.get_edges(), ['src', 'dest', 'weight']), sorted_values(d.get_edges(), ['src', 'dest', 'weight']))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import numpy as np
+import pandas as pd
+from gct.dataset.membership import Membership, factorize
+from gct.dataset.dataset import Clustering
+from gct.alg.clustering import Result
+
+
+class Test(unittest.TestCase):
+
+    def testFactorize(self):
+        uniq, codes = factorize(np.array([30, 10, 30, 20]))
+        self.assertEqual([10, 20, 30], uniq.tolist())
+        self.assertEqual([2, 0, 2, 1], codes.tolist())
+        uniq, codes = factorize(np.array(['b', 'a', 'b']))
+        self.assertEqual(['a', 'b'], uniq.tolist())
+        self.assertEqual([1, 0, 1], codes.tolist())
+        uniq, codes = factorize(np.array([3, 1, 3, 2, -1]))
+        self.assertEqual([-1, 1, 2, 3], uniq.tolist())
+        self.assertEqual([3, 1, 3, 2, 0], codes.tolist())
+
+    def testMembership(self):
+        m = Membership.from_pairs([5, 3, 3, 7, 5, 5], [2, 2, 1, 1, 2, 9])
+        self.assertEqual([1, 2, 9], m.cluster_ids.tolist())
+        self.assertEqual([0, 2, 4, 5], m.offsets.tolist())
+        self.assertEqual([3, 7, 3, 5, 5], m.nodes.tolist())
+        self.assertEqual(np.int32, m.nodes.dtype)
+        self.assertEqual([2, 2, 1], m.sizes.tolist())
+        self.assertEqual(3, m.num_cluster)
+        self.assertEqual(3, len(m))
+        self.assertEqual(3, m.num_node)
+        self.assertTrue(m.is_overlap)
+        self.assertEqual([3, 5, 7], m.inverse[0].tolist())
+        self.assertEqual([2, 2, 1], m.overlaps.tolist())
+        self.assertEqual([2, 9], m.clusters_of(5).tolist())
+        self.assertEqual([], m.clusters_of(4).tolist())
+        self.assertEqual({1: [3, 7], 2: [3, 5], 9: [5]}, m.to_dict())
+        self.assertEqual([[3, 1], [7, 1], [3, 2], [5, 2], [5, 9]], m.to_frame().values.tolist())
+
+        # read-only mapping, like the dict it replaces
+        self.assertEqual([1, 2, 9], list(m.keys()))
+        self.assertEqual([3, 5], m[2])
+        self.assertEqual({1: [3, 7], 2: [3, 5], 9: [5]}, dict(m.items()))
+        self.assertTrue(9 in m)
+        self.assertFalse(4 in m)
+        self.assertRaises(KeyError, lambda: m['x'])
+        self.assertEqual(None, m.get(4))
+
+        m = Membership.from_dict({'b': [1, 2], 'a': [3], 'c': []})
+        self.assertEqual(['a', 'b'], m.cluster_ids.tolist())
+        self.assertFalse(m.is_overlap)
+        self.assertEqual(0, Membership.from_dict({}).num_cluster)
+
+    def testAddCluster(self):
+        m = Membership.from_dict({1: [3, 4], 5: [6]})
+        self.assertEqual({-9999: [1, 2], 1: [3, 4], 5: [6]}, m.add_cluster(-9999, [2, 1]).to_dict())
+        self.assertEqual({1: [3, 4], 3: [7], 5: [6]}, m.add_cluster(3, [7]).to_dict())
+        self.assertEqual({1: [2, 3, 4], 5: [6]}, m.add_cluster(1, [2, 3]).to_dict())
+        self.assertIs(m, m.add_cluster(2, []))
+        m = Membership.from_dict({1 << 31: [1]})
+        self.assertEqual({-9999: [2], 1 << 31: [1]}, m.add_cluster(-9999, [2]).to_dict())
+
+    def testClustering(self):
+        d = {1: [10, 11], 2: [11, 12]}
+        for obj in [d, [[10, 1], [11, 1], [11, 2], [12, 2], [12, 2]], pd.DataFrame({'node': [10, 11, 11, 12], 'cluster': [1, 1, 2, 2]}),
+                    Result({'clusters': d})]:
+            c = Clustering(obj)
+            self.assertEqual(2, c.num_cluster)
+            self.assertEqual(3, c.num_node)
+            self.assertTrue(c.is_overlap)
+            self.assertEqual({10: 1, 11: 2, 12: 1}, c.node_overlaps.to_dict())
+            self.assertEqual({1: 2, 2: 2}, c.cluster_sizes.to_dict())
+            self.assertEqual([[10, 1], [11, 1], [11, 2], [12, 2]], c.value().values.tolist())
+        df = Result({'clusters': d}).clustering(as_dataframe=True)
+        self.assertEqual([[10, 1], [11, 1], [11, 2], [12, 2]], df.values.tolist())
+
+    def testEraseOverlap(self):
+        rng = np.random.RandomState(1)
+        nodes = np.arange(1000)
+        c = Clustering(pd.DataFrame({'node': np.concatenate([nodes, nodes[:500]]),
+                                     'cluster': np.concatenate([rng.randint(0, 10, 1000), rng.randint(10, 20, 500)])}))
+        df = c.value(erase_overlap=True, seed=1)
+        self.assertEqual(nodes.tolist(), df['node'].tolist())
+        df['cluster'] = -1
+        df = c.value(erase_overlap=True, seed=1)
+        self.assertFalse((df['cluster'] == -1).any())
+        self.assertIsNot(df, c.value(erase_overlap=True, seed=1))
+        self.assertEqual(df.values.tolist(), Clustering(c.get_membership()).value(erase_overlap=True, seed=1).values.tolist())
+        pairs = set(map(tuple, c.value().values.tolist()))
+        self.assertTrue(all(u in pairs for u in map(tuple, df.values.tolist())))
+        # both clusters of the overlapped nodes are picked
+        self.assertTrue(0 < (df['cluster'][:500] >= 10).sum() < 500)
+        self.assertEqual(1000, len(c.value(erase_overlap=True, seed=np.random.default_rng(2))))
+        self.assertEqual(1500, len(c.value()))
+
+
+if __name__ == "__main__":
+    unittest.main()
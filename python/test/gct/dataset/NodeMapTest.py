@@ -0,0 +1,66 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import sys
+import numpy as np
+from gct.dataset import nodemap, convert
+from gct.dataset.dataset import load_local
+from gct.alg.clustering import labels_to_clusters
+from gct import utils
+
+
+class Test(unittest.TestCase):
+
+    def testNodeMap(self):
+        node_map = nodemap.build_node_map([10, 1 << 40, 3], [3, 10, 7])
+        self.assertEqual([3, 7, 10, 1 << 40], node_map.tolist())
+        self.assertFalse(nodemap.is_dense(node_map))
+        self.assertTrue(nodemap.is_dense(np.arange(5)))
+        dense = nodemap.to_dense(node_map, [1 << 40, 3, 10])
+        self.assertEqual([3, 0, 2], dense.tolist())
+        self.assertEqual(np.int32, dense.dtype)
+        self.assertEqual([1 << 40, 3, 10], nodemap.from_dense(node_map, dense).tolist())
+
+    def testLabelsToClusters(self):
+        clusters = labels_to_clusters([5, 6, 7, 8], [2, 1, 2, 1])
+        self.assertEqual({1: [6, 8], 2: [5, 7]}, clusters)
+
+    def testDatasetDenseEdges(self):
+        name = sys._getframe().f_code.co_name
+        lst = [[100, 5], [5, 7], [7, 100], [100, 2000]]
+        d = convert.from_edgelist(name, lst, directed=False, overide=True)
+        self.assertFalse(d.has_dense_ids())
+        self.assertEqual([5, 7, 100, 2000], d.get_node_map().tolist())
+        self.assertTrue(utils.file_exists(d.file_node_map))
+        
+        dense = d.get_dense_edges()
+        edges = d.get_edges()
+        self.assertEqual(edges['src'].tolist(), d.from_dense_ids(dense['src'].values).tolist())
+        self.assertEqual(edges['dest'].tolist(), d.from_dense_ids(dense['dest'].values).tolist())
+        
+        path = d.to_anyscan(dense=True)
+        self.assertEqual(d.file_dense_anyscan, path)
+        with open(path) as f:
+            self.assertEqual("4\n3 0 1 2\n3 0 1 2\n4 0 1 2 3\n2 2 3\n", f.read())
+        self.assertEqual(d.file_dense_edgelist, d.to_edgelist(dense=True))
+        
+        d = load_local(name)
+        self.assertTrue(utils.file_exists(d.file_dense_edges))
+        self.assertEqual(dense.values.tolist(), d.get_dense_edges().values.tolist())
+
+        # rebuilt when edges.parq changes
+        edges.assign(dest=edges['dest'] + 1).to_parquet(d.parq_edges)
+        d = load_local(name)
+        self.assertEqual(sorted(set(edges['src']) | set(edges['dest'] + 1)), d.get_node_map().tolist())
+        self.assertEqual((edges['dest'] + 1).tolist(), d.from_dense_ids(d.get_dense_edges()['dest'].values).tolist())
+
+        d = convert.from_edgelist(name, [[0, 1], [1, 2]], directed=False, overide=True)
+        self.assertTrue(d.has_dense_ids())
+        self.assertEqual(d.file_edges, d.to_edgelist(dense=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
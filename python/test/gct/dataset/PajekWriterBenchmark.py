@@ -0,0 +1,36 @@
+'''
+Throughput of the numpy pajek writer against edgelist2pajek (awk | sort | uniq plus a dict lookup per edge).
+
+    python PajekWriterBenchmark.py [num_edges]
+
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import os
+import sys
+import numpy as np
+from gct import utils
+from gct.dataset import fileformat, edgelist2pajek
+
+
+def bench(num_edges, weighted, directed):
+    rng = np.random.RandomState(123)
+    src = rng.randint(0, num_edges // 10, num_edges)
+    dest = rng.randint(0, num_edges // 10, num_edges)
+    weight = rng.rand(num_edges).astype(np.float32) if weighted else None
+    with utils.TempDir() as tmp_dir:
+        # the script starts from edges.txt, which is written beforehand and not timed
+        edgefile = fileformat.write_edgelist(os.path.join(tmp_dir, 'edges.txt'), src, dest, weight)
+        path = os.path.join(tmp_dir, 'pajek.txt')
+        t_old, _ = utils.timeit(lambda: edgelist2pajek.edgelist_to_pajek(edgefile, path, directed, weighted))
+        t_new, _ = utils.timeit(lambda: fileformat.write_pajek(path, src, dest, weight, directed=directed))
+    print("weighted={:<5} directed={:<5} edgelist2pajek: {:>12,.0f} edges/s  write_pajek: {:>12,.0f} edges/s  speedup: {:.1f}x".format(
+        str(weighted), str(directed), num_edges / t_old, num_edges / t_new, t_old / t_new))
+
+
+if __name__ == "__main__":
+    num_edges = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for weighted in [False, True]:
+        for directed in [False, True]:
+            bench(num_edges, weighted, directed)
@@ -0,0 +1,57 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import numpy as np
+from gct.alg.clustering import Result
+from gct.metrics import BatchComparator, ClusterComparator
+
+
+def random_clustering(rng, nodes, k, extra=0):
+    pairs = list(zip(nodes, rng.randint(0, k, len(nodes)).tolist()))
+    pairs += list(zip(rng.choice(nodes, extra).tolist(), rng.randint(0, k, extra).tolist()))
+    return [list(u) for u in pairs]
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(11)
+        self.gt = random_clustering(rng, list(range(200)), 8, extra=30)
+        # overlapping, missing nodes, extra nodes
+        self.preds = [random_clustering(rng, list(range(200)), 5),
+                      random_clustering(rng, list(range(20, 230)), 10, extra=40),
+                      self.gt]
+
+    def check(self, df):
+        self.assertEqual(['name', 'measure', 'value'], df.columns.tolist())
+        for i, pred in enumerate(self.preds):
+            c = ClusterComparator(self.gt, pred)
+            v = df[df['name'] == i].set_index('measure')['value']
+            self.assertAlmostEqual(c.nmi(), v['NMI_arithmetic'])
+            self.assertAlmostEqual(c.ari(), v['ARI'])
+            self.assertAlmostEqual(c.overlap_nmi()['NMImax'], v['NMImax'])
+            self.assertAlmostEqual(c.overlap_nmi()['NMIlfk'], v['NMIlfk'])
+            self.assertAlmostEqual(c.omega(), v['omega'])
+            self.assertAlmostEqual(c.best_match_f1(), v['F1'])
+
+    def testScore(self):
+        comparator = BatchComparator(self.gt)
+        self.check(comparator.score(self.preds, num_worker=1))
+        self.check(comparator.score(self.preds, num_worker=2))
+        self.assertRaises(ValueError, comparator.compare, self.preds[0], ['NMI'])
+
+    def testNames(self):
+        comparator = BatchComparator(self.gt)
+        result = Result({'runname': 'run1', 'clusters': {0: [0, 1, 2], 1: [3, 4]}})
+        df = comparator.score([result, self.preds[0]], measures=['purity'], num_worker=1)
+        self.assertEqual(['run1', 1], df['name'].tolist())
+        df = comparator.score({'a': self.preds[0]}, measures=['ARI', 'pair_f1'], num_worker=1)
+        self.assertEqual([('a', 'ARI'), ('a', 'pair_f1')], list(zip(df['name'], df['measure'])))
+        self.assertAlmostEqual(ClusterComparator(self.gt, self.preds[0]).pair_f1()['f1'], df['value'][1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import numpy as np
+from gct.dataset import convert
+from gct.dataset.membership import Membership
+from gct.metrics.cluster_stats import ClusterStats, MembershipMatrixStats
+from gct.metrics.metrics import GraphClusterMetrics
+
+
+class Test(unittest.TestCase):
+
+    def setUp(self):
+        # two triangles joined by the edge 2-3, node 6 hangs on 5 without cluster
+        self.edges = [[0, 1], [1, 2], [0, 2], [2, 3], [3, 4], [4, 5], [3, 5], [5, 6]]
+        self.clusters = [[0, 10], [1, 10], [2, 10], [3, 20], [4, 20], [5, 20]]
+        self.graph = convert.from_edgelist("test_cluster_stats", self.edges, groundtruth=self.clusters, overide=True)
+
+    def testStats(self):
+        src, dest = np.array(self.edges).T
+        st = ClusterStats(src, dest, None, Membership.from_pairs(*np.array(self.clusters).T))
+        self.assertEqual(7, st.num_node)
+        self.assertEqual([10, 10, 10, 20, 20, 20, -1], st.cluster_ids[st.node_label].tolist()[:6] + [st.node_label[6]])
+        self.assertEqual([3, 3], st.intra_count.tolist())
+        self.assertEqual([1, 2], st.out_weight.tolist())
+        self.assertEqual([7, 8], st.volume.tolist())
+        max_odf, avg_odf, flake = st.out_degree_fractions()
+        self.assertEqual([1 / 3., 1 / 3.], max_odf.tolist())
+        self.assertEqual([1 / 9., 2 / 9.], avg_odf.tolist())
+        self.assertEqual([0, 0], flake.tolist())
+
+    def testOverlap(self):
+        # node 3 is in both clusters, its label is the last cluster and it counts in both volumes
+        src, dest = np.array(self.edges).T
+        st = ClusterStats(src, dest, None, Membership.from_pairs([0, 1, 2, 3, 3, 4, 5], [10, 10, 10, 10, 20, 20, 20]))
+        self.assertEqual(1, st.node_label[3])
+        self.assertEqual([3, 3], st.intra_count.tolist())
+        self.assertEqual([10, 8], st.volume.tolist())
+
+    def testMembershipMatrix(self):
+        src, dest = np.array(self.edges).T
+        st = MembershipMatrixStats(src, dest, None, Membership.from_pairs(*np.array(self.clusters).T))
+        ref = ClusterStats(src, dest, None, Membership.from_pairs(*np.array(self.clusters).T))
+        for u in ['intra_weight', 'intra_count', 'out_weight', 'volume']:
+            self.assertEqual(getattr(ref, u).tolist(), getattr(st, u).tolist())
+        self.assertAlmostEqual(ref.modularity(), st.modularity())
+        # node 3 in both clusters
+        st = MembershipMatrixStats(src, dest, None, Membership.from_pairs([0, 1, 2, 3, 3, 4, 5], [10, 10, 10, 10, 20, 20, 20]))
+        self.assertEqual([4, 3], st.intra_count.tolist())
+        self.assertEqual([10, 8], st.volume.tolist())
+        self.assertEqual([2, 2], st.out_weight.tolist())
+        self.assertAlmostEqual(11 / 16. - (8.5 ** 2 + 6.5 ** 2) / 256, st.modularity())
+        max_odf, avg_odf, _ = st.out_degree_fractions()
+        self.assertEqual([2 / 3., 1 / 3.], max_odf.tolist())
+        self.assertAlmostEqual(1 / 6., avg_odf[0])
+        self.assertAlmostEqual(2 / 9., avg_odf[1])
+
+    def testMetrics(self):
+        p = GraphClusterMetrics(self.graph, self.graph.get_ground_truth()['default'])
+        self.assertEqual(7, p.num_vertices)
+        self.assertEqual({10: 3, 20: 3}, p.cluster_sizes)
+        self.assertEqual({10: 6, 20: 6}, p.cluster_sum_intra_weights)
+        self.assertEqual({10: 1, 20: 2}, p.cluster_out_sum_weights)
+        self.assertEqual({10: 7, 20: 8}, p.cluster_sum_weighted_degrees)
+        self.assertAlmostEqual(12 / 16. - (49 + 64) / 256., p.modularity)
+        self.assertEqual({10: 1 / 7., 20: 2 / 8.}, p.conductance)
+        self.assertEqual({10: 1 / 7. + 1 / 11., 20: 2 / 8. + 2 / 12.}, p.normalized_cut)
+        self.assertEqual({10: 3 / 4., 20: 3 / 5.}, p.relative_cluster_densities)
+        self.assertEqual({10: 1 / 3., 20: 2 / 3.}, p.cluster_expansions)
+        self.assertEqual({10: 1 / 12., 20: 2 / 12.}, p.cluster_cut_ratios)
+        self.assertEqual({10: 1.0, 20: 1.0}, p.intra_cluster_densities)
+        self.assertAlmostEqual(2 * 2 / (7 * 6 - 12.), p.inter_cluster_density)
+        self.assertEqual({10: 1 / 3., 20: 1 / 3.}, p.cluster_max_out_degree_fraction)
+        self.assertEqual({0: 2, 1: 2, 2: 3, 3: 3, 4: 2, 5: 3, 6: 1}, p.unweighted_degrees)
+
+        p = GraphClusterMetrics(self.graph, self.clusters + [[3, 10]])
+        self.assertTrue(p.overlap)
+        self.assertEqual({10: 8, 20: 6}, p.cluster_sum_intra_weights)
+        self.assertEqual({10: 2 / 10., 20: 2 / 8.}, p.conductance)
+        self.assertAlmostEqual(11 / 16. - (8.5 ** 2 + 6.5 ** 2) / 256, p.modularity)
+        p = GraphClusterMetrics(self.graph, self.clusters + [[3, 10]], overlap=False)
+        self.assertEqual({10: 6, 20: 6}, p.cluster_sum_intra_weights)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import sys
+from unittest import mock
+import numpy as np
+import pandas as pd
+from sklearn import metrics
+from gct.metrics.contingency import Contingency, align, AVERAGE_METHODS
+from gct.metrics.metrics import ClusterComparator
+
+
+class Test(unittest.TestCase):
+
+    def testAmiFallback(self):
+        rng = np.random.RandomState(1)
+        a, b = rng.randint(0, 5, 100), rng.randint(0, 7, 100)
+        c = Contingency(a, b)
+        self.assertEqual(sorted(zip(a, b)), list(zip(*c.labels())))
+        # the private module of sklearn is missing
+        with mock.patch.dict(sys.modules, {'sklearn.metrics.cluster._expected_mutual_info_fast': None}):
+            self.assertRaises(ImportError, c.expected_mutual_info)
+            for u in AVERAGE_METHODS:
+                self.assertAlmostEqual(metrics.adjusted_mutual_info_score(a, b, average_method=u), c.ami(u))
+
+    def testScores(self):
+        rng = np.random.RandomState(0)
+        for n_class, n_cluster, n in [(5, 7, 200), (50, 3, 1000), (3, 300, 400), (1, 1, 10), (1, 4, 10), (10, 10, 10)]:
+            a, b = rng.randint(0, n_class, n), rng.randint(0, n_cluster, n)
+            c = Contingency(a, b)
+            for u in AVERAGE_METHODS:
+                self.assertAlmostEqual(metrics.normalized_mutual_info_score(a, b, average_method=u), c.nmi(u))
+                self.assertAlmostEqual(metrics.adjusted_mutual_info_score(a, b, average_method=u), c.ami(u))
+            self.assertAlmostEqual(metrics.adjusted_rand_score(a, b), c.ari())
+            h, cc, v = metrics.homogeneity_completeness_v_measure(a, b)
+            self.assertAlmostEqual(h, c.homogeneity())
+            self.assertAlmostEqual(cc, c.completeness())
+            self.assertAlmostEqual(v, c.v_measure())
+            self.assertAlmostEqual(metrics.v_measure_score(a, b, beta=2), c.v_measure(2))
+            self.assertAlmostEqual(metrics.cluster.contingency_matrix(a, b).max(axis=0).sum() / float(n), c.purity())
+            pairs = metrics.cluster.pair_confusion_matrix(a, b)
+            scores = c.pair_scores()
+            if pairs[1, 1] + pairs[0, 1]:
+                self.assertAlmostEqual(pairs[1, 1] / float(pairs[1, 1] + pairs[0, 1]), scores['precision'])
+            if pairs[1, 1] + pairs[1, 0]:
+                self.assertAlmostEqual(pairs[1, 1] / float(pairs[1, 1] + pairs[1, 0]), scores['recall'])
+
+    def testDegenerate(self):
+        rng = np.random.RandomState(2)
+        # one giant cluster, and a cluster (or a class) per node
+        for a, b in [(np.arange(2), np.zeros(2)), (rng.randint(0, 2, 20), np.zeros(20)), (np.zeros(20), rng.randint(0, 5, 20)),
+                     (np.arange(13), rng.randint(0, 3, 13)), (rng.randint(0, 3, 7), np.arange(7)), (np.arange(9), np.arange(9))]:
+            c = Contingency(a, b)
+            for u in AVERAGE_METHODS:
+                self.assertEqual(metrics.normalized_mutual_info_score(a, b, average_method=u), c.nmi(u))
+                self.assertEqual(metrics.adjusted_mutual_info_score(a, b, average_method=u), c.ami(u))
+        for n in range(2, 30):
+            a, b = rng.randint(0, 3, n), np.arange(n)
+            for u in AVERAGE_METHODS:
+                self.assertEqual(metrics.adjusted_mutual_info_score(a, b, average_method=u), Contingency(a, b).ami(u))
+
+    def testAlign(self):
+        nodes, (ids1, codes1), (ids2, codes2) = align([5, 1, 3], [7, 7, 8], [3, 9], ['a', 'b'])
+        self.assertEqual([1, 3, 5, 9], nodes.tolist())
+        self.assertEqual([0, 1, 0, 2], codes1.tolist())
+        self.assertEqual(['a', 'b'], ids2.tolist())
+        self.assertEqual([2, 0, 2, 1], codes2.tolist())
+
+    def testComparator(self):
+        gt = pd.DataFrame({'node': [1, 2, 3, 4, 5], 'cluster': [0, 0, 1, 1, 1]})
+        pred = pd.DataFrame({'node': [2, 3, 4, 5, 6], 'cluster': [3, 3, 4, 4, 4]})
+        p = ClusterComparator(gt, pred)
+        self.assertEqual([0, 0, 1, 1, 1, -9999], p.clean_ground_truth['cluster'].tolist())
+        self.assertEqual([-9999, 3, 3, 4, 4, 4], p.clean_prediction['cluster'].tolist())
+        self.assertEqual([1, 2, 3, 4, 5, 6], p.clean_prediction.index.tolist())
+        a, b = p.clean_ground_truth['cluster'].values, p.clean_prediction['cluster'].values
+        self.assertAlmostEqual(metrics.normalized_mutual_info_score(a, b), p.sklean_nmi())
+        self.assertAlmostEqual(metrics.adjusted_mutual_info_score(a, b), p.sklean_ami())
+        self.assertAlmostEqual(metrics.adjusted_rand_score(a, b), p.sklean_ars())
+        self.assertAlmostEqual(metrics.completeness_score(a, b), p.sklean_completeness())
+        self.assertEqual(1.0, ClusterComparator(gt, gt).scores()['pair_f1'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import itertools
+from unittest import mock
+import numpy as np
+from sklearn import metrics as skm
+from gct.dataset.membership import Membership
+from gct.metrics import overlap
+from gct.metrics.overlap import CoverScores, cover_matrices
+from gct.metrics.metrics import ClusterComparator
+
+
+def h(p):
+    return -p * np.log2(p) if p > 0 else 0.0
+
+
+def brute_nmi(X, Y, nodes):
+    # onmi's definitions, every pair of clusters
+    n = float(len(nodes))
+
+    def H(c):
+        return h(len(c) / n) + h(1 - len(c) / n)
+
+    def cond(A, B):
+        ret = []
+        for a in A:
+            best = H(a)
+            for b in B:
+                pa, pb, pc, pd = [len(u) / n for u in [nodes - (a | b), b - a, a - b, a & b]]
+                if h(pa) + h(pd) > h(pb) + h(pc):
+                    best = min(best, h(pa) + h(pb) + h(pc) + h(pd) - H(b))
+            ret.append(best)
+        return np.array(ret), np.array([H(a) for a in A])
+
+    hx_y, hx = cond(X, Y)
+    hy_x, hy = cond(Y, X)
+    lfk = 1 - (np.mean(hx_y / hx) + np.mean(hy_x / hy)) / 2
+    mi = (hx.sum() - hx_y.sum() + hy.sum() - hy_x.sum()) / 2
+    return mi / max(hx.sum(), hy.sum()), lfk
+
+
+def brute_omega(X, Y, nodes):
+    pairs = list(itertools.combinations(sorted(nodes), 2))
+    tx = [sum(1 for c in X if u in c and v in c) for u, v in pairs]
+    ty = [sum(1 for c in Y if u in c and v in c) for u, v in pairs]
+    m = float(len(pairs))
+    observed = np.mean(np.array(tx) == np.array(ty))
+    expected = sum(tx.count(j) * ty.count(j) for j in set(tx)) / m / m
+    return (observed - expected) / (1 - expected)
+
+
+def brute_f1(X, Y):
+
+    def best(A, B):
+        return [max(2. * len(a & b) / (len(a) + len(b)) for b in B) for a in A]
+
+    return (np.mean(best(X, Y)) + np.mean(best(Y, X))) / 2
+
+
+def random_cover(rng, nodes, k, extra):
+    labels = rng.randint(0, k, len(nodes))
+    d = {i: set(np.array(nodes)[labels == i].tolist()) for i in range(k)}
+    for u in rng.choice(nodes, extra):
+        d[rng.randint(0, k)].add(int(u))
+    return {i: v for i, v in d.items() if v}
+
+
+def scores(X, Y):
+    _, A, B = cover_matrices(Membership.from_dict({i: list(v) for i, v in X.items()}),
+                             Membership.from_dict({i: list(v) for i, v in Y.items()}))
+    return CoverScores(A, B)
+
+
+class Test(unittest.TestCase):
+
+    def testBruteForce(self):
+        rng = np.random.RandomState(7)
+        for k1, k2, extra in [(4, 5, 10), (2, 3, 20), (1, 4, 0), (6, 2, 5)]:
+            X = random_cover(rng, list(range(40)), k1, extra)
+            Y = random_cover(rng, list(range(5, 45)), k2, extra)
+            nodes = set(range(45))
+            p = scores(X, Y)
+            nmi, lfk = brute_nmi(list(X.values()), list(Y.values()), nodes)
+            self.assertAlmostEqual(nmi, p.nmi()['NMImax'])
+            self.assertAlmostEqual(lfk, p.nmi_lfk())
+            self.assertAlmostEqual(brute_omega(list(X.values()), list(Y.values()), nodes), p.omega())
+            self.assertAlmostEqual(brute_f1(list(X.values()), list(Y.values())), p.best_match_f1())
+
+        # {98} is best matched by the disjoint cluster of 60 nodes
+        X, Y = [set(range(60)), {98}, set(range(60, 97)), {99}], [set(range(60)), set(range(60, 100))]
+        nodes = set(range(100))
+        p = scores(dict(enumerate(X)), dict(enumerate(Y)))
+        nmi, lfk = brute_nmi(X, Y, nodes)
+        self.assertAlmostEqual(nmi, p.nmi()['NMImax'])
+        self.assertAlmostEqual(lfk, p.nmi_lfk())
+
+    def testOmegaBlocks(self):
+        rng = np.random.RandomState(5)
+        nodes = set(range(45))
+        partition = random_cover(rng, list(range(45)), 4, 0)
+        for extra in [10, 0]:
+            X = random_cover(rng, list(range(40)), 4, extra)
+            Y = random_cover(rng, list(range(5, 45)), 5, 10)
+            # a few rows of X X^T at a time
+            for block_pairs in [1, 50, 1 << 24]:
+                with mock.patch.object(overlap, 'OMEGA_BLOCK_PAIRS', block_pairs):
+                    for A, B in [(X, Y), (partition, Y), (X, partition)]:
+                        self.assertAlmostEqual(brute_omega(list(A.values()), list(B.values()), nodes), scores(A, B).omega())
+        p = scores(X, Y)
+        pairs = list(itertools.combinations(range(45), 2))
+        shared = [sum(1 for c in Y.values() if u in c and v in c) for u, v in pairs]
+        self.assertEqual(np.bincount(shared)[1:].tolist(), p.cover_y.pair_counts[1:].tolist())
+        self.assertFalse(p.cover_y.is_partition)
+        self.assertTrue(scores(partition, X).cover_x.is_partition)
+
+    def testPartitions(self):
+        rng = np.random.RandomState(3)
+        a, b = rng.randint(0, 6, 300), rng.randint(0, 4, 300)
+        p = scores({i: set(np.flatnonzero(a == i).tolist()) for i in range(6)},
+                   {i: set(np.flatnonzero(b == i).tolist()) for i in range(4)})
+        self.assertAlmostEqual(skm.adjusted_rand_score(a, b), p.omega())
+        same = scores({i: set(np.flatnonzero(a == i).tolist()) for i in range(6)},
+                      {i: set(np.flatnonzero(a == i).tolist()) for i in range(6)})
+        self.assertEqual(1.0, same.omega())
+        self.assertAlmostEqual(1.0, same.best_match_f1(weighted=True, mean='harmonic'))
+        for v in same.nmi().values():
+            self.assertAlmostEqual(1.0, v)
+
+    def testComparator(self):
+        gt = [[0, 1], [1, 1], [2, 1], [2, 2], [3, 2], [4, 2]]
+        pred = [[0, 'a'], [1, 'a'], [2, 'b'], [3, 'b'], [4, 'b']]
+        c = ClusterComparator(gt, pred)
+        X, Y = [{0, 1, 2}, {2, 3, 4}], [{0, 1}, {2, 3, 4}]
+        nmi, lfk = brute_nmi(X, Y, set(range(5)))
+        self.assertAlmostEqual(nmi, c.overlap_nmi()['NMImax'])
+        self.assertAlmostEqual(lfk, c.overlap_nmi()['NMIlfk'])
+        self.assertAlmostEqual(brute_omega(X, Y, set(range(5))), c.omega())
+        self.assertAlmostEqual(brute_f1(X, Y), c.best_match_f1())
+        self.assertRaises(ValueError, c.best_match_f1, mean='geometric')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+'''
+Created on Oct 18, 2026
+
+@author: lizhen
+'''
+import unittest
+import itertools
+import numpy as np
+from gct.dataset import convert
+from gct.metrics import triangles
+from gct.metrics.metrics import GraphClusterMetrics
+
+
+def brute_force(src, dest, members):
+    adj = {u: set() for u in members}
+    for u, v in zip(src, dest):
+        if u != v and u in adj and v in adj:
+            adj[u].add(v)
+            adj[v].add(u)
+    tri = [sum(1 for x, y in itertools.combinations(adj[u], 2) if y in adj[x]) for u in members]
+    return tri, [len(adj[u]) for u in members]
+
+
+class Test(unittest.TestCase):
+
+    def testCount(self):
+        rng = np.random.RandomState(5)
+        n, k = 60, 4
+        src, dest = rng.randint(0, n, 600), rng.randint(0, n, 600)
+        pairs = sorted(set(zip(rng.randint(0, k, n + 30).tolist(), np.concatenate([np.arange(n), rng.randint(0, n, 30)]).tolist())))
+        entry_cluster, entry_node = np.array(pairs).T
+        a, b = triangles.intra_edges(src, dest, entry_node, entry_cluster, n)
+        self.assertTrue((a < b).all())
+        for num_thread in [1, 3]:
+            triangles.MIN_BLOCK_EDGES = 1 if num_thread > 1 else 1 << 16
+            tri, deg = triangles.cluster_triangles(a, b, entry_cluster, k, num_thread=num_thread)
+            for c in range(k):
+                idx = np.flatnonzero(entry_cluster == c)
+                t, d = brute_force(src.tolist(), dest.tolist(), entry_node[idx].tolist())
+                self.assertEqual(t, tri[idx].tolist())
+                self.assertEqual(d, deg[idx].tolist())
+        triangles.MIN_BLOCK_EDGES = 1 << 16
+
+    def testMetrics(self):
+        # two triangles joined by the edge 2-3, and a duplicated edge
+        edges = [[0, 1], [1, 2], [0, 2], [2, 3], [3, 4], [4, 5], [3, 5], [5, 6], [1, 0]]
+        clusters = [[0, 10], [1, 10], [2, 10], [3, 20], [4, 20], [5, 20], [6, 30]]
+        g = convert.from_edgelist("test_triangles", edges, overide=True)
+        p = GraphClusterMetrics(g, clusters)
+        self.assertEqual({10: 1.0, 20: 1.0, 30: 0.0}, p.cluster_clustering_coefficient)
+        self.assertEqual({0: 1.0, 1: 1.0, 2: 1.0}, p.cluster_local_clustering_coefficient[10])
+        self.assertTrue(np.isnan(p.cluster_local_clustering_coefficient[30][6]))
+
+        # node 3 in both clusters: 1 triangle and 5 connected triples in cluster 10
+        p = GraphClusterMetrics(g, clusters + [[3, 10]])
+        self.assertAlmostEqual(0.6, p.cluster_clustering_coefficient[10])
+        local = p.cluster_local_clustering_coefficient[10]
+        self.assertAlmostEqual(1 / 3., local[2])
+        self.assertTrue(np.isnan(local[3]))
+        self.assertEqual(1.0, p.cluster_clustering_coefficient[20])
+
+
+if __name__ == "__main__":
+    unittest.main()